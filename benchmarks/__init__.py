@@ -0,0 +1 @@
+"""Performance benchmarks for Google Cloud experiments."""
@@ -0,0 +1,206 @@
+"""Benchmark: local load test of the hello-app-engine frontend and backend.
+
+Both Flask apps run in-process on ephemeral ports (threaded werkzeug
+servers), the frontend pointed at the backend through BACKEND_URL. The
+backend can be slowed with --backend-latency-ms to stand in for a real
+database call. Concurrent clients request the frontend page and the script
+reports throughput, p50/p99 latency and how many requests reached the backend.
+
+With --target backend the backend is loaded directly and compared across
+plain, revalidated (If-None-Match -> 304), gzipped and batched requests,
+reporting requests/s and bytes on the wire per response.
+
+Usage:
+    python -m benchmarks.bench_app_engine --requests 2000 --concurrency 16 --backend-latency-ms 50
+    python -m benchmarks.bench_app_engine --no-cache   # every page view calls the backend
+    python -m benchmarks.bench_app_engine --no-cache --slow-featured-ms 800   # partial pages
+    python -m benchmarks.bench_app_engine --target backend --batch-size 50
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import PROJECT_ROOT, save_results, summarize
+
+APP_DIR = PROJECT_ROOT / "hello-app-engine"
+
+
+def load_app(service):
+    """Import hello-app-engine/<service>/main.py under a unique module name."""
+    # main.py imports its sibling modules the way gunicorn would
+    sys.path.insert(0, str(APP_DIR / service))
+    spec = importlib.util.spec_from_file_location(f"hello_app_engine_{service}",
+                                                  APP_DIR / service / "main.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class CountingMiddleware:
+    """WSGI wrapper adding a fixed delay and counting requests."""
+
+    def __init__(self, app, delay: float = 0.0):
+        self.app = app
+        self.delay = delay
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, environ, start_response):
+        with self._lock:
+            self.requests += 1
+        if self.delay:
+            time.sleep(self.delay)
+        return self.app(environ, start_response)
+
+
+def serve(app):
+    """Serve a WSGI app on an ephemeral localhost port in a daemon thread."""
+    from werkzeug.serving import make_server
+
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def run_load(url, total, concurrency, headers=None):
+    """GET url total times from concurrency threads (one keep-alive session each)."""
+    import requests
+
+    local = threading.local()
+
+    def one(_):
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        start = time.perf_counter()
+        response = local.session.get(url, headers=headers, timeout=30)
+        # Bytes on the wire: Content-Length is the (possibly gzipped) body size
+        wire_bytes = int(response.headers.get("Content-Length", len(response.content)))
+        return time.perf_counter() - start, response.status_code, wire_bytes
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        start = time.perf_counter()
+        results = list(pool.map(one, range(total)))
+        elapsed = time.perf_counter() - start
+    return results, elapsed
+
+
+def summarize_load(results, elapsed):
+    latencies = [latency for latency, _, _ in results]
+    summary = summarize(latencies)
+    summary.update(
+        requests_per_sec=len(results) / elapsed if elapsed else 0.0,
+        errors=sum(1 for _, status, _ in results if status >= 400),
+        mean_bytes=sum(size for _, _, size in results) / len(results) if results else 0.0,
+    )
+    return summary
+
+
+def bench_backend(args):
+    """Backend alone: plain vs conditional vs gzip, and N item calls vs one batch call."""
+    import requests
+
+    backend_server, backend_url = serve(load_app("backend").app)
+    ids = [str(n) for n in range(1, args.batch_size + 1)]
+    batch_path = f"/data/batch?ids={','.join(ids)}"
+    identity = {"Accept-Encoding": "identity"}
+    etag = requests.get(f"{backend_url}/data", headers=identity).headers["ETag"]
+    batch_etag = requests.get(f"{backend_url}{batch_path}", headers=identity).headers["ETag"]
+
+    scenarios = {
+        "data": ("/data", identity),
+        "data_if_none_match": ("/data", {**identity, "If-None-Match": etag}),
+        "batch_identity": (batch_path, identity),
+        "batch_gzip": (batch_path, {"Accept-Encoding": "gzip"}),
+        "batch_if_none_match": (batch_path, {"Accept-Encoding": "gzip", "If-None-Match": batch_etag}),
+        "item": ("/data/items/1", identity),
+    }
+    results = {"batch_size": args.batch_size, "concurrency": args.concurrency}
+    try:
+        for name, (path, headers) in scenarios.items():
+            run_load(f"{backend_url}{path}", args.concurrency, args.concurrency, headers)
+            summary = summarize_load(*run_load(f"{backend_url}{path}", args.requests,
+                                               args.concurrency, headers))
+            results[name] = summary
+            print(f"{name:>20}: {summary['requests_per_sec']:,.0f} req/s, "
+                  f"p99 {summary['p99_ms']:.1f} ms, {summary['mean_bytes']:,.0f} bytes/response")
+    finally:
+        backend_server.shutdown()
+
+    # Fetching batch_size records one call at a time vs one batch call
+    per_item_ms = results["item"]["mean_ms"] * args.batch_size
+    print(f"\n{args.batch_size} items: {per_item_ms:.1f} ms as single-item calls vs "
+          f"{results['batch_gzip']['mean_ms']:.1f} ms as one batch call")
+    results["items_one_by_one_ms"] = per_item_ms
+    save_results("app_engine_backend", results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", choices=["frontend", "backend"], default="frontend")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--backend-latency-ms", type=float, default=50.0)
+    parser.add_argument("--cache-ttl", type=float, default=5.0)
+    parser.add_argument("--no-cache", action="store_true", help="Disable the frontend cache")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--slow-featured-ms", type=float, default=0.0,
+                        help="Inject this delay into the frontend's featured-items dependency")
+    args = parser.parse_args()
+
+    if args.target == "backend":
+        bench_backend(args)
+        return
+
+    backend_module = load_app("backend")
+    backend_module.ALLOW_DELAY_INJECTION = True
+    backend = CountingMiddleware(backend_module.app, args.backend_latency_ms / 1000)
+    backend_server, backend_url = serve(backend)
+
+    if args.slow_featured_ms:
+        os.environ["FEATURED_PATH"] = f"/data/batch?ids=1,2,3&delay_ms={args.slow_featured_ms}"
+    os.environ["BACKEND_URL"] = backend_url
+    os.environ["BACKEND_CACHE_TTL"] = "0" if args.no_cache else str(args.cache_ttl)
+    # Each page view fans out to two backend calls
+    os.environ["BACKEND_POOL_SIZE"] = str(args.concurrency * 2)
+    os.environ["FANOUT_WORKERS"] = str(args.concurrency * 2)
+    frontend_module = load_app("frontend")
+    frontend_server, frontend_url = serve(frontend_module.app)
+
+    try:
+        # Warm up connections (and the cache)
+        run_load(f"{frontend_url}/", args.concurrency, args.concurrency)
+        backend.requests = 0
+        results, elapsed = run_load(f"{frontend_url}/", args.requests, args.concurrency)
+    finally:
+        frontend_server.shutdown()
+        backend_server.shutdown()
+
+    summary = summarize_load(results, elapsed)
+    summary.update(
+        backend_requests=backend.requests,
+        cache=frontend_module.backend.cache_stats(),
+        dependencies=frontend_module.aggregator.stats(),
+        slow_featured_ms=args.slow_featured_ms,
+        concurrency=args.concurrency,
+        backend_latency_ms=args.backend_latency_ms,
+        cache_ttl=0 if args.no_cache else args.cache_ttl,
+    )
+    print(f"Frontend /: {summary['requests_per_sec']:,.0f} req/s, "
+          f"p50 {summary['p50_ms']:.1f} ms, p99 {summary['p99_ms']:.1f} ms, "
+          f"{summary['errors']} errors")
+    print(f"Backend requests: {backend.requests} for {args.requests} page views "
+          f"(cache: {summary['cache']})")
+    for name, stats in summary["dependencies"].items():
+        print(f"  {name:>10}: {stats['ok']} ok, {stats['timeout']} timeout, "
+              f"{stats['error']} error, p50 {stats['p50_ms']:.1f} ms, p99 {stats['p99_ms']:.1f} ms")
+
+    save_results("app_engine_no_cache" if args.no_cache else "app_engine", {"frontend": summary})
+
+
+if __name__ == "__main__":
+    main()
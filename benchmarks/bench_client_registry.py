@@ -0,0 +1,64 @@
+"""Benchmark: new client per call vs the shared client registry.
+
+Each call builds a client (or fetches the shared one) and makes one cheap
+RPC, which is what the helpers did before the registry. Services are
+benchmarked when their emulator / fake server host is exported:
+
+    export STORAGE_EMULATOR_HOST=http://localhost:4443
+    export FIRESTORE_EMULATOR_HOST=localhost:8080
+    export PUBSUB_EMULATOR_HOST=localhost:8085
+    python -m benchmarks.bench_client_registry --calls 50
+"""
+
+import argparse
+import os
+
+from benchmarks.common import measure, save_results, summarize
+
+
+def _services(project):
+    """Return {service: (emulator env var, one cheap RPC on a client)}."""
+    return {
+        "storage": ("STORAGE_EMULATOR_HOST",
+                    lambda client: client.lookup_bucket("bench-registry")),
+        "firestore": ("FIRESTORE_EMULATOR_HOST",
+                      lambda client: client.collection("bench").document("registry").get()),
+        "publisher": ("PUBSUB_EMULATOR_HOST",
+                      lambda client: next(iter(client.list_topics(
+                          request={"project": f"projects/{project}"})), None)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--project", default="bench-project")
+    parser.add_argument("--calls", type=int, default=50)
+    args = parser.parse_args()
+
+    import clients
+
+    results = {}
+    for service, (env_var, rpc) in _services(args.project).items():
+        if not os.getenv(env_var):
+            print(f"⏭️  Skipping {service}: {env_var} not set")
+            continue
+
+        factory = clients._factories[service]
+        fresh = measure(lambda: rpc(factory(args.project, None)), repeat=args.calls)
+        shared = measure(lambda: rpc(clients.get_client(service, project=args.project)),
+                         repeat=args.calls)
+
+        fresh_summary, shared_summary = summarize(fresh), summarize(shared)
+        saved = fresh_summary["mean_ms"] - shared_summary["mean_ms"]
+        print(f"{service:>10}: new client {fresh_summary['mean_ms']:.2f} ms/call, "
+              f"shared {shared_summary['mean_ms']:.2f} ms/call (saves {saved:.2f} ms)")
+        results[service] = {"new_client": fresh_summary, "shared": shared_summary,
+                            "saved_ms_per_call": saved}
+
+    clients.close_clients()
+    if results:
+        save_results("client_registry", results)
+
+
+if __name__ == "__main__":
+    main()
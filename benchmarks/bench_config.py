@@ -0,0 +1,86 @@
+"""Benchmark: configuration startup and repeated-access costs (src/config.py).
+
+Compares, on a temporary set of .env files:
+
+- legacy: what each module used to do, load_dotenv() for every .env file
+  followed by os.getenv() for every setting
+- cold: the first get_settings() in a process (parse + build Settings)
+- hot: repeated get_settings() calls within CHECK_INTERVAL (memoized)
+- revalidate: get_settings() when the interval has passed (stat the files)
+- field: reading one attribute of the cached Settings
+
+Usage:
+    python -m benchmarks.bench_config --keys 50 --repeat 10000
+"""
+
+import argparse
+import os
+import tempfile
+from pathlib import Path
+
+from benchmarks.common import measure, save_results, summarize
+
+SETTING_VARS = ("GOOGLE_CLOUD_PROJECT", "GCS_BUCKET_NAME", "FIRESTORE_COLLECTION", "PUBSUB_TOPIC",
+                "PUBSUB_SUBSCRIPTION", "BIGQUERY_DATASET", "BIGQUERY_TABLE")
+
+
+def write_env_files(root: Path, keys: int):
+    lines = [f"BENCH_SETTING_{n}=value-{n}" for n in range(keys)]
+    (root / ".env").write_text("\n".join(lines + ["GOOGLE_CLOUD_PROJECT=bench-project"]) + "\n")
+    (root / ".env.development").write_text("PUBSUB_TOPIC=bench-topic\n")
+    (root / ".env.local").write_text("GCS_BUCKET_NAME=bench-bucket\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, default=50, help="Variables in the base .env file")
+    parser.add_argument("--repeat", type=int, default=10000)
+    args = parser.parse_args()
+
+    import config
+    from dotenv import load_dotenv
+
+    results = {"keys": args.keys}
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write_env_files(root, args.keys)
+        os.environ.pop("ENV", None)
+
+        def legacy():
+            for path in config.env_files("development", root):
+                load_dotenv(path, override=path.name != ".env")
+            return {name: os.getenv(name) for name in SETTING_VARS}
+
+        def cold():
+            config.reset_settings()
+            return config.get_settings(root=root)
+
+        def revalidate():
+            config._checked_at = 0.0
+            return config.get_settings()
+
+        cases = {
+            "legacy": (legacy, max(10, args.repeat // 100)),
+            "cold": (cold, max(10, args.repeat // 100)),
+        }
+        for name, (fn, repeat) in cases.items():
+            results[name] = summarize(measure(fn, repeat=repeat))
+
+        # Memoized paths; the settings are loaded from root once
+        config.reset_settings()
+        config.PROJECT_ROOT = root
+        settings = config.get_settings()
+        results["hot"] = summarize(measure(config.get_settings, repeat=args.repeat))
+        results["revalidate"] = summarize(measure(revalidate, repeat=max(10, args.repeat // 10)))
+        results["field"] = summarize(measure(lambda: settings.project_id, repeat=args.repeat))
+
+    for name in ("legacy", "cold", "revalidate", "hot", "field"):
+        summary = results[name]
+        print(f"{name:>10}: p50 {summary['p50_ms'] * 1000:,.2f} µs, "
+              f"p99 {summary['p99_ms'] * 1000:,.2f} µs")
+
+    save_results("config", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Benchmark: sequential sync get_document vs async get_many on the Firestore emulator.
+
+Usage:
+    gcloud emulators firestore start --host-port=localhost:8080
+    export FIRESTORE_EMULATOR_HOST=localhost:8080
+    python -m benchmarks.bench_firestore_async --documents 500
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import time
+
+from benchmarks.common import require_env, save_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--collection", default="bench-async")
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    require_env("FIRESTORE_EMULATOR_HOST")
+    os.environ.setdefault("GOOGLE_CLOUD_PROJECT", "bench-project")
+
+    from experiments import firestore_async_example, firestore_example
+
+    db = firestore_example.initialize_firestore()
+    ids = [f"doc-{i:05d}" for i in range(args.documents)]
+    batch = db.batch()
+    for count, doc_id in enumerate(ids, 1):
+        batch.set(db.collection(args.collection).document(doc_id), {"n": count})
+        if count % 500 == 0:
+            batch.commit()
+            batch = db.batch()
+    batch.commit()
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for doc_id in ids:
+            firestore_example.get_document(args.collection, doc_id)
+    sync_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    asyncio.run(firestore_async_example.get_many(args.collection, ids, args.concurrency))
+    async_seconds = time.perf_counter() - start
+
+    print(f"sync get_document: {sync_seconds * 1000:.0f} ms for {args.documents} reads")
+    print(f"async get_many:    {async_seconds * 1000:.0f} ms "
+          f"(concurrency {args.concurrency})")
+    print(f"\n🚀 Speedup: {sync_seconds / async_seconds:.1f}x")
+
+    save_results("firestore_async", {
+        "documents": args.documents,
+        "concurrency": args.concurrency,
+        "sync_ms": sync_seconds * 1000,
+        "async_ms": async_seconds * 1000,
+        "speedup": sync_seconds / async_seconds,
+    })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Benchmark: add_document per document vs bulk_add_documents on the Firestore emulator.
+
+Usage:
+    gcloud emulators firestore start --host-port=localhost:8080
+    export FIRESTORE_EMULATOR_HOST=localhost:8080
+    python -m benchmarks.bench_firestore_bulk --documents 5000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import time
+
+from benchmarks.common import require_env, save_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=5000)
+    parser.add_argument("--single-documents", type=int, default=200,
+                        help="documents written through add_document (it is much slower)")
+    args = parser.parse_args()
+
+    require_env("FIRESTORE_EMULATOR_HOST")
+    os.environ.setdefault("GOOGLE_CLOUD_PROJECT", "bench-project")
+
+    from experiments import firestore_example
+
+    def dataset(count):
+        return ({"n": n, "payload": "x" * 200} for n in range(count))
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for document in dataset(args.single_documents):
+            firestore_example.add_document("bench-single", document)
+    results = {"add_document": args.single_documents / (time.perf_counter() - start)}
+
+    for mode in ("bulk_writer", "batch"):
+        result = firestore_example.bulk_add_documents(f"bench-{mode}", dataset(args.documents),
+                                                      mode=mode)
+        results[mode] = result["docs_per_sec"]
+
+    for label, rate in results.items():
+        print(f"{label:>12}: {rate:,.0f} docs/s")
+
+    save_results("firestore_bulk", {"documents": args.documents, "docs_per_sec": results})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark: import time and CLI startup cost of the src modules.
+
+Each module is imported in a fresh interpreter. `-X importtime` gives the
+cumulative import cost of the module itself; the wall-clock time of the
+whole process (minus a bare interpreter start) is the startup overhead a
+CLI invocation pays before doing any work.
+
+Usage:
+    python -m benchmarks.bench_import_time --repeat 5
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.common import PROJECT_ROOT, save_results, summarize
+
+MODULES = [
+    "config",
+    "clients",
+    "metrics",
+    "cache",
+    "project_index",
+    "pubsub",
+    "projects",
+    "create_bucket",
+    "experiments.pubsub_example",
+    "experiments.firestore_example",
+    "experiments.storage_example",
+]
+
+
+def _run(code, env, extra_args=()):
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, *extra_args, "-c", code], env=env,
+                               capture_output=True, text=True)
+    return time.perf_counter() - start, completed
+
+
+def _self_import_us(stderr, module):
+    """Return the cumulative -X importtime microseconds reported for module."""
+    for line in stderr.splitlines():
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    args = parser.parse_args()
+
+    env = dict(os.environ, PYTHONPATH=str(PROJECT_ROOT / "src"))
+    baseline = summarize([_run("pass", env)[0] for _ in range(args.repeat)])
+    print(f"{'interpreter':>32}: {baseline['p50_ms']:.1f} ms")
+
+    results = {"interpreter": baseline}
+    for module in args.modules:
+        _, completed = _run(f"import {module}", env, ("-X", "importtime"))
+        if completed.returncode != 0:
+            error = completed.stderr.strip().splitlines()[-1]
+            print(f"{module:>32}: unavailable ({error})")
+            results[module] = {"error": error}
+            continue
+
+        import_us = _self_import_us(completed.stderr, module)
+        if import_us is None:
+            # e.g. already imported by sitecustomize, so -X importtime has no line for it
+            error = "no -X importtime entry for the module"
+            print(f"{module:>32}: unavailable ({error})")
+            results[module] = {"error": error}
+            continue
+
+        wall = summarize([_run(f"import {module}", env)[0] for _ in range(args.repeat)])
+        startup_ms = wall["p50_ms"] - baseline["p50_ms"]
+        print(f"{module:>32}: import {import_us / 1000:.1f} ms, "
+              f"startup overhead {startup_ms:.1f} ms")
+        results[module] = {"import_ms": import_us / 1000, "startup_overhead_ms": startup_ms,
+                           "wall": wall}
+
+    save_results("import_time", results)
+
+
+if __name__ == "__main__":
+    main()
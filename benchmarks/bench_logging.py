@@ -0,0 +1,172 @@
+"""Benchmark: per-call cost of the logging styles used in the logging sandbox.
+
+Measures the latency a caller pays per log call (p50/p99) and the resulting
+throughput for:
+
+- print: a plain print() statement
+- stdlib: logging.info() through a StreamHandler
+- structured: logging.info(..., extra={"json_fields": ...}) rendered as one
+  JSON line (google.cloud.logging's StructuredLogHandler when installed,
+  otherwise an equivalent JSON formatter)
+- sync_transport: a handler that sends every record to the transport before
+  returning, like CloudLoggingHandler with SyncTransport
+- batched: log_shipper.ShipperHandler, which queues records for a background
+  thread that sends them in batches
+
+Output streams go to an in-memory buffer and the "transport" is a local
+stub that sleeps --rtt-ms per call to stand in for the Cloud Logging API,
+so no credentials or network are needed.
+
+Usage:
+    python -m benchmarks.bench_logging --calls 20000 --rtt-ms 2
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import sys
+import time
+
+from benchmarks.common import PROJECT_ROOT, save_results, summarize
+
+sys.path.insert(0, str(PROJECT_ROOT / "experiments" / "logging_sandbox"))
+
+from log_shipper import BatchingLogShipper, ShipperHandler  # noqa: E402
+
+
+class StubTransport:
+    """Stand-in for the Cloud Logging API: one simulated round trip per call."""
+
+    def __init__(self, rtt: float):
+        self.rtt = rtt
+        self.calls = 0
+        self.entries = 0
+
+    def __call__(self, entries):
+        self.calls += 1
+        self.entries += len(entries)
+        if self.rtt:
+            time.sleep(self.rtt)
+
+
+class SyncTransportHandler(logging.Handler):
+    """Send each record to the transport before returning (no batching)."""
+
+    def __init__(self, transport):
+        super().__init__()
+        self.transport = transport
+
+    def emit(self, record):
+        payload = {"message": self.format(record), **(getattr(record, "json_fields", None) or {})}
+        self.transport([(payload, record.levelname)])
+
+
+class JsonFieldsFormatter(logging.Formatter):
+    """One JSON object per record including json_fields, like StructuredLogHandler."""
+
+    def format(self, record):
+        return json.dumps({
+            "message": super().format(record),
+            "severity": record.levelname,
+            "logging.googleapis.com/sourceLocation": {
+                "file": record.pathname, "line": record.lineno, "function": record.funcName,
+            },
+            **(getattr(record, "json_fields", None) or {}),
+        })
+
+
+def structured_handler(stream):
+    try:
+        from google.cloud.logging.handlers import StructuredLogHandler
+
+        return StructuredLogHandler(stream=stream), "StructuredLogHandler"
+    except ImportError:
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(JsonFieldsFormatter())
+        return handler, "JsonFieldsFormatter"
+
+
+def make_logger(handler):
+    logger = logging.getLogger(f"bench_logging.{id(handler)}")
+    logger.handlers = [handler]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
+
+
+def time_calls(fn, calls):
+    """Per-call latencies plus total wall time for `calls` invocations of fn(i)."""
+    samples = []
+    start = time.perf_counter()
+    for i in range(calls):
+        t0 = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - t0)
+    return samples, time.perf_counter() - start
+
+
+def report(results, name, samples, elapsed, **extra):
+    summary = summarize(samples)
+    summary.update(calls_per_sec=len(samples) / elapsed if elapsed else 0.0, **extra)
+    results[name] = summary
+    print(f"{name:>15}: p50 {summary['p50_ms'] * 1000:,.1f} µs, "
+          f"p99 {summary['p99_ms'] * 1000:,.1f} µs, {summary['calls_per_sec']:,.0f} calls/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--rtt-ms", type=float, default=2.0,
+                        help="Simulated transport round trip per API call")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    calls, rtt = args.calls, args.rtt_ms / 1000
+    fields = {"task_id": "12345", "user": "developer_test", "status": "success"}
+    results = {"calls": calls, "rtt_ms": args.rtt_ms}
+
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        samples, elapsed = time_calls(lambda i: print(f"[PRINT] call {i}"), calls)
+    report(results, "print", samples, elapsed)
+
+    logger = make_logger(logging.StreamHandler(io.StringIO()))
+    samples, elapsed = time_calls(lambda i: logger.info("[INFO] call %d", i), calls)
+    report(results, "stdlib", samples, elapsed)
+
+    handler, implementation = structured_handler(io.StringIO())
+    logger = make_logger(handler)
+    samples, elapsed = time_calls(
+        lambda i: logger.info("Task completed", extra={"json_fields": fields}), calls)
+    report(results, "structured", samples, elapsed, handler=implementation)
+
+    # One simulated round trip per call dominates; keep the run short
+    sync_calls = min(calls, max(100, int(2 / rtt) if rtt else calls))
+    transport = StubTransport(rtt)
+    logger = make_logger(SyncTransportHandler(transport))
+    samples, elapsed = time_calls(
+        lambda i: logger.info("Task completed", extra={"json_fields": fields}), sync_calls)
+    report(results, "sync_transport", samples, elapsed, api_calls=transport.calls)
+
+    transport = StubTransport(rtt)
+    shipper = BatchingLogShipper(transport, max_batch_entries=args.batch_size,
+                                 max_queue=calls + 1, overflow="block")
+    handler = ShipperHandler(shipper)
+    logger = make_logger(handler)
+    samples, elapsed = time_calls(
+        lambda i: logger.info("Task completed", extra={"json_fields": fields}), calls)
+    start = time.perf_counter()
+    shipper.close(timeout=None)
+    drain = time.perf_counter() - start
+    report(results, "batched", samples, elapsed, api_calls=transport.calls,
+           drain_ms=drain * 1000, end_to_end_per_sec=calls / (elapsed + drain),
+           shipper=shipper.metrics())
+    print(f"{'':>15}  {transport.calls} API calls, drained in {drain * 1000:.0f} ms")
+
+    save_results("logging", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Benchmark: offline ProjectIndex lookups on a large synthetic inventory.
+
+Compares index prefix/substring/label queries with a linear scan over the
+records (the best an un-indexed local search could do; the API round trip
+of projects.search_projects is far slower still).
+
+Usage:
+    python -m benchmarks.bench_project_index --projects 100000
+"""
+
+import argparse
+import random
+import string
+import time
+
+from benchmarks.common import measure, save_results, summarize
+
+WORDS = ["billing", "search", "payments", "analytics", "identity", "gateway", "ledger",
+         "catalog", "ingest", "reporting", "mobile", "frontend", "backend", "ml", "data"]
+ENVS = ["prod", "staging", "dev", "sandbox"]
+
+
+def synthetic_inventory(count, seed=42):
+    rng = random.Random(seed)
+    records = {}
+    for n in range(count):
+        words = rng.sample(WORDS, 2)
+        env = rng.choice(ENVS)
+        suffix = "".join(rng.choices(string.ascii_lowercase + string.digits, k=4))
+        project_id = f"{words[0]}-{words[1]}-{env}-{suffix}"
+        records[project_id] = {
+            "project_id": project_id,
+            "display_name": f"{words[0].title()} {words[1].title()} {env.title()} {n}",
+            "state": "ACTIVE",
+            "update_time": "2024-01-01T00:00:00Z",
+            "labels": {"env": env, "team": words[0], "cost-center": str(n % 50)},
+        }
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    from project_index import ProjectIndex
+
+    records = synthetic_inventory(args.projects)
+
+    start = time.perf_counter()
+    index = ProjectIndex(records)
+    build_seconds = time.perf_counter() - start
+
+    # Incremental refresh: 0.5% of the projects changed since the last snapshot
+    changed = dict(records)
+    for project_id in list(changed)[:: 200]:
+        changed[project_id] = dict(changed[project_id], display_name="Renamed Project",
+                                   update_time="2024-02-01T00:00:00Z")
+    start = time.perf_counter()
+    index.update(changed)
+    update_seconds = time.perf_counter() - start
+
+    queries = {
+        "prefix": lambda: index.prefix("ledger-cat", limit=50),
+        "substring": lambda: index.substring("ics-mob", limit=50),
+        "label": lambda: index.labels("cost-center", "7"),
+        "linear_scan_substring": lambda: [
+            pid for pid, record in changed.items()
+            if "ics-mob" in pid or "ics-mob" in record["display_name"].lower()
+        ][:50],
+    }
+    results = {"projects": args.projects, "build_ms": build_seconds * 1000,
+               "incremental_update_ms": update_seconds * 1000}
+    print(f"Build: {build_seconds * 1000:.0f} ms, incremental update: "
+          f"{update_seconds * 1000:.0f} ms ({args.projects:,} projects)")
+    for name, query in queries.items():
+        repeat = args.repeat if not name.startswith("linear") else max(5, args.repeat // 20)
+        summary = summarize(measure(query, repeat=repeat))
+        results[name] = summary
+        print(f"{name:>22}: p50 {summary['p50_ms'] * 1000:,.1f} µs, "
+              f"p99 {summary['p99_ms'] * 1000:,.1f} µs")
+
+    save_results("project_index", results)
+
+
+if __name__ == "__main__":
+    main()
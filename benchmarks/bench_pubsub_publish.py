@@ -0,0 +1,67 @@
+"""Benchmark: per-message publish vs publish_bulk against the Pub/Sub emulator.
+
+Usage:
+    gcloud beta emulators pubsub start --project=bench-project
+    export PUBSUB_EMULATOR_HOST=localhost:8085
+    python -m benchmarks.bench_pubsub_publish --messages 20000
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+from benchmarks.common import require_env, save_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--project", default="bench-project")
+    parser.add_argument("--topic", default="bench-publish")
+    parser.add_argument("--messages", type=int, default=10000)
+    parser.add_argument("--single-messages", type=int, default=200,
+                        help="messages sent through publish_message (it is much slower)")
+    parser.add_argument("--payload-bytes", type=int, default=256)
+    args = parser.parse_args()
+
+    require_env("PUBSUB_EMULATOR_HOST")
+
+    from google.api_core import exceptions
+    from google.cloud import pubsub_v1
+
+    from experiments import pubsub_example
+
+    publisher = pubsub_v1.PublisherClient()
+    topic_path = publisher.topic_path(args.project, args.topic)
+    with contextlib.suppress(exceptions.AlreadyExists):
+        publisher.create_topic(request={"name": topic_path})
+
+    payload = "x" * args.payload_bytes
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(args.single_messages):
+            pubsub_example.publish_message(args.project, args.topic, payload)
+    single_rate = args.single_messages / (time.perf_counter() - start)
+
+    result = pubsub_example.publish_bulk(
+        args.project, args.topic, (payload for _ in range(args.messages))
+    )
+    bulk_rate = result["messages_per_sec"]
+
+    print(f"publish_message: {single_rate:,.0f} msg/s")
+    print(f"publish_bulk:    {bulk_rate:,.0f} msg/s ({result['failed']} failed)")
+    print(f"\n🚀 Speedup: {bulk_rate / single_rate:.1f}x")
+
+    save_results("pubsub_publish", {
+        "messages": args.messages,
+        "payload_bytes": args.payload_bytes,
+        "publish_message_per_sec": single_rate,
+        "publish_bulk_per_sec": bulk_rate,
+        "publish_bulk_failed": result["failed"],
+        "speedup": bulk_rate / single_rate,
+    })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Benchmark: single-stream vs parallel composed uploads against a fake GCS server.
+
+Usage:
+    docker run -d -p 4443:4443 fsouza/fake-gcs-server -scheme http
+    export STORAGE_EMULATOR_HOST=http://localhost:4443
+    python -m benchmarks.bench_storage_upload --size-mb 256
+"""
+
+import argparse
+import os
+import tempfile
+
+from benchmarks.common import measure, require_env, save_results, summarize
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bucket", default="bench-uploads")
+    parser.add_argument("--size-mb", type=int, default=128)
+    parser.add_argument("--chunk-mb", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    require_env("STORAGE_EMULATOR_HOST")
+
+    from google.cloud import storage
+    from experiments import storage_example
+
+    client = storage.Client()
+    if client.lookup_bucket(args.bucket) is None:
+        client.create_bucket(args.bucket)
+
+    with tempfile.NamedTemporaryFile(delete=False) as f:
+        for _ in range(args.size_mb):
+            f.write(os.urandom(1024 * 1024))
+        source = f.name
+
+    try:
+        single = measure(
+            lambda: storage_example.upload_blob(args.bucket, source, "bench/single"),
+            repeat=args.repeat,
+        )
+        parallel = measure(
+            lambda: storage_example.upload_blob_parallel(
+                args.bucket, source, "bench/parallel",
+                chunk_size=args.chunk_mb * 1024 * 1024, max_workers=args.workers,
+            ),
+            repeat=args.repeat,
+        )
+    finally:
+        os.remove(source)
+
+    single_summary = summarize(single)
+    parallel_summary = summarize(parallel)
+    for label, summary in (("single", single_summary), ("parallel", parallel_summary)):
+        summary["mb_per_s"] = args.size_mb / (summary["mean_ms"] / 1000)
+        print(f"{label:>10}: {summary['mean_ms']:.0f} ms mean, {summary['mb_per_s']:.1f} MB/s")
+    speedup = single_summary["mean_ms"] / parallel_summary["mean_ms"]
+    print(f"\n🚀 Speedup: {speedup:.2f}x")
+
+    save_results("storage_upload", {
+        "size_mb": args.size_mb,
+        "chunk_mb": args.chunk_mb,
+        "workers": args.workers,
+        "single": single_summary,
+        "parallel": parallel_summary,
+        "speedup": speedup,
+    })
+
+
+if __name__ == "__main__":
+    main()
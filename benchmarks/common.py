@@ -0,0 +1,58 @@
+"""Shared helpers for the benchmark scripts."""
+
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+RESULTS_DIR = PROJECT_ROOT / "benchmarks" / "results"
+
+# Make `src` modules importable the same way the experiments import each other
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from metrics import percentile  # noqa: E402
+
+
+def require_env(*names):
+    """Exit with a helpful message unless every environment variable is set."""
+    missing = [name for name in names if not os.getenv(name)]
+    if missing:
+        print(f"❌ Missing environment variables: {', '.join(missing)}")
+        print("Start the local emulator / fake server and export its host first.")
+        sys.exit(1)
+
+
+def summarize(samples) -> dict:
+    """Summarize latency samples (in seconds) as milliseconds."""
+    return {
+        "count": len(samples),
+        "mean_ms": statistics.fmean(samples) * 1000 if samples else 0.0,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "max_ms": max(samples) * 1000 if samples else 0.0,
+    }
+
+
+def measure(fn, repeat: int = 5, warmup: int = 1):
+    """Call fn repeatedly and return the wall-clock duration of each timed call."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def save_results(name: str, results: dict) -> Path:
+    """Write benchmark results to benchmarks/results/<name>.json."""
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    path = RESULTS_DIR / f"{name}.json"
+    payload = {"benchmark": name, "timestamp": time.time(), "results": results}
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True))
+    print(f"\n💾 Results written to {path}")
+    return path
@@ -0,0 +1,421 @@
+"""Emulator-backed benchmark suite with JSON baselines and a regression check.
+
+Runs every case whose emulator is configured (the others are skipped):
+
+- pubsub_publish: publish_message latency, publish_bulk throughput
+- pubsub_subscribe: consume_messages throughput and publish-to-handler latency
+- firestore_crud: add/get/update/delete_document latency, list_documents
+- storage: upload_blob/download_blob latency (small) and MB/s (large)
+- pubsub_admin: src/pubsub.py create/delete, listing, build_topology, reconcile
+
+Results are written to benchmarks/results/suite.json and compared with the
+baseline in benchmarks/baselines/suite.json. A metric regresses when a
+latency (p50_ms, p99_ms, mean_ms) grows, or a rate (*_per_sec, *_per_s)
+drops, by more than --threshold, or when a baseline metric is missing from a
+case that ran. The exit status is 1 if anything regressed or a case raised.
+
+Usage:
+    export PUBSUB_EMULATOR_HOST=localhost:8085
+    export FIRESTORE_EMULATOR_HOST=localhost:8080
+    export STORAGE_EMULATOR_HOST=http://localhost:4443
+    python -m benchmarks.run                        # run and compare with the baseline
+    python -m benchmarks.run --update-baseline      # accept the current numbers
+    python -m benchmarks.run --only storage,firestore_crud --threshold 0.3
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from benchmarks.common import PROJECT_ROOT, measure, percentile, save_results, summarize
+
+BASELINES_DIR = PROJECT_ROOT / "benchmarks" / "baselines"
+DEFAULT_THRESHOLD = 0.2
+LOWER_IS_BETTER = ("p50_ms", "p99_ms", "mean_ms")
+HIGHER_IS_BETTER = ("_per_sec", "_per_s")
+
+
+def quiet(fn):
+    """Wrap fn to discard the helper's progress prints."""
+    def wrapper(*args, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+def _unique(prefix):
+    return f"{prefix}-{uuid.uuid4().hex[:8]}"
+
+
+def _cleanup(description, fn, *fn_args, **fn_kwargs):
+    """Delete a resource a case created; a failure here must not mask the case's own result."""
+    try:
+        fn(*fn_args, **fn_kwargs)
+    except Exception as e:
+        print(f"⚠️  Could not clean up {description}: {e}")
+
+
+def bench_pubsub_publish(args):
+    from google.cloud import pubsub_v1
+
+    from experiments import pubsub_example
+
+    topic = _unique("bench-publish")
+    topic_path = f"projects/{args.project}/topics/{topic}"
+    publisher = pubsub_v1.PublisherClient()
+    publisher.create_topic(request={"name": topic_path})
+    try:
+        payload = "x" * 256
+        publish = quiet(pubsub_example.publish_message)
+        result = {"publish_message": summarize(measure(
+            lambda: publish(args.project, topic, payload), repeat=args.iterations))}
+
+        bulk = quiet(pubsub_example.publish_bulk)(args.project, topic,
+                                                  (payload for _ in range(args.messages)))
+        result["publish_bulk"] = {"messages_per_sec": bulk["messages_per_sec"],
+                                  "failed": bulk["failed"]}
+        return result
+    finally:
+        _cleanup(f"topic {topic}", publisher.delete_topic, request={"topic": topic_path})
+
+
+def bench_pubsub_subscribe(args):
+    from google.cloud import pubsub_v1
+
+    topic, subscription = _unique("bench-sub-topic"), _unique("bench-sub")
+    topic_path = f"projects/{args.project}/topics/{topic}"
+    subscription_path = f"projects/{args.project}/subscriptions/{subscription}"
+    publisher, subscriber = pubsub_v1.PublisherClient(), pubsub_v1.SubscriberClient()
+    publisher.create_topic(request={"name": topic_path})
+    try:
+        subscriber.create_subscription(request={"name": subscription_path, "topic": topic_path})
+        try:
+            return _consume_while_publishing(args, topic, subscription)
+        finally:
+            _cleanup(f"subscription {subscription}", subscriber.delete_subscription,
+                     request={"subscription": subscription_path})
+    finally:
+        _cleanup(f"topic {topic}", publisher.delete_topic, request={"topic": topic_path})
+
+
+def _consume_while_publishing(args, topic, subscription):
+    from experiments import pubsub_example
+
+    received = []
+    lock = threading.Lock()
+
+    def handler(message):
+        now = time.time()
+        with lock:
+            received.append((now, now - float(message.attributes["sent_at"])))
+
+    # Consume while publishing, so delivery latency doesn't include the
+    # time the rest of the backlog took to publish
+    consumed = {}
+
+    def consume():
+        consumed["stats"] = pubsub_example.consume_messages(
+            args.project, subscription, handler, timeout=args.subscribe_timeout,
+            report_interval=args.subscribe_timeout,
+        )
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        consumer = threading.Thread(target=consume, name="bench-consumer")
+        consumer.start()
+        pubsub_example.publish_bulk(args.project, topic, (
+            {"data": "x" * 256, "attributes": {"sent_at": repr(time.time())}}
+            for _ in range(args.messages)
+        ))
+        consumer.join()
+    if "stats" not in consumed:
+        raise RuntimeError("consume_messages did not finish")
+    stats = consumed["stats"]
+    if not received:
+        raise RuntimeError(f"0 messages received within {args.subscribe_timeout}s")
+
+    arrivals = sorted(at for at, _ in received)
+    span = arrivals[-1] - arrivals[0] if len(arrivals) > 1 else 0.0
+    delivery = [latency for _, latency in received]
+    return {"consume_messages": {
+        "received": len(received),
+        "messages_per_sec": len(received) / span if span else 0.0,
+        "p50_ms": percentile(delivery, 50) * 1000,
+        "p99_ms": percentile(delivery, 99) * 1000,
+        "handler_p99_ms": stats["p99_ms"],
+    }}
+
+
+def bench_firestore_crud(args):
+    from experiments import firestore_example as fs
+
+    collection = _unique("bench-crud")
+    add, get = quiet(fs.add_document), quiet(fs.get_document)
+    update, delete = quiet(fs.update_document), quiet(fs.delete_document)
+
+    ids, timings = [], {"add_document": [], "get_document": [], "update_document": [],
+                        "delete_document": []}
+
+    def timed(name, fn, *fn_args):
+        start = time.perf_counter()
+        value = fn(*fn_args)
+        timings[name].append(time.perf_counter() - start)
+        return value
+
+    try:
+        for n in range(args.iterations):
+            ids.append(timed("add_document", add, collection, {"n": n, "status": "new"}))
+        for doc_id in ids:
+            timed("get_document", get, collection, doc_id, False)
+            timed("update_document", update, collection, doc_id, {"status": "done"})
+        listing = summarize(measure(lambda: quiet(fs.list_documents)(collection), repeat=5))
+        while ids:
+            timed("delete_document", delete, collection, ids[0])
+            ids.pop(0)
+    finally:
+        # Documents left behind by a failure part-way through
+        for doc_id in ids:
+            _cleanup(f"document {collection}/{doc_id}", delete, collection, doc_id)
+
+    result = {name: summarize(samples) for name, samples in timings.items()}
+    result["list_documents"] = listing
+    return result
+
+
+def bench_storage(args):
+    from clients import get_client
+
+    bucket = _unique("bench-suite")
+    created = get_client("storage").create_bucket(bucket)
+    try:
+        return _upload_and_download(args, bucket)
+    finally:
+        _cleanup(f"bucket {bucket}", created.delete, force=True)
+
+
+def _upload_and_download(args, bucket):
+    from experiments import storage_example
+
+    upload, download = quiet(storage_example.upload_blob), quiet(storage_example.download_blob)
+    result = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, size in (("small", 64 * 1024), ("large", args.large_mb * 1024 * 1024)):
+            source = Path(tmp) / f"{label}.bin"
+            source.write_bytes(os.urandom(size))
+            target = str(Path(tmp) / f"{label}.out")
+            repeat = args.iterations if label == "small" else 3
+            up = summarize(measure(lambda: upload(bucket, str(source), label), repeat=repeat))
+            down = summarize(measure(lambda: download(bucket, label, target), repeat=repeat))
+            megabytes = size / (1024 * 1024)
+            up["mb_per_s"] = megabytes / (up["mean_ms"] / 1000) if up["mean_ms"] else 0.0
+            down["mb_per_s"] = megabytes / (down["mean_ms"] / 1000) if down["mean_ms"] else 0.0
+            result[f"upload_{label}"] = up
+            result[f"download_{label}"] = down
+    return result
+
+
+def bench_pubsub_admin(args):
+    import pubsub
+
+    suffix = uuid.uuid4().hex[:8]
+    create_topic, delete_topic = quiet(pubsub.create_topic), quiet(pubsub.delete_topic)
+    create_sub, delete_sub = quiet(pubsub.create_subscription), quiet(pubsub.delete_subscription)
+    cycles = max(1, args.iterations // 5)
+    timings = {"create_topic": [], "create_subscription": [], "delete_subscription": [],
+               "delete_topic": []}
+
+    names = [(f"bench-admin-{suffix}-{n}", f"bench-admin-sub-{suffix}-{n}") for n in range(cycles)]
+    # Created but not yet deleted, for cleanup if the case stops part-way
+    topics_left, subscriptions_left = [], []
+    try:
+        for step, fn, created, pick in (
+                ("create_topic", lambda t, s: create_topic(t), topics_left, 0),
+                ("create_subscription", create_sub, subscriptions_left, 1)):
+            for pair in names:
+                start = time.perf_counter()
+                fn(*pair)
+                timings[step].append(time.perf_counter() - start)
+                created.append(pair[pick])
+
+        result = {
+            "list_all_topics": summarize(measure(quiet(pubsub.list_all_topics), repeat=5)),
+            "build_topology": summarize(measure(
+                lambda: quiet(pubsub.build_topology)(refresh=True), repeat=5)),
+        }
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump({"topics": [{"name": t, "subscriptions": [s]} for t, s in names]}, f)
+            spec_path = f.name
+        try:
+            result["reconcile_dry_run"] = summarize(measure(
+                lambda: quiet(pubsub.reconcile)(spec_path, dry_run=True), repeat=5))
+        finally:
+            os.remove(spec_path)
+
+        for step, fn, created, pick in (
+                ("delete_subscription", lambda t, s: delete_sub(s), subscriptions_left, 1),
+                ("delete_topic", lambda t, s: delete_topic(t), topics_left, 0)):
+            for pair in names:
+                start = time.perf_counter()
+                fn(*pair)
+                timings[step].append(time.perf_counter() - start)
+                created.remove(pair[pick])
+    finally:
+        for subscription in subscriptions_left:
+            _cleanup(f"subscription {subscription}", delete_sub, subscription)
+        for topic in topics_left:
+            _cleanup(f"topic {topic}", delete_topic, topic)
+    result.update({name: summarize(samples) for name, samples in timings.items()})
+    return result
+
+
+CASES = {
+    "pubsub_publish": ("PUBSUB_EMULATOR_HOST", bench_pubsub_publish),
+    "pubsub_subscribe": ("PUBSUB_EMULATOR_HOST", bench_pubsub_subscribe),
+    "firestore_crud": ("FIRESTORE_EMULATOR_HOST", bench_firestore_crud),
+    "storage": ("STORAGE_EMULATOR_HOST", bench_storage),
+    "pubsub_admin": ("PUBSUB_EMULATOR_HOST", bench_pubsub_admin),
+}
+
+
+def flatten(results, prefix=""):
+    """{"case": {"op": {"p50_ms": 1}}} -> {"case.op.p50_ms": 1} for comparable metrics."""
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool) and (
+                key in LOWER_IS_BETTER or key.endswith(HIGHER_IS_BETTER)):
+            flat[name] = value
+    return flat
+
+
+def compare(baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """Return regressions of current vs baseline results, worst first.
+
+    Each item is {"metric", "baseline", "current", "change"} where change is
+    the relative slowdown (positive is worse). A baseline metric missing from
+    a case that did run is reported first, with current and change None;
+    cases missing on either side (not run, or new) are ignored.
+    """
+    old, new = flatten(baseline), flatten(current)
+    regressions = [
+        {"metric": metric, "baseline": old[metric], "current": None, "change": None}
+        for metric in sorted(old.keys() - new.keys())
+        if metric.split(".", 1)[0] in current
+    ]
+    changed = []
+    for metric in sorted(old.keys() & new.keys()):
+        before, after = old[metric], new[metric]
+        if not before:
+            continue
+        if metric.endswith(HIGHER_IS_BETTER):
+            change = (before - after) / before
+        else:
+            change = (after - before) / before
+        if change > threshold:
+            changed.append({"metric": metric, "baseline": before, "current": after,
+                            "change": change})
+    return regressions + sorted(changed, key=lambda item: item["change"], reverse=True)
+
+
+def load_baseline(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text())["results"]
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(path: Path, results: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"timestamp": time.time(), "results": results},
+                               indent=2, sort_keys=True))
+    print(f"📌 Baseline written to {path}")
+
+
+def report_failures(failed: dict) -> int:
+    """Print the cases that raised; a broken benchmark fails the run."""
+    if not failed:
+        return 0
+    print(f"\n❌ {len(failed)} case(s) failed: {', '.join(sorted(failed))}")
+    return 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", help="Comma-separated case names (default: all)")
+    parser.add_argument("--project", default="bench-project")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--subscribe-timeout", type=float, default=15.0)
+    parser.add_argument("--large-mb", type=int, default=32)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed relative slowdown before a metric counts as regressed")
+    parser.add_argument("--baseline", type=Path, default=BASELINES_DIR / "suite.json")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    selected = args.only.split(",") if args.only else list(CASES)
+    unknown = set(selected) - set(CASES)
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(sorted(unknown))}")
+
+    # The helpers read the project from the shared settings
+    os.environ.setdefault("GOOGLE_CLOUD_PROJECT", args.project)
+    args.project = os.environ["GOOGLE_CLOUD_PROJECT"]
+
+    results, failed = {}, {}
+    for name in selected:
+        env_var, case = CASES[name]
+        if not os.getenv(env_var):
+            print(f"⏭️  {name}: skipped ({env_var} not set)")
+            continue
+        print(f"▶️  {name}...")
+        start = time.perf_counter()
+        try:
+            results[name] = case(args)
+        except Exception as e:
+            failed[name] = str(e)
+            print(f"❌ {name} failed: {e}")
+            continue
+        print(f"✅ {name} done in {time.perf_counter() - start:.1f}s")
+
+    if not results and not failed:
+        print("❌ Nothing ran. Start the emulators and export their hosts first.")
+        return 1
+
+    if results:
+        save_results("suite", results)
+    if args.update_baseline:
+        if results:
+            save_baseline(args.baseline, {**load_baseline(args.baseline), **results})
+        return report_failures(failed)
+
+    baseline = load_baseline(args.baseline)
+    if not baseline:
+        print(f"ℹ️  No baseline at {args.baseline}; run with --update-baseline to create one")
+        return report_failures(failed)
+
+    regressions = compare(baseline, results, args.threshold)
+    if regressions:
+        print(f"\n❌ {len(regressions)} metric(s) regressed beyond {args.threshold:.0%}:")
+        for item in regressions:
+            if item["current"] is None:
+                print(f"  {item['metric']}: {item['baseline']:,.2f} -> missing")
+            else:
+                print(f"  {item['metric']}: {item['baseline']:,.2f} -> {item['current']:,.2f} "
+                      f"({item['change']:+.0%})")
+    elif results:
+        print(f"\n✅ No regressions beyond {args.threshold:.0%} of the baseline")
+    return report_failures(failed) or (1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""Event deduplication for at-least-once Cloud Functions triggers.
+
+Eventarc / GCS triggers may deliver the same event more than once. Before
+doing any work, the function claims a key built from the event ID and the
+object generation; only the first claim proceeds. A claim is a lease: it is
+marked complete once the work succeeds, a failed invocation releases it so
+the platform's retry is processed normally, and a claim left behind by an
+invocation that crashed or timed out expires after lease_seconds, so a
+later retry can take it over instead of being dropped as a duplicate.
+
+Stores:
+- LRUDedupStore: bounded in-process memory, catches redeliveries to the
+  same instance at no cost
+- GCSDedupStore: shared across instances using marker objects created
+  with an ifGenerationMatch=0 precondition (an atomic "create if absent")
+  and taken over with an ifGenerationMatch on the expired marker's
+  generation; add a lifecycle rule on the marker bucket to expire old markers
+- LayeredDedupStore: checks a local store before a shared one
+"""
+
+import abc
+import threading
+import time
+from collections import OrderedDict
+
+# Longer than the function timeout, so a live invocation never loses its claim
+DEFAULT_LEASE_SECONDS = 600.0
+
+
+class DedupStore(abc.ABC):
+    """Interface for dedup stores."""
+
+    @abc.abstractmethod
+    def claim(self, key: str) -> bool:
+        """Lease key; return True if it is new or its previous lease expired (the caller should process)."""
+
+    @abc.abstractmethod
+    def complete(self, key: str):
+        """Mark key as processed so every later delivery is a duplicate."""
+
+    @abc.abstractmethod
+    def release(self, key: str):
+        """Forget key so a retry of a failed event is processed again."""
+
+
+class LRUDedupStore(DedupStore):
+    """In-process store remembering the most recent max_entries keys."""
+
+    def __init__(self, max_entries: int = 10000, lease_seconds: float = DEFAULT_LEASE_SECONDS,
+                 clock=time.monotonic):
+        self.max_entries = max_entries
+        self.lease_seconds = lease_seconds
+        self._clock = clock
+        # key -> lease expiry, or None once completed
+        self._keys = OrderedDict()
+        self._lock = threading.Lock()
+
+    def claim(self, key):
+        with self._lock:
+            now = self._clock()
+            if key in self._keys:
+                self._keys.move_to_end(key)
+                expires_at = self._keys[key]
+                if expires_at is None or expires_at > now:
+                    return False
+            self._keys[key] = now + self.lease_seconds
+            if len(self._keys) > self.max_entries:
+                self._keys.popitem(last=False)
+            return True
+
+    def complete(self, key):
+        with self._lock:
+            self._keys[key] = None
+            self._keys.move_to_end(key)
+            if len(self._keys) > self.max_entries:
+                self._keys.popitem(last=False)
+
+    def release(self, key):
+        with self._lock:
+            self._keys.pop(key, None)
+
+
+class GCSDedupStore(DedupStore):
+    """Shared store keeping one empty marker object per key in a bucket.
+
+    The marker's metadata holds either the lease expiry (wall-clock seconds,
+    comparable across instances) or state "done" once the work completed.
+    """
+
+    def __init__(self, bucket, prefix: str = "dedup/",
+                 lease_seconds: float = DEFAULT_LEASE_SECONDS, clock=time.time):
+        self.bucket = bucket
+        self.prefix = prefix
+        self.lease_seconds = lease_seconds
+        self._clock = clock
+
+    def _write_marker(self, key, metadata, **preconditions):
+        blob = self.bucket.blob(self.prefix + key)
+        blob.metadata = metadata
+        blob.upload_from_string(b"", **preconditions)
+
+    def claim(self, key):
+        from google.api_core import exceptions
+
+        lease = {"lease_expires_at": str(self._clock() + self.lease_seconds)}
+        try:
+            self._write_marker(key, lease, if_generation_match=0)
+            return True
+        except exceptions.PreconditionFailed:
+            pass
+
+        marker = self.bucket.get_blob(self.prefix + key)
+        if marker is None:
+            # Released between the two calls: claim it afresh
+            generation = 0
+        else:
+            metadata = marker.metadata or {}
+            if metadata.get("state") == "done":
+                return False
+            expires_at = metadata.get("lease_expires_at")
+            if expires_at is None:
+                # Marker without a lease: count the lease from its last write
+                expires_at = marker.updated.timestamp() + self.lease_seconds
+            if float(expires_at) > self._clock():
+                return False
+            generation = marker.generation
+        try:
+            # Take over the expired lease, unless another retry got there first
+            self._write_marker(key, lease, if_generation_match=generation)
+            return True
+        except exceptions.PreconditionFailed:
+            return False
+
+    def complete(self, key):
+        self._write_marker(key, {"state": "done"})
+
+    def release(self, key):
+        from google.api_core import exceptions
+
+        try:
+            self.bucket.blob(self.prefix + key).delete()
+        except exceptions.NotFound:
+            pass
+
+
+class LayeredDedupStore(DedupStore):
+    """Consult a cheap local store first, then the shared store."""
+
+    def __init__(self, local: DedupStore, shared: DedupStore):
+        self.local = local
+        self.shared = shared
+
+    def claim(self, key):
+        if not self.local.claim(key):
+            return False
+        try:
+            claimed = self.shared.claim(key)
+        except Exception:
+            # Don't let a failed shared claim turn this instance's retry into a duplicate
+            self.local.release(key)
+            raise
+        return claimed
+
+    def complete(self, key):
+        self.local.complete(key)
+        self.shared.complete(key)
+
+    def release(self, key):
+        self.local.release(key)
+        self.shared.release(key)
+
+
+class DedupStats:
+    """Thread-safe duplicate / first-delivery counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.duplicates = 0
+        self.processed = 0
+
+    def record(self, duplicate: bool):
+        with self._lock:
+            if duplicate:
+                self.duplicates += 1
+            else:
+                self.processed += 1
+
+    def as_fields(self) -> dict:
+        """Counters formatted for structured log json_fields."""
+        with self._lock:
+            total = self.duplicates + self.processed
+            return {
+                "dedup_duplicates": self.duplicates,
+                "dedup_processed": self.processed,
+                "dedup_hit_rate": self.duplicates / total if total else 0.0,
+            }
+
+
+def event_key(cloud_event) -> str:
+    """Dedup key for a storage CloudEvent: event ID plus object generation."""
+    return f"{cloud_event['id']}:{cloud_event.data.get('generation', '')}"
+
+
+def build_dedup_store(storage_client=None, bucket_name: str = None, max_entries: int = 10000,
+                      lease_seconds: float = DEFAULT_LEASE_SECONDS) -> DedupStore:
+    """Return an LRU store, layered over a GCS marker store when bucket_name is set."""
+    local = LRUDedupStore(max_entries=max_entries, lease_seconds=lease_seconds)
+    if not bucket_name:
+        return local
+    shared = GCSDedupStore(storage_client.bucket(bucket_name), lease_seconds=lease_seconds)
+    return LayeredDedupStore(local, shared)
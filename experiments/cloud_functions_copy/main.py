@@ -3,30 +3,76 @@ from google.cloud import storage
 import google.cloud.logging
 import os
 import logging
+import time
+from dedup import DEFAULT_LEASE_SECONDS, DedupStats, build_dedup_store, event_key
 
 # 1. Initialize the Cloud Logging client
-log_client = google.cloud.logging.Client()
-# 2. Connect the standard Python logging module to Google Cloud Logging
-log_client.setup_logging()
+# (skipped when running locally against a fake GCS server, e.g. in tests)
+if os.environ.get("STORAGE_EMULATOR_HOST"):
+    logging.basicConfig(level=logging.INFO)
+else:
+    log_client = google.cloud.logging.Client()
+    # 2. Connect the standard Python logging module to Google Cloud Logging
+    log_client.setup_logging()
 
 # Initialize the storage client
 storage_client = storage.Client()
 
+# Objects at least this big are copied with resumable rewrite calls instead of a
+# single copy request, which can time out for very large (or cross-location) objects
+LARGE_OBJECT_THRESHOLD = int(os.environ.get("LARGE_OBJECT_THRESHOLD", 1024 * 1024 * 1024))
+# Optional cap on bytes per rewrite call (a multiple of 256 KiB)
+REWRITE_CHUNK_BYTES = int(os.environ.get("REWRITE_CHUNK_BYTES", 0)) or None
+
+# Drop redelivered events: in-memory per instance, plus marker objects in
+# DEDUP_BUCKET (if set) so redeliveries to other instances are caught too
+dedup_store = build_dedup_store(
+    storage_client,
+    bucket_name=os.environ.get("DEDUP_BUCKET"),
+    max_entries=int(os.environ.get("DEDUP_MAX_ENTRIES", 10000)),
+    # Must exceed the function timeout; a crashed invocation's claim expires after this
+    lease_seconds=float(os.environ.get("DEDUP_LEASE_SECONDS", DEFAULT_LEASE_SECONDS)),
+)
+dedup_stats = DedupStats()
+
+
+def _copy_large_object(source_blob, destination_bucket, file_name):
+    """Copy with Blob.rewrite, following rewrite tokens until the copy completes."""
+    destination_blob = destination_bucket.blob(file_name, chunk_size=REWRITE_CHUNK_BYTES)
+    token, rewritten, total = destination_blob.rewrite(source_blob)
+    calls = 1
+    while token is not None:
+        logging.info(f"Rewrite of {file_name} in progress: {rewritten}/{total} bytes")
+        token, rewritten, total = destination_blob.rewrite(source_blob, token=token)
+        calls += 1
+    return calls
+
+
+def _complete_claim(key):
+    """Mark the event done; if that fails the lease just expires and a retry redoes the idempotent copy."""
+    try:
+        dedup_store.complete(key)
+    except Exception as e:
+        logging.warning(f"Could not complete dedup claim {key}: {e}")
+
+
 @functions_framework.cloud_event
 def copy_file(cloud_event):
     """
     Triggered by a change to a Cloud Storage bucket.
-    Copies the file to a destination bucket.
+    Copies the file to a destination bucket, unless it already holds the
+    same content (matching CRC32C), and logs timing metrics for each event.
     """
+    start = time.perf_counter()
     data = cloud_event.data
 
     # Extract file and bucket details from the event
     bucket_name = data["bucket"]
     file_name = data["name"]
-    
+
     # Destination bucket name from environment variable
     destination_bucket_name = os.environ.get("DESTINATION_BUCKET")
-    
+
     if not destination_bucket_name:
         logging.error("DESTINATION_BUCKET environment variable not set.")
         return
@@ -36,27 +82,79 @@ def copy_file(cloud_event):
         logging.warning(f"Source and destination are the same ({bucket_name}). Skipping.")
         return
 
-    logging.info(f"Processing file: {file_name} from bucket: {bucket_name}")
-
     source_bucket = storage_client.bucket(bucket_name)
     destination_bucket = storage_client.bucket(destination_bucket_name)
 
-    source_blob = source_bucket.blob(file_name)
-    
+    # Pin the copy to the generation that triggered the event
+    source_blob = source_bucket.blob(file_name, generation=data.get("generation"))
+    size = int(data.get("size") or 0)
+    metrics = {
+        "file_name": file_name,
+        "source_bucket": bucket_name,
+        "dest_bucket": destination_bucket_name,
+        "event_id": cloud_event["id"],
+        "bytes": size,
+    }
+
+    key = event_key(cloud_event)
+    claimed = False
     try:
-        # Copy the blob to the destination bucket
-        new_blob = source_bucket.copy_blob(source_blob, destination_bucket, file_name)
-        
-        # 3. STRUCTURED LOGGING: Using a dictionary for powerful searching
-        logging.info("File copy successful", extra={
-            "json_fields": {
+        # At-least-once delivery: only the first delivery of an event does the work
+        if not dedup_store.claim(key):
+            dedup_stats.record(duplicate=True)
+            logging.info("Duplicate event ignored", extra={"json_fields": {
                 "file_name": file_name,
-                "source_bucket": bucket_name,
-                "dest_bucket": destination_bucket_name,
-                "event_id": cloud_event["id"]
-            }
-        })
+                "event_id": cloud_event["id"],
+                "mode": "duplicate",
+                **dedup_stats.as_fields(),
+            }})
+            return {"mode": "duplicate"}
+        claimed = True
+        dedup_stats.record(duplicate=False)
+        metrics.update(dedup_stats.as_fields())
+
+        logging.info(f"Processing file: {file_name} from bucket: {bucket_name}")
+
+        # Idempotency: skip when the destination already has the same content
+        existing = destination_bucket.get_blob(file_name)
+        if existing is not None and data.get("crc32c") and existing.crc32c == data["crc32c"]:
+            metrics.update(mode="skipped", duration_ms=(time.perf_counter() - start) * 1000)
+            _complete_claim(key)
+            logging.info("File already up to date, copy skipped", extra={"json_fields": metrics})
+            return metrics
+
+        if size >= LARGE_OBJECT_THRESHOLD:
+            calls = _copy_large_object(source_blob, destination_bucket, file_name)
+            metrics.update(mode="rewrite", rewrite_calls=calls)
+        else:
+            # Copy the blob to the destination bucket (copy_blob ignores
+            # source_blob.generation, so pin it explicitly)
+            source_bucket.copy_blob(source_blob, destination_bucket, file_name,
+                                    source_generation=data.get("generation"))
+            metrics.update(mode="copy")
+
+        duration = time.perf_counter() - start
+        metrics.update(
+            duration_ms=duration * 1000,
+            mb_per_s=size / (1024 * 1024) / duration if duration else 0.0,
+        )
+
+        _complete_claim(key)
+
+        # 3. STRUCTURED LOGGING: Using a dictionary for powerful searching
+        logging.info("File copy successful", extra={"json_fields": metrics})
+        return metrics
 
     except Exception as e:
         # logging.exception automatically includes the stack trace
-        logging.exception(f"Error copying file {file_name}: {e}")
+        logging.exception(f"Error copying file {file_name}: {e}", extra={"json_fields": {
+            **metrics, "mode": "failed", "duration_ms": (time.perf_counter() - start) * 1000,
+        }})
+        if claimed:
+            # Forget the claim so the platform's retry of this event is processed
+            try:
+                dedup_store.release(key)
+            except Exception as release_error:
+                logging.warning(f"Could not release dedup claim {key}: {release_error}")
+        # Fail the invocation so the platform retries the event
+        raise
@@ -0,0 +1,209 @@
+"""Background, batched shipping of structured log entries.
+
+Calling logger.log_struct() inline makes every log line a network round trip
+on the request path. BatchingLogShipper instead puts entries on a bounded
+in-memory queue and a background thread sends them in batches, cut by entry
+count, approximate bytes or age, whichever comes first.
+
+When the queue is full, entries are dropped ("drop", the default: never slow
+the caller) or the caller waits for room ("block", optionally with a
+timeout after which the entry is dropped). close() flushes what is queued.
+
+A sink is any callable taking a list of (payload dict, severity) tuples, so
+tests can use a plain list-appending stub; CloudLoggingSink sends a batch to
+Cloud Logging in a single entries.write call. ShipperHandler plugs a shipper
+into the standard logging module, so logging.info(..., extra={"json_fields":
+...}) calls are shipped the same way.
+"""
+
+import json
+import logging
+import queue
+import threading
+import time
+
+_FLUSH = object()
+_STOP = object()
+
+
+class CloudLoggingSink:
+    """Write a batch of structured entries with one Cloud Logging API call."""
+
+    def __init__(self, logger):
+        self.logger = logger
+
+    def __call__(self, entries):
+        batch = self.logger.batch()
+        for payload, severity in entries:
+            batch.log_struct(payload, severity=severity)
+        batch.commit()
+
+
+class BatchingLogShipper:
+    """Bounded queue plus a background thread that ships entries in batches."""
+
+    def __init__(self, sink, max_batch_entries: int = 100, max_batch_bytes: int = 256 * 1024,
+                 max_latency: float = 1.0, max_queue: int = 10000, overflow: str = "drop",
+                 block_timeout: float = None):
+        if overflow not in ("drop", "block"):
+            raise ValueError("overflow must be 'drop' or 'block'")
+        self.sink = sink
+        self.max_batch_entries = max_batch_entries
+        self.max_batch_bytes = max_batch_bytes
+        self.max_latency = max_latency
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._closed = False
+        self.dropped = 0
+        self.shipped = 0
+        self.batches = 0
+        self.failed_entries = 0
+        self._worker = threading.Thread(target=self._run, name="log-shipper", daemon=True)
+        self._worker.start()
+
+    def submit(self, payload: dict, severity: str = "INFO") -> bool:
+        """Queue an entry for shipping; returns False if it was dropped."""
+        if self._closed:
+            self._count_drop()
+            return False
+        try:
+            if self.overflow == "block":
+                self._queue.put((payload, severity), timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait((payload, severity))
+        except queue.Full:
+            self._count_drop()
+            return False
+        if self._closed and not self._worker.is_alive():
+            # Lost the race with close(): the worker is gone and won't ship it
+            self._drop_stranded()
+            return False
+        return True
+
+    def _count_drop(self):
+        with self._lock:
+            self.dropped += 1
+
+    def _drop_stranded(self):
+        """Count entries left on the queue after the worker exited as dropped."""
+        while True:
+            try:
+                payload, extra = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if payload is _FLUSH:
+                extra.set()
+            elif payload is not _STOP:
+                self._count_drop()
+
+    def flush(self, timeout: float = None) -> bool:
+        """Ship everything queued so far; returns False if timeout expired first."""
+        if self._closed:
+            return not self._worker.is_alive()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        done = threading.Event()
+        try:
+            # A full queue must not make flush overrun its deadline
+            self._queue.put((_FLUSH, done), timeout=timeout)
+        except queue.Full:
+            return False
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        return done.wait(remaining)
+
+    def close(self, timeout: float = 5.0):
+        """Stop accepting entries, ship what is queued and stop the worker."""
+        if self._closed:
+            return
+        self._closed = True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            # Like flush, a full queue behind a stuck sink must not overrun the deadline;
+            # the daemon worker keeps draining what is queued
+            self._queue.put((_STOP, None), timeout=timeout)
+        except queue.Full:
+            return
+        self._worker.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        if not self._worker.is_alive():
+            self._drop_stranded()
+
+    def metrics(self) -> dict:
+        """Queue depth plus shipped / dropped / failed counters."""
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "shipped": self.shipped,
+                "dropped": self.dropped,
+                "failed": self.failed_entries,
+                "batches": self.batches,
+            }
+
+    def _ship(self, batch):
+        if not batch:
+            return
+        try:
+            self.sink(batch)
+            with self._lock:
+                self.shipped += len(batch)
+                self.batches += 1
+        except Exception as e:
+            with self._lock:
+                self.failed_entries += len(batch)
+            print(f"⚠️  Log shipper failed to send {len(batch)} entries: {e}")
+
+    def _run(self):
+        batch, batch_bytes, deadline = [], 0, None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                # Oldest entry reached max_latency
+                self._ship(batch)
+                batch, batch_bytes, deadline = [], 0, None
+                continue
+
+            payload, extra = item
+            if payload is _FLUSH or payload is _STOP:
+                self._ship(batch)
+                batch, batch_bytes, deadline = [], 0, None
+                if payload is _STOP:
+                    return
+                extra.set()
+                continue
+
+            try:
+                size = len(json.dumps(payload, default=str))
+            except (TypeError, ValueError) as e:
+                # e.g. a circular reference: the sink couldn't serialize it either
+                self._count_drop()
+                print(f"⚠️  Log shipper dropped an unserializable entry: {e}")
+                continue
+            batch.append(item)
+            batch_bytes += size
+            if deadline is None:
+                deadline = time.monotonic() + self.max_latency
+            if len(batch) >= self.max_batch_entries or batch_bytes >= self.max_batch_bytes:
+                self._ship(batch)
+                batch, batch_bytes, deadline = [], 0, None
+
+
+class ShipperHandler(logging.Handler):
+    """logging.Handler that submits records to a BatchingLogShipper."""
+
+    def __init__(self, shipper: BatchingLogShipper, level=logging.NOTSET):
+        super().__init__(level)
+        self.shipper = shipper
+
+    def emit(self, record):
+        try:
+            payload = {"message": self.format(record), "logger": record.name}
+            payload.update(getattr(record, "json_fields", None) or {})
+            self.shipper.submit(payload, severity=record.levelname)
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        self.shipper.flush()
+        super().close()
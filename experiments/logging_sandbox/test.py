@@ -2,12 +2,17 @@ import google.cloud.logging
 from google.cloud import error_reporting
 import time
 import random
+from log_shipper import BatchingLogShipper, CloudLoggingSink
 
 # 1. Setup Clients
 log_client = google.cloud.logging.Client()
 logger = log_client.logger("structured-test-logger")
 error_client = error_reporting.Client()
 
+# Entries are shipped in batches by a background thread instead of one
+# API call per log line on the request path
+shipper = BatchingLogShipper(CloudLoggingSink(logger), max_latency=2.0)
+
 def risky_operation(user_id):
     try:
         print(f"User {user_id} is attempting a risky operation...")
@@ -31,7 +36,7 @@ def risky_operation(user_id):
         }
         
         severity = "INFO" if status == "success" else "WARNING"
-        logger.log_struct(log_data, severity=severity)
+        shipper.submit(log_data, severity=severity)
         print(f"✅ Status: {status} ({duration:.2f}s)")
 
     except Exception as e:
@@ -41,7 +46,7 @@ def risky_operation(user_id):
         except:
             pass
         
-        logger.log_struct({
+        shipper.submit({
             "user": user_id,
             "status": "failed",
             "error_msg": str(e)
@@ -57,4 +62,8 @@ if __name__ == "__main__":
             risky_operation(user)
             time.sleep(1.5) 
     except KeyboardInterrupt:
-        print("\nSimulation stopped.")
\ No newline at end of file
+        print("\nSimulation stopped.")
+    finally:
+        # Flush whatever is still queued before exiting
+        shipper.close()
+        print(f"📊 Log shipper: {shipper.metrics()}")
\ No newline at end of file
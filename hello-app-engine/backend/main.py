@@ -1,14 +1,122 @@
-from flask import Flask, jsonify
+from flask import Flask, Response, jsonify, request
+import gzip
+import hashlib
+import json
+import os
+import time
 
 app = Flask(__name__)
 
+# Clients (and the frontend's cache) may reuse responses this long
+CACHE_CONTROL = f"public, max-age={int(os.environ.get('CACHE_MAX_AGE', 30))}"
+# Bodies smaller than this are not worth compressing
+GZIP_MIN_BYTES = int(os.environ.get('GZIP_MIN_BYTES', 1024))
+MAX_BATCH_ITEMS = int(os.environ.get('MAX_BATCH_ITEMS', 100))
+# Local testing only: lets callers slow any endpoint with ?delay_ms=N
+ALLOW_DELAY_INJECTION = os.environ.get('ALLOW_DELAY_INJECTION', '').lower() in ('1', 'true', 'yes')
+MAX_INJECTED_DELAY_MS = 30000
+
+# In a real app, this is where you would query Cloud SQL or Firestore
+DATA = {
+    "message": "Hello from the Secure Backend API!",
+    "database_status": "Simulated Connection to Firestore"
+}
+ITEMS = {
+    str(n): {"id": str(n), "name": f"Item {n}", "description": f"Simulated record number {n}",
+             "tags": ["sample", f"group-{n % 10}"]}
+    for n in range(1, 1001)
+}
+
+
+def _serialize(payload):
+    return json.dumps(payload, separators=(",", ":"), sort_keys=True).encode()
+
+
+class Precomputed:
+    """A JSON body serialized (and gzipped) once, with a strong content-hash ETag."""
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+        self.compressible = len(body) >= GZIP_MIN_BYTES
+        self._gzip_body = None
+
+    @property
+    def gzip_body(self) -> bytes:
+        # Compressed on first use, then reused
+        if self._gzip_body is None:
+            self._gzip_body = gzip.compress(self.body, compresslevel=6)
+        return self._gzip_body
+
+    @classmethod
+    def from_payload(cls, payload):
+        return cls(_serialize(payload))
+
+
+def conditional_response(precomputed: Precomputed):
+    """200 (gzipped when accepted) or 304 if the client's ETag is current."""
+    # Each encoding is its own representation, so it gets its own strong ETag
+    etags = (precomputed.etag, f"{precomputed.etag}-gzip")
+    headers = {"Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"}
+
+    use_gzip = precomputed.compressible and request.accept_encodings.quality("gzip") > 0
+    etag = etags[1] if use_gzip else etags[0]
+    if any(request.if_none_match.contains(tag) for tag in etags):
+        return Response(status=304, headers={**headers, "ETag": f'"{etag}"'})
+
+    response = Response(precomputed.gzip_body if use_gzip else precomputed.body,
+                        mimetype="application/json", headers=headers)
+    response.set_etag(etag)
+    if use_gzip:
+        response.headers["Content-Encoding"] = "gzip"
+    return response
+
+
+# Responses for static data are built once at startup, not on every hit
+DATA_RESPONSE = Precomputed.from_payload(DATA)
+ITEM_BODIES = {item_id: _serialize(item) for item_id, item in ITEMS.items()}
+ITEM_RESPONSES = {item_id: Precomputed(body) for item_id, body in ITEM_BODIES.items()}
+
+
+@app.before_request
+def inject_delay():
+    """Simulate a slow dependency when ALLOW_DELAY_INJECTION is set."""
+    if ALLOW_DELAY_INJECTION and request.args.get("delay_ms"):
+        try:
+            delay_ms = min(float(request.args["delay_ms"]), MAX_INJECTED_DELAY_MS)
+        except ValueError:
+            return jsonify({"error": "delay_ms must be a number"}), 400
+        time.sleep(max(0.0, delay_ms) / 1000)
+
+
 @app.route("/data")
 def get_data():
-    # In a real app, this is where you would query Cloud SQL or Firestore
-    return jsonify({
-        "message": "Hello from the Secure Backend API!",
-        "database_status": "Simulated Connection to Firestore"
-    })
+    return conditional_response(DATA_RESPONSE)
+
+
+@app.route("/data/items/<item_id>")
+def get_item(item_id):
+    if item_id not in ITEM_RESPONSES:
+        return jsonify({"error": f"Item {item_id} not found"}), 404
+    return conditional_response(ITEM_RESPONSES[item_id])
+
+
+@app.route("/data/batch")
+def get_batch():
+    """Many items in one response: /data/batch?ids=1,2,3"""
+    ids = [item_id for item_id in request.args.get("ids", "").split(",") if item_id]
+    if not ids:
+        return jsonify({"error": "Pass the item IDs as ?ids=1,2,3"}), 400
+    if len(ids) > MAX_BATCH_ITEMS:
+        return jsonify({"error": f"At most {MAX_BATCH_ITEMS} items per batch"}), 400
+
+    # Stitch the pre-serialized items together instead of re-encoding them
+    found = [item_id for item_id in ids if item_id in ITEM_BODIES]
+    missing = [item_id for item_id in ids if item_id not in ITEM_BODIES]
+    body = (b'{"items":[' + b",".join(ITEM_BODIES[item_id] for item_id in found)
+            + b'],"missing":' + _serialize(missing) + b"}")
+    return conditional_response(Precomputed(body))
+
 
 if __name__ == "__main__":
     app.run(host="127.0.0.1", port=8081, debug=True)
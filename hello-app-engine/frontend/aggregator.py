@@ -0,0 +1,129 @@
+"""Concurrent fan-out to several backend calls with per-dependency deadlines.
+
+A page that needs several backend responses starts them all at once on a
+shared thread pool, so it waits for the slowest call instead of the sum of
+all of them. Each dependency has its own deadline and fallback value: a
+call that fails, misses its deadline or returns a value its validate
+check rejects (e.g. an endpoint with another response shape) is replaced
+by its fallback and the page renders with partial data. A late call keeps running in the pool and,
+through BackendClient, still refreshes the cache for the next page view.
+
+Per-dependency timings are returned with each result (for a Server-Timing
+header) and accumulated in stats().
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+
+class Dependency:
+    """One backend call: fetch() must return within deadline seconds, else fallback is used.
+
+    validate, if given, is called with the value; a falsy result counts as an error.
+    """
+
+    def __init__(self, name: str, fetch, deadline: float, fallback=None, validate=None):
+        self.name = name
+        self.fetch = fetch
+        self.deadline = deadline
+        self.fallback = fallback
+        self.validate = validate
+
+
+class DependencyResult:
+    __slots__ = ("name", "value", "status", "elapsed_ms", "error")
+
+    def __init__(self, name, value, status, elapsed_ms, error=None):
+        self.name = name
+        self.value = value
+        self.status = status  # "ok", "timeout" or "error"
+        self.elapsed_ms = elapsed_ms
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+
+def _percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))]
+
+
+class Aggregator:
+    """Run dependencies concurrently on a shared pool and collect their results."""
+
+    def __init__(self, max_workers: int = 16, window: int = 1000):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fanout")
+        self._lock = threading.Lock()
+        self._window = window
+        self._stats = {}
+
+    def gather(self, dependencies) -> dict:
+        """Return {name: DependencyResult}, waiting at most each dependency's deadline."""
+        start = time.perf_counter()
+        futures = [(dependency, self._executor.submit(self._timed, dependency.fetch))
+                   for dependency in dependencies]
+
+        results = {}
+        for dependency, future in futures:
+            # Deadlines run from the start of the fan-out, not from when we got here
+            remaining = dependency.deadline - (time.perf_counter() - start)
+            try:
+                value, elapsed = future.result(timeout=max(0.0, remaining))
+                if dependency.validate is not None and not dependency.validate(value):
+                    raise ValueError(f"unexpected response: {type(value).__name__}")
+                result = DependencyResult(dependency.name, value, "ok", elapsed * 1000)
+            except FutureTimeout:
+                result = DependencyResult(dependency.name, dependency.fallback, "timeout",
+                                          (time.perf_counter() - start) * 1000)
+            except Exception as e:
+                result = DependencyResult(dependency.name, dependency.fallback, "error",
+                                          (time.perf_counter() - start) * 1000, error=str(e))
+            results[dependency.name] = result
+            self._record(result)
+        return results
+
+    @staticmethod
+    def _timed(fetch):
+        start = time.perf_counter()
+        value = fetch()
+        return value, time.perf_counter() - start
+
+    def _record(self, result):
+        with self._lock:
+            stats = self._stats.setdefault(result.name, {
+                "ok": 0, "timeout": 0, "error": 0, "latencies": deque(maxlen=self._window),
+            })
+            stats[result.status] += 1
+            stats["latencies"].append(result.elapsed_ms)
+
+    def stats(self) -> dict:
+        """Per-dependency outcome counts and latency percentiles (ms) over recent calls."""
+        with self._lock:
+            snapshot = {name: dict(stats, latencies=list(stats["latencies"]))
+                        for name, stats in self._stats.items()}
+        return {
+            name: {
+                "ok": stats["ok"],
+                "timeout": stats["timeout"],
+                "error": stats["error"],
+                "p50_ms": _percentile(stats["latencies"], 50),
+                "p99_ms": _percentile(stats["latencies"], 99),
+            }
+            for name, stats in snapshot.items()
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+def server_timing(results) -> str:
+    """Server-Timing header value, e.g. 'data;dur=12.3;desc="ok", items;dur=500.0;desc="timeout"'."""
+    return ", ".join(f'{name};dur={result.elapsed_ms:.1f};desc="{result.status}"'
+                     for name, result in results.items())
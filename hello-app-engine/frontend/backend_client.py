@@ -0,0 +1,143 @@
+"""Pooled, cached HTTP client for frontend -> backend API calls.
+
+- One requests.Session per process keeps connections alive and reuses them
+  across page views instead of a new TCP/TLS handshake per request
+- Every request has connect/read timeouts and idempotent GETs are retried
+  on connection errors and 502/503/504
+- JSON responses are cached for `ttl` seconds. For up to `stale_ttl` more
+  seconds the cached value is still served while one background request
+  revalidates it with If-None-Match (a 304 just renews the entry). After
+  that callers wait for a fresh response, and if the backend is failing
+  the last good value is served rather than an error.
+"""
+
+import threading
+import time
+
+
+def build_session(pool_size: int = 10, retries: int = 2):
+    """requests.Session with a connection pool of pool_size and GET retries."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    retry = Retry(total=retries, backoff_factor=0.1, allowed_methods=["GET"],
+                  status_forcelist=[502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class _Entry:
+    __slots__ = ("value", "etag", "fetched_at")
+
+    def __init__(self, value, etag, fetched_at):
+        self.value = value
+        self.etag = etag
+        self.fetched_at = fetched_at
+
+
+class BackendClient:
+    """GET JSON from the backend through a pooled session and a TTL cache.
+
+    Args:
+        base_url: Backend root URL
+        timeout: requests timeout, seconds or a (connect, read) tuple
+        ttl: Seconds a response is served without contacting the backend (0 disables caching)
+        stale_ttl: Further seconds a response is served while it is revalidated in the background
+        pool_size: Connections kept per host (match the number of server threads)
+        session: Optional preconfigured session (e.g. a stub in tests)
+    """
+
+    def __init__(self, base_url: str, timeout=(3.05, 10), ttl: float = 30.0,
+                 stale_ttl: float = 300.0, pool_size: int = 10, session=None,
+                 clock=time.monotonic):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.session = session if session is not None else build_session(pool_size)
+        self._clock = clock
+        self._cache = {}
+        self._lock = threading.Lock()
+        self._path_locks = {}
+        self._refreshing = set()
+        self._stats = {"hits": 0, "stale": 0, "misses": 0, "not_modified": 0, "errors": 0}
+
+    def get_json(self, path: str):
+        """Return the decoded JSON body of GET base_url + path."""
+        if self.ttl <= 0:
+            return self._fetch(path, None)
+
+        with self._lock:
+            entry = self._cache.get(path)
+            age = self._clock() - entry.fetched_at if entry is not None else None
+            if entry is not None and age < self.ttl:
+                self._stats["hits"] += 1
+                return entry.value
+            if entry is not None and age < self.ttl + self.stale_ttl:
+                self._stats["stale"] += 1
+                refresh = path not in self._refreshing
+                self._refreshing.add(path)
+            else:
+                refresh = None
+                path_lock = self._path_locks.setdefault(path, threading.Lock())
+
+        if refresh is not None:
+            if refresh:
+                threading.Thread(target=self._refresh, args=(path, entry), daemon=True).start()
+            return entry.value
+
+        # Cold or expired: one caller fetches, concurrent callers wait for its result
+        with path_lock:
+            with self._lock:
+                current = self._cache.get(path)
+                if current is not entry and current is not None:
+                    self._stats["hits"] += 1
+                    return current.value
+                self._stats["misses"] += 1
+            return self._fetch(path, entry)
+
+    def cache_stats(self) -> dict:
+        """Hit / stale / miss / 304 / error counters and number of cached paths."""
+        with self._lock:
+            return {**self._stats, "entries": len(self._cache)}
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def _refresh(self, path, entry):
+        try:
+            self._fetch(path, entry)
+        except Exception:
+            pass  # counted in errors; the stale value keeps being served
+        finally:
+            with self._lock:
+                self._refreshing.discard(path)
+
+    def _fetch(self, path, entry):
+        headers = {"If-None-Match": entry.etag} if entry is not None and entry.etag else {}
+        try:
+            response = self.session.get(f"{self.base_url}{path}", headers=headers,
+                                        timeout=self.timeout)
+            if response.status_code == 304 and entry is not None:
+                with self._lock:
+                    self._stats["not_modified"] += 1
+                    self._cache[path] = _Entry(entry.value, entry.etag, self._clock())
+                return entry.value
+            response.raise_for_status()
+            value = response.json()
+        except Exception:
+            with self._lock:
+                self._stats["errors"] += 1
+            if entry is not None:
+                return entry.value
+            raise
+
+        if self.ttl > 0:
+            with self._lock:
+                self._cache[path] = _Entry(value, response.headers.get("ETag"), self._clock())
+        return value
@@ -1,6 +1,9 @@
 from flask import Flask
-import requests
+from markupsafe import escape
+import logging
 import os
+from aggregator import Aggregator, Dependency, server_timing
+from backend_client import BackendClient
 
 app = Flask(__name__)
 
@@ -8,22 +11,81 @@ app = Flask(__name__)
 # For App Engine, services can be reached at https://[service]-dot-[project].appspot.com
 BACKEND_URL = os.environ.get('BACKEND_URL', 'https://backend-api-dot-manoyaka-eng-dev.uc.r.appspot.com')
 
+# Shared by all requests: pooled keep-alive connections, timeouts and a
+# TTL cache for backend responses (revalidated with ETags, stale served
+# while refreshing)
+backend = BackendClient(
+    BACKEND_URL,
+    timeout=(float(os.environ.get('BACKEND_CONNECT_TIMEOUT', 3.05)),
+             float(os.environ.get('BACKEND_READ_TIMEOUT', 10))),
+    ttl=float(os.environ.get('BACKEND_CACHE_TTL', 30)),
+    stale_ttl=float(os.environ.get('BACKEND_STALE_TTL', 300)),
+    pool_size=int(os.environ.get('BACKEND_POOL_SIZE', 10)),
+)
+
+# Backend calls for a page run concurrently; each has its own deadline (seconds)
+# and a fallback so a slow dependency degrades the page instead of stalling it
+aggregator = Aggregator(max_workers=int(os.environ.get('FANOUT_WORKERS', 16)))
+# Overridable for local testing, e.g. FEATURED_PATH='/data/batch?ids=1,2,3&delay_ms=800'
+# against a backend started with ALLOW_DELAY_INJECTION=1
+DATA_PATH = os.environ.get('DATA_PATH', '/data')
+FEATURED_PATH = os.environ.get('FEATURED_PATH', '/data/batch?ids=1,2,3')
+DATA_DEADLINE = float(os.environ.get('DATA_DEADLINE', 1.0))
+FEATURED_DEADLINE = float(os.environ.get('FEATURED_DEADLINE', 0.5))
+
+
+def _is_data(value):
+    return isinstance(value, dict)
+
+
+def _is_featured(value):
+    return isinstance(value, dict) and isinstance(value.get("items"), list)
+
+
+def page_dependencies():
+    # FEATURED_PATH / DATA_PATH may point at endpoints with other shapes (a
+    # list, a string, no "items"); those degrade the page like a missed deadline
+    return [
+        Dependency("data", lambda: backend.get_json(DATA_PATH),
+                   deadline=DATA_DEADLINE,
+                   fallback={"message": "Could not connect to backend"},
+                   validate=_is_data),
+        Dependency("featured", lambda: backend.get_json(FEATURED_PATH),
+                   deadline=FEATURED_DEADLINE,
+                   fallback={"items": []},
+                   validate=_is_featured),
+    ]
+
+
+def _item_name(item):
+    return item.get("name", item) if isinstance(item, dict) else item
+
+
 @app.route("/")
 def index():
-    try:
-        # Frontend calling the Backend API
-        response = requests.get(f"{BACKEND_URL}/data")
-        data = response.json()
+    # Frontend calling the Backend API
+    results = aggregator.gather(page_dependencies())
+    failed = [f"{name} ({result.status})" for name, result in results.items() if not result.ok]
+    if not failed:
         status = "Connected to Backend!"
-    except Exception as e:
-        data = {"message": "Could not connect to backend"}
-        status = f"Error: {str(e)}"
+    elif len(failed) == len(results):
+        status = f"Error: backend unavailable: {', '.join(failed)}"
+    else:
+        status = f"Partial data, missing: {', '.join(failed)}"
+    if failed:
+        logging.warning(f"Rendering without {', '.join(failed)}: {server_timing(results)}")
 
-    return f"""
+    # Backend values are untrusted text: escape everything interpolated
+    data = results["data"].value
+    featured = results["featured"].value["items"]
+    items = "".join(f"<li>{escape(_item_name(item))}</li>" for item in featured)
+    html = f"""
     <h1>Frontend Service</h1>
-    <p>Status: <b>{status}</b></p>
-    <p>Message from Backend: <i>{data['message']}</i></p>
+    <p>Status: <b>{escape(status)}</b></p>
+    <p>Message from Backend: <i>{escape(data.get('message', ''))}</i></p>
+    <ul>{items or '<li>Featured items unavailable</li>'}</ul>
     """
+    return html, 200, {"Server-Timing": server_timing(results)}
 
 if __name__ == "__main__":
     app.run(host="127.0.0.1", port=8080, debug=True)
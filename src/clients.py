@@ -0,0 +1,148 @@
+"""Process-wide registry of lazily created Google Cloud clients.
+
+Creating a client repeats credential discovery and HTTP/gRPC channel setup,
+so helpers should share one client per (service, project, credentials)
+instead of building a new one per call:
+
+    from clients import get_client
+
+    storage_client = get_client("storage")
+    publisher = get_client("publisher")
+
+Credentials that are refreshed (e.g. keys re-read from Secret Manager) are
+new objects each time; pass credentials_key so they replace the cached
+client instead of adding one more per refresh:
+
+    get_client("projects", credentials=creds, credentials_key=creds.service_account_email)
+
+The Google Cloud clients returned here are safe to share between threads.
+Tests can swap factories with register_factory() and drop cached clients
+with reset_clients().
+"""
+
+import threading
+
+
+def _storage_client(project, credentials, **options):
+    from google.cloud import storage
+    return storage.Client(project=project, credentials=credentials, **options)
+
+
+def _firestore_client(project, credentials, **options):
+    from google.cloud import firestore
+    return firestore.Client(project=project, credentials=credentials, **options)
+
+
+def _publisher_client(project, credentials, **options):
+    from google.cloud import pubsub_v1
+    return pubsub_v1.PublisherClient(credentials=credentials, **options)
+
+
+def _subscriber_client(project, credentials, **options):
+    from google.cloud import pubsub_v1
+    return pubsub_v1.SubscriberClient(credentials=credentials, **options)
+
+
+def _projects_client(project, credentials, **options):
+    from google.cloud import resourcemanager_v3
+    return resourcemanager_v3.ProjectsClient(credentials=credentials, **options)
+
+
+def _secret_manager_client(project, credentials, **options):
+    from google.cloud import secretmanager
+    return secretmanager.SecretManagerServiceClient(credentials=credentials, **options)
+
+
+_factories = {
+    "storage": _storage_client,
+    "firestore": _firestore_client,
+    "publisher": _publisher_client,
+    "subscriber": _subscriber_client,
+    "projects": _projects_client,
+    "secretmanager": _secret_manager_client,
+}
+_clients = {}
+_credentials = {}  # cache key -> credentials its client was built with (credentials_key only)
+_lock = threading.Lock()
+
+
+def register_factory(service: str, factory):
+    """Register (or replace) the factory used to build clients for a service.
+
+    Args:
+        service: Service name passed to get_client
+        factory: Callable(project, credentials, **options) returning a client
+    """
+    with _lock:
+        _factories[service] = factory
+
+
+def _cached(key, credentials, credentials_key):
+    """The cached client for key, or None if there is none or it has older credentials."""
+    if credentials_key is not None and _credentials.get(key) is not credentials:
+        return None
+    return _clients.get(key)
+
+
+def get_client(service: str, project: str = None, credentials=None, credentials_key=None,
+               **options):
+    """Return the shared client for a service, creating it on first use.
+
+    Args:
+        service: One of "storage", "firestore", "publisher", "subscriber",
+            "projects", "secretmanager" or a registered custom service
+        project: GCP project ID (ignored by clients that are not project-scoped)
+        credentials: Optional google.auth credentials object
+        credentials_key: Optional stable identity of the credentials, such as
+            the service account email. Clients are then cached per key
+            rather than per credentials object, and a call with different
+            credentials for the same key replaces the cached client
+        **options: Extra client constructor arguments; each distinct set of
+            options gets its own cached client (values must be hashable)
+    """
+    identity = credentials if credentials_key is None else ("credentials_key", credentials_key)
+    key = (service, project, identity, tuple(sorted(options.items())))
+    client = _cached(key, credentials, credentials_key)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _cached(key, credentials, credentials_key)
+        if client is None:
+            if service not in _factories:
+                raise ValueError(f"Unknown client service: {service}")
+            # A replaced client isn't closed: other threads may still be using it
+            client = _factories[service](project, credentials, **options)
+            _clients[key] = client
+            if credentials_key is not None:
+                _credentials[key] = credentials
+    return client
+
+
+def _close(client):
+    """Flush and close a client using whichever shutdown hook it provides."""
+    for method in ("stop", "close"):
+        shutdown = getattr(client, method, None)
+        if callable(shutdown):
+            shutdown()
+            return
+
+
+def close_clients():
+    """Close every cached client and empty the registry."""
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+        _credentials.clear()
+    for client in clients:
+        try:
+            _close(client)
+        except Exception as e:
+            print(f"Warning: error closing {type(client).__name__}: {e}")
+
+
+def reset_clients():
+    """Forget cached clients without closing them (for tests)."""
+    with _lock:
+        _clients.clear()
+        _credentials.clear()
@@ -1,58 +1,193 @@
-"""Configuration management for different environments."""
+"""Configuration management for different environments.
+
+Settings are read from .env files once per process and shared by every
+module through get_settings(), which returns an immutable, typed Settings
+object. Later calls return the same object until one of the .env files is
+created, edited or removed (checked by mtime at most every CHECK_INTERVAL
+seconds), at which point the files are parsed again.
+"""
 
 import os
-from dotenv import load_dotenv
+import threading
+import time
+from dataclasses import dataclass, field, asdict
 from pathlib import Path
+from typing import Optional, Tuple
+from dotenv import dotenv_values
 
+PROJECT_ROOT = Path(__file__).parent.parent
+CHECK_INTERVAL = 1.0  # seconds between .env mtime checks
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Process-wide configuration (see get_settings)."""
+
+    env: str
+    project_id: Optional[str] = None
+    gcs_bucket: Optional[str] = None
+    firestore_collection: Optional[str] = None
+    pubsub_topic: Optional[str] = None
+    pubsub_subscription: Optional[str] = None
+    bigquery_dataset: Optional[str] = None
+    bigquery_table: Optional[str] = None
+    projects_inventory_path: Path = PROJECT_ROOT / ".cache" / "projects_inventory.json"
+    pubsub_topology_cache_dir: Path = PROJECT_ROOT / ".cache"
+    sources: Tuple[Path, ...] = field(default=(), compare=False)
+
+
+_lock = threading.Lock()
+_settings = None
+_signature = None
+_root = None
+_checked_at = 0.0
+_applied = {}  # variables this module put into os.environ
+_original = {}  # process values that .env.{env} / .env.local overrode
+_announced = None
+
+
+def env_files(env: str, root: Path = PROJECT_ROOT):
+    """The .env files for an environment, lowest priority first."""
+    return [root / '.env', root / f'.env.{env}', root / '.env.local']
+
+
+def _file_signature(paths):
+    signature = []
+    for path in paths:
+        try:
+            signature.append(path.stat().st_mtime_ns)
+        except FileNotFoundError:
+            signature.append(None)
+    return tuple(signature)
+
+
+def _apply_to_environ(base, overrides):
+    """Export values like load_dotenv: .env doesn't override the process
+    environment, .env.{env} and .env.local do. Values exported by an earlier
+    load whose keys are gone from the files are removed again, restoring the
+    process value they had overridden."""
+    overridden = {key for key, value in overrides.items() if value is not None}
+    current = overridden | {key for key, value in base.items() if value is not None}
+    for key in set(_applied) - current:
+        value = _applied.pop(key)
+        original = _original.pop(key, None)
+        # Leave it alone if something else has changed it since
+        if os.environ.get(key) == value:
+            if original is None:
+                del os.environ[key]
+            else:
+                os.environ[key] = original
+    for key, value in base.items():
+        if value is None or key in overridden:
+            continue
+        if key in _original:
+            # No longer overridden: the process value wins over .env again
+            if os.environ.get(key) == _applied.pop(key):
+                os.environ[key] = _original[key]
+            del _original[key]
+        elif key not in os.environ or key in _applied:
+            os.environ[key] = _applied[key] = value
+    for key in overridden:
+        if key in os.environ and key not in _applied:
+            _original[key] = os.environ[key]
+        os.environ[key] = _applied[key] = overrides[key]
+
+
+def _load(env, paths):
+    loaded = [path for path in paths if path.exists()]
+    base = dotenv_values(paths[0]) if paths[0].exists() else {}
+    overrides = {}
+    for path in paths[1:]:
+        if path.exists():
+            overrides.update(dotenv_values(path))
+    _apply_to_environ(base, overrides)
+
+    def get(name, default=None):
+        return os.environ.get(name, default)
+
+    return Settings(
+        env=env,
+        project_id=get('GOOGLE_CLOUD_PROJECT'),
+        gcs_bucket=get('GCS_BUCKET_NAME'),
+        firestore_collection=get('FIRESTORE_COLLECTION'),
+        pubsub_topic=get('PUBSUB_TOPIC'),
+        pubsub_subscription=get('PUBSUB_SUBSCRIPTION'),
+        bigquery_dataset=get('BIGQUERY_DATASET'),
+        bigquery_table=get('BIGQUERY_TABLE'),
+        projects_inventory_path=Path(get(
+            'PROJECTS_INVENTORY_PATH', str(Settings.projects_inventory_path))),
+        pubsub_topology_cache_dir=Path(get(
+            'PUBSUB_TOPOLOGY_CACHE_DIR', str(Settings.pubsub_topology_cache_dir))),
+        sources=tuple(loaded),
+    )
+
+
+def get_settings(env: str = None, root: Path = None) -> Settings:
+    """Return the shared Settings, parsing the .env files only when needed.
 
-def load_environment(env: str = None):
-    """Load environment variables from .env files.
-    
     Args:
         env: Environment name (development, staging, production).
              If None, uses ENV environment variable or defaults to 'development'.
-    
+        root: Directory holding the .env files (defaults to the project root)
+
     Priority (later overrides earlier):
-        1. .env (base configuration)
+        1. .env (base configuration, never overrides the process environment)
         2. .env.{environment} (environment-specific)
         3. .env.local (local overrides, gitignored)
     """
-    if env is None:
-        env = os.getenv('ENV', 'development')
-    
-    project_root = Path(__file__).parent.parent
-    
-    # Load base .env file
-    base_env = project_root / '.env'
-    if base_env.exists():
-        load_dotenv(base_env)
-        print(f"✓ Loaded {base_env}")
-    
-    # Load environment-specific file
-    env_file = project_root / f'.env.{env}'
-    if env_file.exists():
-        load_dotenv(env_file, override=True)
-        print(f"✓ Loaded {env_file}")
-    
-    # Load local overrides
-    local_env = project_root / '.env.local'
-    if local_env.exists():
-        load_dotenv(local_env, override=True)
-        print(f"✓ Loaded {local_env}")
-    
-    return env
+    global _settings, _signature, _root, _checked_at
+
+    root = root or PROJECT_ROOT
+    settings = _settings
+    if (settings is not None and env in (None, settings.env) and root == _root
+            and time.monotonic() - _checked_at < CHECK_INTERVAL):
+        return settings
+
+    with _lock:
+        env = env or os.getenv('ENV', 'development')
+        paths = env_files(env, root)
+        signature = (env, tuple(paths), _file_signature(paths))
+        if _settings is None or signature != _signature:
+            _settings = _load(env, paths)
+            _signature = signature
+            _root = root
+        _checked_at = time.monotonic()
+        return _settings
+
+
+def reset_settings():
+    """Forget the cached settings so the next get_settings() parses again."""
+    global _settings, _signature, _root, _checked_at
+    with _lock:
+        _settings = None
+        _signature = None
+        _root = None
+        _checked_at = 0.0
+
+
+def load_environment(env: str = None):
+    """Load environment variables from .env files (see get_settings).
+
+    Returns:
+        The environment name
+    """
+    global _announced
+    settings = get_settings(env)
+    # Only report files when they were actually (re)loaded
+    if settings is not _announced:
+        _announced = settings
+        for source in settings.sources:
+            print(f"✓ Loaded {source}")
+    return settings.env
 
 
 def get_config():
     """Get current configuration as a dictionary."""
+    settings = asdict(get_settings())
     return {
-        'project_id': os.getenv('GOOGLE_CLOUD_PROJECT'),
-        'gcs_bucket': os.getenv('GCS_BUCKET_NAME'),
-        'firestore_collection': os.getenv('FIRESTORE_COLLECTION'),
-        'pubsub_topic': os.getenv('PUBSUB_TOPIC'),
-        'pubsub_subscription': os.getenv('PUBSUB_SUBSCRIPTION'),
-        'bigquery_dataset': os.getenv('BIGQUERY_DATASET'),
-        'bigquery_table': os.getenv('BIGQUERY_TABLE'),
+        key: settings[key]
+        for key in ('project_id', 'gcs_bucket', 'firestore_collection', 'pubsub_topic',
+                    'pubsub_subscription', 'bigquery_dataset', 'bigquery_table')
     }
 
 
@@ -74,7 +209,7 @@ def print_config():
 if __name__ == "__main__":
     # Test the configuration loader
     import sys
-    
+
     env = sys.argv[1] if len(sys.argv) > 1 else None
     current_env = load_environment(env)
     print(f"\n🌍 Environment: {current_env}")
@@ -1,15 +1,14 @@
-from google.cloud import storage
 from google.api_core import exceptions
-import os
-from dotenv import load_dotenv
+from clients import get_client
+from config import get_settings
 
-load_dotenv()
+get_settings()
 
 def create_bucket(bucket_name):
     """Creates a Google Cloud Storage bucket."""
     try:
-        project_id = os.getenv("GOOGLE_CLOUD_PROJECT")
-        storage_client = storage.Client(project=project_id)
+        project_id = get_settings().project_id
+        storage_client = get_client("storage", project=project_id)
 
         new_bucket = storage_client.create_bucket(bucket_name, location="US")
         print(f"\n✅ Bucket '{new_bucket.name}' created successfully.")
@@ -0,0 +1,156 @@
+"""Example: Google Cloud Firestore operations with asyncio (AsyncClient)."""
+
+import asyncio
+import os
+import sys
+import weakref
+from google.cloud import firestore
+from datetime import datetime
+
+# Add parent directory to path to import the shared settings
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from config import get_settings
+
+# Load environment variables (parsed once per process, shared with every module)
+get_settings()
+
+# AsyncClient channels are bound to the event loop they were first used on,
+# so keep one client per loop rather than one per process
+_clients = weakref.WeakKeyDictionary()
+
+
+def initialize_async_firestore():
+    """Return the Firestore AsyncClient for the running event loop."""
+    project_id = get_settings().project_id
+    
+    if not project_id:
+        raise ValueError("GOOGLE_CLOUD_PROJECT environment variable not set")
+    
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = firestore.AsyncClient(project=project_id)
+        _clients[loop] = client
+    return client
+
+
+async def add_document(collection_name: str, document_data: dict):
+    """Add a document to a Firestore collection.
+    
+    Args:
+        collection_name: Name of the collection
+        document_data: Dictionary containing document data
+    """
+    db = initialize_async_firestore()
+    _, doc_ref = await db.collection(collection_name).add(document_data)
+    print(f"Document added with ID: {doc_ref.id}")
+    return doc_ref.id
+
+
+async def get_document(collection_name: str, document_id: str):
+    """Retrieve a document from Firestore.
+    
+    Args:
+        collection_name: Name of the collection
+        document_id: ID of the document to retrieve
+    """
+    db = initialize_async_firestore()
+    doc = await db.collection(collection_name).document(document_id).get()
+    
+    if doc.exists:
+        return doc.to_dict()
+    return None
+
+
+async def get_many(collection_name: str, document_ids, concurrency: int = 20):
+    """Retrieve many documents concurrently, with at most `concurrency` reads in flight.
+    
+    Args:
+        collection_name: Name of the collection
+        document_ids: Iterable of document IDs
+        concurrency: Maximum number of concurrent reads
+    
+    Returns:
+        Dictionary mapping each ID to its data, or None if it does not exist
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(document_id):
+        async with semaphore:
+            return document_id, await get_document(collection_name, document_id)
+
+    results = await asyncio.gather(*(fetch(document_id) for document_id in document_ids))
+    return dict(results)
+
+
+async def list_documents(collection_name: str):
+    """List all documents in a collection.
+    
+    Args:
+        collection_name: Name of the collection
+    
+    Returns:
+        Dictionary mapping document IDs to their data
+    """
+    db = initialize_async_firestore()
+    documents = {}
+    
+    print(f"Documents in collection '{collection_name}':")
+    async for doc in db.collection(collection_name).stream():
+        documents[doc.id] = doc.to_dict()
+        print(f"  {doc.id} => {documents[doc.id]}")
+    return documents
+
+
+async def update_document(collection_name: str, document_id: str, updates: dict):
+    """Update a document in Firestore.
+    
+    Args:
+        collection_name: Name of the collection
+        document_id: ID of the document to update
+        updates: Dictionary containing fields to update
+    """
+    db = initialize_async_firestore()
+    await db.collection(collection_name).document(document_id).update(updates)
+    print(f"Document {document_id} updated successfully")
+
+
+async def delete_document(collection_name: str, document_id: str):
+    """Delete a document from Firestore.
+    
+    Args:
+        collection_name: Name of the collection
+        document_id: ID of the document to delete
+    """
+    db = initialize_async_firestore()
+    await db.collection(collection_name).document(document_id).delete()
+    print(f"Document {document_id} deleted successfully")
+
+
+async def main():
+    collection = get_settings().firestore_collection or "experiments"
+    
+    # Example: Add a few documents concurrently
+    doc_ids = await asyncio.gather(*(
+        add_document(collection, {
+            "name": f"Async Experiment {i}",
+            "timestamp": datetime.now(),
+            "status": "active"
+        })
+        for i in range(5)
+    ))
+    
+    # Example: Read them back concurrently
+    documents = await get_many(collection, doc_ids, concurrency=5)
+    print(f"Fetched {len(documents)} documents")
+    
+    # Example: Update / delete
+    # await update_document(collection, doc_ids[0], {"status": "completed"})
+    # await delete_document(collection, doc_ids[0])
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except Exception as e:
+        print(f"Error: {e}")
@@ -1,22 +1,75 @@
 """Example: Google Cloud Firestore operations."""
 
+import copy
+import json
 import os
-from google.cloud import firestore
-from dotenv import load_dotenv
+import sys
+import threading
+import time
 from datetime import datetime
+from google.cloud.firestore_v1.base_query import FieldFilter
+from google.cloud.firestore_v1.bulk_writer import BulkWriterOptions
+from google.cloud.firestore_v1.field_path import FieldPath
 
-# Load environment variables
-load_dotenv()
+# Add parent directory to path to import the shared client registry
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from cache import TTLCache
+from clients import get_client
+from config import get_settings
+
+# Load environment variables (parsed once per process, shared with every module)
+get_settings()
+
+MAX_BATCH_WRITES = 500  # Firestore limit on writes per batch/commit
+
+# Opt-in read-through cache for get_document (see enable_document_cache)
+_document_cache = None
+_collection_ttls = {}
 
 
 def initialize_firestore():
-    """Initialize and return a Firestore client."""
-    project_id = os.getenv("GOOGLE_CLOUD_PROJECT")
+    """Return the shared Firestore client for GOOGLE_CLOUD_PROJECT."""
+    project_id = get_settings().project_id
     
     if not project_id:
         raise ValueError("GOOGLE_CLOUD_PROJECT environment variable not set")
     
-    return firestore.Client(project=project_id)
+    return get_client("firestore", project=project_id)
+
+
+def enable_document_cache(max_entries: int = 1024, default_ttl: float = 60.0,
+                          collection_ttls: dict = None):
+    """Turn on the read-through cache used by get_document.
+    
+    update_document, delete_document and bulk writes with explicit IDs
+    invalidate the affected entries. Writes made by other processes are only
+    picked up when entries expire, so choose TTLs accordingly.
+    
+    Args:
+        max_entries: Maximum cached documents (least recently used are evicted)
+        default_ttl: Seconds a document stays cached
+        collection_ttls: Optional {collection name: TTL seconds} overrides
+    """
+    global _document_cache, _collection_ttls
+    _document_cache = TTLCache(max_entries=max_entries, default_ttl=default_ttl)
+    _collection_ttls = dict(collection_ttls or {})
+
+
+def disable_document_cache():
+    """Turn off and drop the get_document cache."""
+    global _document_cache
+    _document_cache = None
+
+
+def get_cache_stats():
+    """Return hit/miss/eviction counters of the document cache (None if disabled)."""
+    return _document_cache.stats() if _document_cache else None
+
+
+def _invalidate_cached(collection_name: str, document_id: str):
+    """Drop a document from the cache, if caching is on."""
+    if _document_cache is not None:
+        _document_cache.invalidate((collection_name, document_id))
 
 
 def add_document(collection_name: str, document_data: dict):
@@ -32,37 +85,300 @@ def add_document(collection_name: str, document_data: dict):
     return doc_ref[1].id
 
 
-def get_document(collection_name: str, document_id: str):
+def iter_jsonl_documents(path: str):
+    """Yield one document dictionary per line of a JSONL file.
+    
+    Args:
+        path: Path to the JSONL file
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _invalidate_reference(reference):
+    """Drop the cached copy of a written DocumentReference."""
+    _invalidate_cached(reference.path.rsplit("/", 1)[0], reference.id)
+
+
+def _document_ref(collection, document: dict, id_field: str):
+    """Return (reference, data) for a document, taking its ID from id_field if given."""
+    if id_field:
+        data = dict(document)
+        reference = collection.document(str(data.pop(id_field)))
+        _invalidate_reference(reference)
+        return reference, data
+    return collection.document(), document
+
+
+def _bulk_write(db, collection, documents, id_field: str, max_retries: int,
+                max_pending: int, max_ops_per_second: int):
+    """Stream documents through a BulkWriter, retrying failed writes."""
+    options = BulkWriterOptions()
+    if max_ops_per_second:
+        options = BulkWriterOptions(initial_ops_per_second=min(500, max_ops_per_second),
+                                    max_ops_per_second=max_ops_per_second)
+    bulk_writer = db.bulk_writer(options=options)
+    lock = threading.Lock()
+    counts = {"written": 0}
+    failures = []
+
+    # Entries are also dropped once each write lands, since a get_document
+    # between queueing and committing would re-cache the old value
+    def on_result(reference, result, writer):
+        _invalidate_reference(reference)
+        with lock:
+            counts["written"] += 1
+
+    def on_error(failure, writer):
+        if failure.attempts < max_retries:
+            return True
+        with lock:
+            failures.append({"document_id": failure.operation.reference.id,
+                             "error": f"{failure.code}: {failure.message}"})
+        return False
+
+    bulk_writer.on_write_result(on_result)
+    bulk_writer.on_write_error(on_error)
+
+    for count, document in enumerate(documents, 1):
+        reference, data = _document_ref(collection, document, id_field)
+        bulk_writer.set(reference, data)
+        # Bound memory: wait for queued writes to drain every max_pending documents
+        if count % max_pending == 0:
+            bulk_writer.flush()
+    bulk_writer.close()
+    return counts["written"], failures
+
+
+def _batch_write(db, collection, documents, id_field: str, max_retries: int):
+    """Commit documents in WriteBatches of MAX_BATCH_WRITES, retrying each batch."""
+    written = 0
+    failures = []
+
+    attempts = max(1, max_retries)  # always commit at least once
+
+    def commit(pending):
+        for attempt in range(1, attempts + 1):
+            batch = db.batch()
+            for reference, data in pending:
+                batch.set(reference, data)
+            try:
+                batch.commit()
+            except Exception as e:
+                if attempt == attempts:
+                    return e
+                time.sleep(min(2 ** attempt * 0.1, 5.0))
+            else:
+                # Drop entries re-cached by reads made while the batch was pending
+                for reference, _ in pending:
+                    _invalidate_reference(reference)
+                return None
+
+    pending = []
+    for document in documents:
+        pending.append(_document_ref(collection, document, id_field))
+        if len(pending) == MAX_BATCH_WRITES:
+            error = commit(pending)
+            if error is None:
+                written += len(pending)
+            else:
+                failures.extend({"document_id": ref.id, "error": str(error)} for ref, _ in pending)
+            pending = []
+    if pending:
+        error = commit(pending)
+        if error is None:
+            written += len(pending)
+        else:
+            failures.extend({"document_id": ref.id, "error": str(error)} for ref, _ in pending)
+    return written, failures
+
+
+def bulk_add_documents(collection_name: str, documents, id_field: str = None,
+                       mode: str = "bulk_writer", max_retries: int = 5,
+                       max_pending: int = 5000, max_ops_per_second: int = None):
+    """Ingest many documents into a collection without one round trip per document.
+    
+    In "bulk_writer" mode writes go through Firestore's BulkWriter, which sends
+    them in parallel batches of at most 500, ramps its rate up gradually and
+    retries failed writes. The iterable is flushed every max_pending documents
+    so memory stays bounded. In "batch" mode documents are committed
+    sequentially in atomic WriteBatches of 500, retrying each batch with backoff.
+    
+    Args:
+        collection_name: Name of the collection
+        documents: Iterable of document dictionaries (see iter_jsonl_documents)
+        id_field: Field holding the document ID (removed from the stored data);
+            auto-generated IDs are used when omitted
+        mode: "bulk_writer" or "batch"
+        max_retries: Attempts per write (bulk_writer) or per batch (batch)
+        max_pending: Documents queued before waiting for BulkWriter to drain
+        max_ops_per_second: Optional cap on the BulkWriter write rate
+    
+    Returns:
+        Dictionary with written/failed counts, failures, seconds and docs_per_sec
+    """
+    if mode not in ("bulk_writer", "batch"):
+        raise ValueError("mode must be 'bulk_writer' or 'batch'")
+
+    db = initialize_firestore()
+    collection = db.collection(collection_name)
+
+    start = time.perf_counter()
+    if mode == "bulk_writer":
+        written, failures = _bulk_write(db, collection, documents, id_field, max_retries,
+                                        max_pending, max_ops_per_second)
+    else:
+        written, failures = _batch_write(db, collection, documents, id_field, max_retries)
+    elapsed = time.perf_counter() - start
+
+    rate = written / elapsed if elapsed else 0.0
+    print(f"Wrote {written} documents to '{collection_name}' "
+          f"({len(failures)} failed, {rate:.0f} docs/s)")
+    return {
+        "written": written,
+        "failed": len(failures),
+        "failures": failures,
+        "seconds": elapsed,
+        "docs_per_sec": rate,
+    }
+
+
+def get_document(collection_name: str, document_id: str, use_cache: bool = True):
     """Retrieve a document from Firestore.
     
     Args:
         collection_name: Name of the collection
         document_id: ID of the document to retrieve
+        use_cache: Serve from / populate the document cache when it is enabled
     """
+    cache = _document_cache if use_cache else None
+    if cache is not None:
+        cached = cache.get((collection_name, document_id))
+        if cached is not None:
+            print(f"Document data (cached): {cached}")
+            return copy.deepcopy(cached)
+
     db = initialize_firestore()
     doc_ref = db.collection(collection_name).document(document_id)
     doc = doc_ref.get()
     
     if doc.exists:
-        print(f"Document data: {doc.to_dict()}")
-        return doc.to_dict()
+        data = doc.to_dict()
+        if cache is not None:
+            cache.set((collection_name, document_id), copy.deepcopy(data),
+                      ttl=_collection_ttls.get(collection_name))
+        print(f"Document data: {data}")
+        return data
     else:
         print("Document does not exist")
         return None
 
 
-def list_documents(collection_name: str):
-    """List all documents in a collection.
+def list_documents(collection_name: str, fields: list = None, page_size: int = 500):
+    """List all documents in a collection, one page at a time.
     
     Args:
         collection_name: Name of the collection
+        fields: Optional list of fields to fetch instead of whole documents
+        page_size: Documents fetched per request
+    """
+    print(f"Documents in collection '{collection_name}':")
+    for doc_id, data in iter_documents(collection_name, page_size=page_size, fields=fields):
+        print(f"  {doc_id} => {data}")
+
+
+def iter_documents(collection_name: str, page_size: int = 500, fields: list = None,
+                   filters: list = None, start_after: str = None):
+    """Stream a collection in document-ID order, one cursor-paginated page at a time.
+    
+    Only one page is held in memory. The yielded document ID doubles as the
+    resume cursor: pass the last ID you processed as start_after to continue
+    a scan after a failure or restart.
+    
+    Args:
+        collection_name: Name of the collection
+        page_size: Documents fetched per request
+        fields: Optional list of fields to project with select()
+        filters: Optional list of (field, op, value) equality filters applied
+            server-side (inequality filters would need their own ordering)
+        start_after: Document ID to resume after
+    
+    Yields:
+        (document_id, data) tuples
     """
     db = initialize_firestore()
-    docs = db.collection(collection_name).stream()
+    collection = db.collection(collection_name)
+
+    query = collection
+    for field, op, value in filters or []:
+        query = query.where(filter=FieldFilter(field, op, value))
+    if fields is not None:
+        query = query.select(fields)
+    query = query.order_by(FieldPath.document_id()).limit(page_size)
+
+    cursor = start_after
+    while True:
+        page = query
+        if cursor is not None:
+            page = page.start_after({FieldPath.document_id(): collection.document(cursor)})
+
+        count = 0
+        for doc in page.stream():
+            count += 1
+            cursor = doc.id
+            yield doc.id, doc.to_dict()
+
+        if count < page_size:
+            return
+
+
+def export_documents(collection_name: str, output_path: str, checkpoint_path: str = None,
+                     page_size: int = 500, fields: list = None, filters: list = None):
+    """Export a collection to JSONL in bounded memory, resuming from a checkpoint.
     
-    print(f"Documents in collection '{collection_name}':")
-    for doc in docs:
-        print(f"  {doc.id} => {doc.to_dict()}")
+    After every page the output is flushed and the last exported document ID
+    and file offset are written to checkpoint_path, so a failed export can
+    simply be re-run. The checkpoint is removed once the export completes.
+    
+    Args:
+        collection_name: Name of the collection
+        output_path: JSONL file to write ({"id": ..., "data": {...}} per line)
+        checkpoint_path: Cursor file (defaults to output_path + ".cursor")
+        page_size: Documents fetched per request
+        fields: Optional list of fields to project with select()
+        filters: Optional list of (field, op, value) equality filters
+    
+    Returns:
+        Number of documents exported by this run
+    """
+    checkpoint_path = checkpoint_path or f"{output_path}.cursor"
+    start_after, offset = None, 0
+    if os.path.exists(checkpoint_path):
+        with open(checkpoint_path) as f:
+            checkpoint = json.load(f)
+        start_after, offset = checkpoint["cursor"], checkpoint["offset"]
+
+    exported = 0
+    with open(output_path, "ab") as out:
+        # Drop anything written after the last checkpoint so resumed pages aren't duplicated
+        out.truncate(offset)
+        for doc_id, data in iter_documents(collection_name, page_size=page_size, fields=fields,
+                                           filters=filters, start_after=start_after):
+            line = json.dumps({"id": doc_id, "data": data}, default=str) + "\n"
+            out.write(line.encode("utf-8"))
+            exported += 1
+            if exported % page_size == 0:
+                out.flush()
+                with open(checkpoint_path, "w") as f:
+                    json.dump({"cursor": doc_id, "offset": out.tell()}, f)
+
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    print(f"Exported {exported} documents from '{collection_name}' to {output_path}"
+          f"{' (resumed after ' + start_after + ')' if start_after else ''}")
+    return exported
 
 
 def update_document(collection_name: str, document_id: str, updates: dict):
@@ -76,6 +392,7 @@ def update_document(collection_name: str, document_id: str, updates: dict):
     db = initialize_firestore()
     doc_ref = db.collection(collection_name).document(document_id)
     doc_ref.update(updates)
+    _invalidate_cached(collection_name, document_id)
     print(f"Document {document_id} updated successfully")
 
 
@@ -88,11 +405,12 @@ def delete_document(collection_name: str, document_id: str):
     """
     db = initialize_firestore()
     db.collection(collection_name).document(document_id).delete()
+    _invalidate_cached(collection_name, document_id)
     print(f"Document {document_id} deleted successfully")
 
 
 if __name__ == "__main__":
-    collection = os.getenv("FIRESTORE_COLLECTION", "experiments")
+    collection = get_settings().firestore_collection or "experiments"
     
     try:
         # Example: Add a document
@@ -104,12 +422,26 @@ if __name__ == "__main__":
         }
         doc_id = add_document(collection, doc_data)
         
+        # Example: Load a JSONL dataset in bulk
+        # bulk_add_documents(collection, iter_jsonl_documents("dataset.jsonl"), id_field="id")
+        
         # Example: Get the document
         get_document(collection, doc_id)
         
+        # Example: Cache hot documents for repeated reads
+        # enable_document_cache(max_entries=10000, collection_ttls={collection: 30})
+        # get_document(collection, doc_id)
+        # print(get_cache_stats())
+        
         # Example: List all documents
         list_documents(collection)
         
+        # Example: Scan only some fields of matching documents, resumable by ID
+        # for doc_id, data in iter_documents(collection, fields=["status"],
+        #                                    filters=[("status", "==", "active")]):
+        #     print(doc_id, data)
+        # export_documents(collection, "export.jsonl")
+        
         # Example: Update the document
         # update_document(collection, doc_id, {"status": "completed"})
         
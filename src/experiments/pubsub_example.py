@@ -1,12 +1,21 @@
 """Example: Google Cloud Pub/Sub operations."""
 
+import json
 import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
 from google.cloud import pubsub_v1
-from dotenv import load_dotenv
 import time
 
-# Load environment variables
-load_dotenv()
+# Add parent directory to path to import the shared client registry
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from clients import get_client
+from config import get_settings
+from metrics import LatencyRecorder
+
+# Load environment variables (parsed once per process, shared with every module)
+get_settings()
 
 
 def publish_message(project_id: str, topic_name: str, message: str):
@@ -17,7 +26,7 @@ def publish_message(project_id: str, topic_name: str, message: str):
         topic_name: Name of the Pub/Sub topic
         message: Message to publish
     """
-    publisher = pubsub_v1.PublisherClient()
+    publisher = get_client("publisher")
     topic_path = publisher.topic_path(project_id, topic_name)
     
     # Data must be a bytestring
@@ -40,7 +49,7 @@ def publish_with_attributes(project_id: str, topic_name: str, message: str, **at
         message: Message to publish
         **attributes: Additional message attributes
     """
-    publisher = pubsub_v1.PublisherClient()
+    publisher = get_client("publisher")
     topic_path = publisher.topic_path(project_id, topic_name)
     
     data = message.encode("utf-8")
@@ -53,6 +62,126 @@ def publish_with_attributes(project_id: str, topic_name: str, message: str, **at
     return message_id
 
 
+def iter_jsonl_messages(path: str):
+    """Yield messages from a JSONL file for publish_bulk.
+    
+    Each line is either an object with "data" (and optional "attributes"),
+    or any other JSON value, which is published as its compact JSON encoding.
+    
+    Args:
+        path: Path to the JSONL file
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if isinstance(record, dict) and "data" in record:
+                yield record
+            else:
+                yield json.dumps(record, separators=(",", ":"))
+
+
+def _normalize_message(message):
+    """Return (data bytes, attributes dict) for a str, bytes or dict message."""
+    if isinstance(message, dict):
+        data = message["data"]
+        attributes = {k: str(v) for k, v in (message.get("attributes") or {}).items()}
+    else:
+        data, attributes = message, {}
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    elif not isinstance(data, bytes):
+        data = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    return data, attributes
+
+
+def publish_bulk(project_id: str, topic_name: str, messages,
+                 max_messages: int = 1000, max_bytes: int = 1024 * 1024,
+                 max_latency: float = 0.05, max_outstanding_messages: int = 10000,
+                 max_outstanding_bytes: int = 64 * 1024 * 1024):
+    """Publish many messages through one batching publisher without blocking per message.
+    
+    Futures stay in flight and are tallied by callbacks; publish() only blocks
+    when the flow-control limits on outstanding messages/bytes are reached.
+    
+    Args:
+        project_id: GCP project ID
+        topic_name: Name of the Pub/Sub topic
+        messages: Iterable of str, bytes or {"data": ..., "attributes": {...}} dicts
+            (see iter_jsonl_messages for reading a JSONL file)
+        max_messages: Maximum messages per batch
+        max_bytes: Maximum bytes per batch
+        max_latency: Maximum seconds a batch waits before being sent
+        max_outstanding_messages: Flow-control limit on unacknowledged publishes
+        max_outstanding_bytes: Flow-control limit on unacknowledged bytes
+    
+    Returns:
+        Dictionary with published/failed counts, errors, seconds and messages_per_sec
+    """
+    # One cached publisher per distinct batch/flow-control configuration
+    publisher = get_client(
+        "publisher",
+        batch_settings=pubsub_v1.types.BatchSettings(
+            max_messages=max_messages, max_bytes=max_bytes, max_latency=max_latency
+        ),
+        publisher_options=pubsub_v1.types.PublisherOptions(
+            flow_control=pubsub_v1.types.PublishFlowControl(
+                message_limit=max_outstanding_messages,
+                byte_limit=max_outstanding_bytes,
+                limit_exceeded_behavior=pubsub_v1.types.LimitExceededBehavior.BLOCK,
+            )
+        ),
+    )
+    topic_path = publisher.topic_path(project_id, topic_name)
+
+    lock = threading.Lock()
+    all_done = threading.Condition(lock)
+    counts = {"submitted": 0, "completed": 0, "published": 0, "failed": 0}
+    errors = []
+
+    def on_done(index, future):
+        exception = future.exception()
+        with lock:
+            counts["completed"] += 1
+            if exception is None:
+                counts["published"] += 1
+            else:
+                counts["failed"] += 1
+                errors.append({"index": index, "error": str(exception)})
+            all_done.notify_all()
+
+    start = time.perf_counter()
+    for index, message in enumerate(messages):
+        try:
+            data, attributes = _normalize_message(message)
+            future = publisher.publish(topic_path, data, **attributes)
+        except Exception as e:
+            with lock:
+                counts["failed"] += 1
+                errors.append({"index": index, "error": str(e)})
+            continue
+        with lock:
+            counts["submitted"] += 1
+        future.add_done_callback(lambda f, i=index: on_done(i, f))
+
+    with lock:
+        all_done.wait_for(lambda: counts["completed"] >= counts["submitted"])
+    elapsed = time.perf_counter() - start
+
+    rate = counts["published"] / elapsed if elapsed else 0.0
+    print(f"Published {counts['published']} messages to {topic_path} "
+          f"({counts['failed']} failed, {rate:.0f} msg/s)")
+    return {
+        "published": counts["published"],
+        "failed": counts["failed"],
+        "errors": errors,
+        "seconds": elapsed,
+        "messages_per_sec": rate,
+    }
+
+
 def subscribe_messages(project_id: str, subscription_name: str, timeout: float = 5.0):
     """Subscribe to messages from a Pub/Sub subscription.
     
@@ -61,7 +190,7 @@ def subscribe_messages(project_id: str, subscription_name: str, timeout: float =
         subscription_name: Name of the Pub/Sub subscription
         timeout: Time to listen for messages in seconds
     """
-    subscriber = pubsub_v1.SubscriberClient()
+    subscriber = get_client("subscriber")
     subscription_path = subscriber.subscription_path(project_id, subscription_name)
     
     def callback(message):
@@ -81,6 +210,97 @@ def subscribe_messages(project_id: str, subscription_name: str, timeout: float =
         print(f"Listening stopped: {e}")
 
 
+def consume_messages(project_id: str, subscription_name: str, handler,
+                     max_messages: int = 1000, max_bytes: int = 100 * 1024 * 1024,
+                     max_workers: int = 10, timeout: float = None,
+                     report_interval: float = 10.0):
+    """Consume a subscription with a user handler under flow control.
+    
+    The handler runs on a dedicated pool of max_workers threads. A message is
+    acked when the handler returns anything but False, and nacked when it
+    returns False or raises. The streaming pull client sends acks and nacks
+    in batches, so handlers never wait on an acknowledgement RPC. Throughput
+    and handler latency percentiles are printed every report_interval seconds.
+    
+    On timeout or Ctrl+C the stream is cancelled and in-flight handlers are
+    allowed to finish before returning.
+    
+    Args:
+        project_id: GCP project ID
+        subscription_name: Name of the Pub/Sub subscription
+        handler: Callable receiving each pubsub_v1.subscriber.message.Message
+        max_messages: Maximum outstanding (leased, unacked) messages
+        max_bytes: Maximum outstanding message bytes
+        max_workers: Number of handler threads
+        timeout: Seconds to consume before shutting down (None runs until Ctrl+C)
+        report_interval: Seconds between statistics reports
+    
+    Returns:
+        Final statistics dictionary (acked, nacked, rates, handler latency)
+    """
+    subscriber = get_client("subscriber")
+    subscription_path = subscriber.subscription_path(project_id, subscription_name)
+    stats = LatencyRecorder()
+
+    def callback(message):
+        start = time.perf_counter()
+        try:
+            ok = handler(message) is not False
+        except Exception as e:
+            print(f"Handler error for message {message.message_id}: {e}")
+            ok = False
+        if ok:
+            message.ack()
+        else:
+            message.nack()
+        stats.record(time.perf_counter() - start, ok=ok)
+
+    def report(final: bool = False):
+        snapshot = stats.snapshot()
+        label = "Final" if final else "Stats"
+        print(f"[{label}] acked={snapshot['succeeded']} nacked={snapshot['failed']} "
+              f"rate={snapshot['interval_per_sec']:.1f} msg/s "
+              f"handler p50={snapshot['p50_ms']:.1f}ms p99={snapshot['p99_ms']:.1f}ms")
+        return snapshot
+
+    stop_reporting = threading.Event()
+
+    def reporter():
+        while not stop_reporting.wait(report_interval):
+            report()
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pubsub-handler")
+    streaming_pull_future = subscriber.subscribe(
+        subscription_path,
+        callback=callback,
+        flow_control=pubsub_v1.types.FlowControl(max_messages=max_messages, max_bytes=max_bytes),
+        scheduler=pubsub_v1.subscriber.scheduler.ThreadScheduler(executor),
+        await_callbacks_on_shutdown=True,
+    )
+    reporter_thread = threading.Thread(target=reporter, name="pubsub-stats", daemon=True)
+    reporter_thread.start()
+    print(f"Consuming {subscription_path} with {max_workers} workers "
+          f"(max {max_messages} messages / {max_bytes} bytes outstanding)...\n")
+
+    try:
+        streaming_pull_future.result(timeout=timeout)
+    except (TimeoutError, KeyboardInterrupt):
+        print("Shutting down, waiting for in-flight handlers...")
+    except Exception as e:
+        print(f"Listening stopped: {e}")
+    finally:
+        streaming_pull_future.cancel()
+        try:
+            # Blocks until the stream is closed and running callbacks complete
+            streaming_pull_future.result()
+        except Exception:
+            pass
+        stop_reporting.set()
+        reporter_thread.join()
+
+    return report(final=True)
+
+
 def create_topic(project_id: str, topic_name: str):
     """Create a new Pub/Sub topic.
     
@@ -88,7 +308,7 @@ def create_topic(project_id: str, topic_name: str):
         project_id: GCP project ID
         topic_name: Name for the new topic
     """
-    publisher = pubsub_v1.PublisherClient()
+    publisher = get_client("publisher")
     topic_path = publisher.topic_path(project_id, topic_name)
     
     try:
@@ -106,7 +326,7 @@ def list_topics(project_id: str):
     Args:
         project_id: GCP project ID
     """
-    publisher = pubsub_v1.PublisherClient()
+    publisher = get_client("publisher")
     project_path = f"projects/{project_id}"
     
     print(f"Topics in project {project_id}:")
@@ -115,9 +335,10 @@ def list_topics(project_id: str):
 
 
 if __name__ == "__main__":
-    project_id = os.getenv("GOOGLE_CLOUD_PROJECT")
-    topic_name = os.getenv("PUBSUB_TOPIC", "test-topic")
-    subscription_name = os.getenv("PUBSUB_SUBSCRIPTION", "test-subscription")
+    settings = get_settings()
+    project_id = settings.project_id
+    topic_name = settings.pubsub_topic or "test-topic"
+    subscription_name = settings.pubsub_subscription or "test-subscription"
     
     if not project_id:
         print("Error: GOOGLE_CLOUD_PROJECT environment variable not set")
@@ -139,8 +360,22 @@ if __name__ == "__main__":
         #     priority="high"
         # )
         
+        # Example: Publish many messages through one batching publisher
+        # publish_bulk(project_id, topic_name, (f"message {i}" for i in range(10000)))
+        # publish_bulk(project_id, topic_name, iter_jsonl_messages("messages.jsonl"))
+        
         # Example: Subscribe to messages
         # subscribe_messages(project_id, subscription_name, timeout=10.0)
         
+        # Example: Consume with a handler under flow control
+        # consume_messages(
+        #     project_id,
+        #     subscription_name,
+        #     handler=lambda message: print(message.data.decode("utf-8")),
+        #     max_messages=500,
+        #     max_workers=16,
+        #     timeout=60.0
+        # )
+        
     except Exception as e:
         print(f"Error: {e}")
@@ -1,26 +1,44 @@
 """Example: Google Cloud Storage operations."""
 
+import base64
+import fnmatch
+import json
+import mmap
 import os
-from google.cloud import storage
 import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Optional
 
-# Add parent directory to path to import config
+import google_crc32c
+
+# Add parent directory to path to import config and the shared client registry
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-from config import load_environment, print_config
+from clients import get_client
+from config import get_settings, print_config
+
+# Load environment variables (parsed once per process, shared with every module)
+get_settings()
 
-# Load environment variables
-load_environment()
+# Parallel transfer defaults
+DEFAULT_CHUNK_SIZE = 32 * 1024 * 1024  # 32 MiB per part
+DEFAULT_MAX_WORKERS = 8  # stays below the default HTTP connection pool size (10)
+MAX_COMPOSE_SOURCES = 32  # GCS limit on source objects per compose request
+SYNC_MANIFEST_NAME = ".gcs-sync-manifest.json"
 
 
 def list_buckets():
     """List all buckets in the project."""
-    project_id = os.getenv("GOOGLE_CLOUD_PROJECT")
+    project_id = get_settings().project_id
     
     if not project_id:
         raise ValueError("GOOGLE_CLOUD_PROJECT environment variable not set")
     
     # Create a client
-    client = storage.Client(project=project_id)
+    client = get_client("storage", project=project_id)
     
     # List buckets
     buckets = client.list_buckets()
@@ -30,15 +48,22 @@ def list_buckets():
         print(f"  - {bucket.name}")
 
 
-def upload_blob(bucket_name: str, source_file: str, destination_blob_name: str):
+def upload_blob(bucket_name: str, source_file: str, destination_blob_name: str,
+                parallel: bool = False, **parallel_options):
     """Upload a file to Google Cloud Storage.
     
     Args:
         bucket_name: Name of the GCS bucket
         source_file: Path to the file to upload
         destination_blob_name: Name for the blob in GCS
+        parallel: Upload in parallel byte-range parts (see upload_blob_parallel)
+        **parallel_options: chunk_size / max_workers for the parallel mode
     """
-    client = storage.Client()
+    if parallel:
+        return upload_blob_parallel(bucket_name, source_file, destination_blob_name,
+                                    **parallel_options)
+
+    client = get_client("storage")
     bucket = client.bucket(bucket_name)
     blob = bucket.blob(destination_blob_name)
     
@@ -46,15 +71,183 @@ def upload_blob(bucket_name: str, source_file: str, destination_blob_name: str):
     print(f"File {source_file} uploaded to {destination_blob_name} in bucket {bucket_name}")
 
 
-def download_blob(bucket_name: str, source_blob_name: str, destination_file: str):
+def crc32c_file(path: str, start: int = 0, length: Optional[int] = None,
+                block_size: int = 1024 * 1024) -> str:
+    """Compute the base64 CRC32C of a file (or a byte range of it), as GCS reports it.
+    
+    Args:
+        path: Path to the local file
+        start: Offset of the first byte to hash
+        length: Number of bytes to hash (defaults to the rest of the file)
+        block_size: Read size used while streaming the file
+    """
+    checksum = google_crc32c.Checksum()
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = length
+        while remaining is None or remaining > 0:
+            size = block_size if remaining is None else min(block_size, remaining)
+            block = f.read(size)
+            if not block:
+                break
+            checksum.update(block)
+            if remaining is not None:
+                remaining -= len(block)
+    return base64.b64encode(checksum.digest()).decode("utf-8")
+
+
+def _crc32c_bytes(data: bytes) -> str:
+    """Return the base64 CRC32C of an in-memory buffer."""
+    return base64.b64encode(google_crc32c.Checksum(data).digest()).decode("utf-8")
+
+
+def _upload_part(bucket, part_name: str, source_file: str, offset: int, length: int):
+    """Upload one byte range of a file as a standalone object and verify its CRC32C."""
+    with open(source_file, "rb") as f:
+        f.seek(offset)
+        data = f.read(length)
+
+    expected = _crc32c_bytes(data)
+    part = bucket.blob(part_name)
+    part.upload_from_string(data, content_type="application/octet-stream", checksum="crc32c")
+
+    if part.crc32c != expected:
+        raise ValueError(f"CRC32C mismatch on part {part_name}: {part.crc32c} != {expected}")
+    return part
+
+
+def _compose_parts(bucket, parts: list, destination_blob_name: str, temp_prefix: str,
+                   created: list):
+    """Compose parts into the destination, in rounds of MAX_COMPOSE_SOURCES.
+    
+    Every intermediate object is appended to created as soon as it exists, so
+    the caller can clean it up even if a later round fails. Returns the
+    destination blob.
+    """
+    level = 0
+    while len(parts) > MAX_COMPOSE_SOURCES:
+        next_parts = []
+        for i in range(0, len(parts), MAX_COMPOSE_SOURCES):
+            group = parts[i:i + MAX_COMPOSE_SOURCES]
+            composed = bucket.blob(f"{temp_prefix}compose-{level}-{i // MAX_COMPOSE_SOURCES:05d}")
+            composed.compose(group)
+            created.append(composed)
+            next_parts.append(composed)
+        parts = next_parts
+        level += 1
+
+    destination = bucket.blob(destination_blob_name)
+    destination.content_type = "application/octet-stream"
+    destination.compose(parts)
+    return destination
+
+
+def upload_blob_parallel(bucket_name: str, source_file: str, destination_blob_name: str,
+                         chunk_size: int = DEFAULT_CHUNK_SIZE,
+                         max_workers: int = DEFAULT_MAX_WORKERS):
+    """Upload a large file as parallel byte-range parts composed into one object.
+    
+    Each part is uploaded as a temporary object on a bounded thread pool and
+    checked against its local CRC32C. The parts are then composed into the
+    destination, whose CRC32C is compared with the whole local file. Temporary
+    objects are always cleaned up.
+    
+    Args:
+        bucket_name: Name of the GCS bucket
+        source_file: Path to the file to upload
+        destination_blob_name: Name for the blob in GCS
+        chunk_size: Size of each uploaded part in bytes
+        max_workers: Number of parts uploaded concurrently
+    
+    Returns:
+        Dictionary with bytes, parts, seconds, mb_per_s and crc32c of the upload
+    """
+    if chunk_size <= 0 or max_workers <= 0:
+        raise ValueError("chunk_size and max_workers must be positive")
+
+    file_size = os.path.getsize(source_file)
+    if file_size <= chunk_size:
+        # Nothing to parallelize, a single stream is cheaper than compose
+        start = time.perf_counter()
+        upload_blob(bucket_name, source_file, destination_blob_name)
+        elapsed = time.perf_counter() - start
+        return {
+            "bytes": file_size,
+            "parts": 1,
+            "seconds": elapsed,
+            "mb_per_s": file_size / (1024 * 1024) / elapsed if elapsed else 0.0,
+            "crc32c": crc32c_file(source_file),
+        }
+
+    client = get_client("storage")
+    bucket = client.bucket(bucket_name)
+    temp_prefix = f"{destination_blob_name}.parts/{uuid.uuid4().hex}/"
+    offsets = list(range(0, file_size, chunk_size))
+    created = []
+
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(_upload_part, bucket, f"{temp_prefix}{index:05d}", source_file,
+                                offset, min(chunk_size, file_size - offset))
+                for index, offset in enumerate(offsets)
+            ]
+            # Collect in submission order so the compose keeps byte order, and
+            # wait for every part so failed uploads don't leak temporary objects
+            errors = []
+            for future in futures:
+                try:
+                    created.append(future.result())
+                except Exception as e:
+                    errors.append(e)
+        if errors:
+            raise errors[0]
+
+        destination = _compose_parts(bucket, list(created), destination_blob_name,
+                                     temp_prefix, created)
+    finally:
+        for blob in created:
+            try:
+                blob.delete()
+            except Exception as e:
+                print(f"Warning: could not delete temporary part {blob.name}: {e}")
+    elapsed = time.perf_counter() - start
+
+    local_crc = crc32c_file(source_file)
+    if destination.crc32c != local_crc:
+        raise ValueError(
+            f"CRC32C mismatch for {destination_blob_name}: {destination.crc32c} != {local_crc}"
+        )
+
+    mb_per_s = file_size / (1024 * 1024) / elapsed if elapsed else 0.0
+    print(f"File {source_file} uploaded to {destination_blob_name} in bucket {bucket_name} "
+          f"({len(offsets)} parts, {mb_per_s:.1f} MB/s)")
+    return {
+        "bytes": file_size,
+        "parts": len(offsets),
+        "seconds": elapsed,
+        "mb_per_s": mb_per_s,
+        "crc32c": local_crc,
+    }
+
+
+def download_blob(bucket_name: str, source_blob_name: str, destination_file: str,
+                  sliced: bool = False, **sliced_options):
     """Download a file from Google Cloud Storage.
     
     Args:
         bucket_name: Name of the GCS bucket
         source_blob_name: Name of the blob in GCS
         destination_file: Path where the file will be saved
+        sliced: Download with concurrent ranged GETs (see download_blob_sliced)
+        **sliced_options: slice_size / max_workers for the sliced mode
     """
-    client = storage.Client()
+    if sliced:
+        return download_blob_sliced(bucket_name, source_blob_name, destination_file,
+                                    **sliced_options)
+
+    client = get_client("storage")
     bucket = client.bucket(bucket_name)
     blob = bucket.blob(source_blob_name)
     
@@ -62,6 +255,315 @@ def download_blob(bucket_name: str, source_blob_name: str, destination_file: str
     print(f"Blob {source_blob_name} downloaded to {destination_file}")
 
 
+class _MmapSliceWriter:
+    """File-like object that writes a download stream into a region of an mmap."""
+
+    def __init__(self, mapped: mmap.mmap, offset: int):
+        self._mapped = mapped
+        self._position = offset
+
+    def write(self, data: bytes) -> int:
+        end = self._position + len(data)
+        self._mapped[self._position:end] = data
+        self._position = end
+        return len(data)
+
+
+def _load_slice_state(state_path: str, generation: int, size: int, slice_size: int) -> set:
+    """Return completed slice indexes from a previous run of the same object version."""
+    try:
+        with open(state_path) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return set()
+
+    if (state.get("generation") != generation or state.get("size") != size
+            or state.get("slice_size") != slice_size):
+        return set()
+    return set(state.get("done", []))
+
+
+def _save_slice_state(state_path: str, generation: int, size: int, slice_size: int, done: set):
+    """Atomically persist the set of completed slices next to the destination."""
+    temp_path = f"{state_path}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump({"generation": generation, "size": size, "slice_size": slice_size,
+                   "done": sorted(done)}, f)
+    os.replace(temp_path, state_path)
+
+
+def _download_slice(blob, mapped: mmap.mmap, start: int, end: int):
+    """Download bytes [start, end] of a blob straight into the mapped destination."""
+    # Ranged responses carry the whole-object hash, so the file is checked at the end instead
+    blob.download_to_file(_MmapSliceWriter(mapped, start), start=start, end=end, checksum=None)
+
+
+def download_blob_sliced(bucket_name: str, source_blob_name: str, destination_file: str,
+                         slice_size: int = DEFAULT_CHUNK_SIZE,
+                         max_workers: int = DEFAULT_MAX_WORKERS):
+    """Download a large blob with concurrent ranged GETs into a memory-mapped file.
+    
+    The destination is preallocated to the object size and every slice is
+    written in place, so there are no temporary files or concatenation pass.
+    Completed slices are recorded in ``<destination_file>.slices.json``; if a
+    run fails, calling this again for the same object generation only fetches
+    the missing slices. The finished file is verified against the object CRC32C.
+    
+    Args:
+        bucket_name: Name of the GCS bucket
+        source_blob_name: Name of the blob in GCS
+        destination_file: Path where the file will be saved
+        slice_size: Size of each ranged request in bytes
+        max_workers: Number of slices downloaded concurrently
+    
+    Returns:
+        Dictionary with bytes, slices, resumed, seconds and mb_per_s of the download
+    """
+    if slice_size <= 0 or max_workers <= 0:
+        raise ValueError("slice_size and max_workers must be positive")
+
+    client = get_client("storage")
+    bucket = client.bucket(bucket_name)
+    metadata = bucket.blob(source_blob_name)
+    metadata.reload()
+    size = metadata.size
+    generation = metadata.generation
+
+    # Pin every ranged read to the generation we sized the file for
+    blob = bucket.blob(source_blob_name, generation=generation)
+    state_path = f"{destination_file}.slices.json"
+    offsets = list(range(0, size, slice_size))
+
+    done = _load_slice_state(state_path, generation, size, slice_size)
+    if done and (not os.path.exists(destination_file)
+                 or os.path.getsize(destination_file) != size):
+        done = set()
+    resumed = len(done)
+
+    mode = "r+b" if done else "w+b"
+    start_time = time.perf_counter()
+    with open(destination_file, mode) as f:
+        f.truncate(size)
+        if size == 0:
+            offsets = []
+        else:
+            mapped = mmap.mmap(f.fileno(), size)
+            lock = threading.Lock()
+
+            def fetch(index: int, offset: int):
+                _download_slice(blob, mapped, offset, min(offset + slice_size, size) - 1)
+                with lock:
+                    mapped.flush()
+                    done.add(index)
+                    _save_slice_state(state_path, generation, size, slice_size, done)
+
+            errors = []
+            try:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = [executor.submit(fetch, index, offset)
+                               for index, offset in enumerate(offsets) if index not in done]
+                    for future in futures:
+                        try:
+                            future.result()
+                        except Exception as e:
+                            errors.append(e)
+            finally:
+                mapped.close()
+            if errors:
+                print(f"Sliced download of {source_blob_name} incomplete: {len(errors)} slice(s) "
+                      f"failed, re-run to resume")
+                raise errors[0]
+    elapsed = time.perf_counter() - start_time
+
+    if metadata.crc32c and crc32c_file(destination_file) != metadata.crc32c:
+        os.remove(destination_file)
+        if os.path.exists(state_path):
+            os.remove(state_path)
+        raise ValueError(f"CRC32C mismatch for {source_blob_name}, partial file removed")
+    if os.path.exists(state_path):
+        os.remove(state_path)
+
+    mb_per_s = size / (1024 * 1024) / elapsed if elapsed else 0.0
+    print(f"Blob {source_blob_name} downloaded to {destination_file} "
+          f"({len(offsets)} slices, {resumed} resumed, {mb_per_s:.1f} MB/s)")
+    return {
+        "bytes": size,
+        "slices": len(offsets),
+        "resumed": resumed,
+        "seconds": elapsed,
+        "mb_per_s": mb_per_s,
+    }
+
+
+def _load_manifest(manifest_path: Path) -> dict:
+    """Load the local sync manifest ({relative path: {size, mtime_ns, crc32c}})."""
+    try:
+        with open(manifest_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _manifest_temp_path(manifest_path: Path) -> Path:
+    """Scratch file _save_manifest writes before replacing the manifest."""
+    return manifest_path.with_name(manifest_path.name + ".tmp")
+
+
+def _save_manifest(manifest_path: Path, manifest: dict):
+    """Atomically write the local sync manifest."""
+    temp_path = _manifest_temp_path(manifest_path)
+    with open(temp_path, "w") as f:
+        json.dump(manifest, f, separators=(",", ":"), sort_keys=True)
+    os.replace(temp_path, manifest_path)
+
+
+def _manifest_record(path: Path, manifest: dict, relative: str, crc32c: str = None) -> dict:
+    """Return a fresh manifest record for path, hashing only if size or mtime changed."""
+    stat = path.stat()
+    entry = manifest.get(relative)
+    if crc32c is None:
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            crc32c = entry["crc32c"]
+        else:
+            crc32c = crc32c_file(str(path))
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "crc32c": crc32c}
+
+
+def _is_unchanged(path: Path, entry: dict) -> bool:
+    """True if the manifest entry still describes the file on disk without rehashing."""
+    if not entry:
+        return False
+    stat = path.stat()
+    return entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns
+
+
+def _is_within(root: Path, relative: str) -> bool:
+    """True if root / relative stays inside root (no "..", absolute paths or symlink escapes)."""
+    resolved_root = root.resolve()
+    target = (root / relative).resolve()
+    return target != resolved_root and resolved_root in target.parents
+
+
+def sync_directory(local_dir: str, bucket_name: str, prefix: str = "",
+                   direction: str = "upload", max_workers: int = DEFAULT_MAX_WORKERS,
+                   manifest_path: str = None, exclude: list = None):
+    """Incrementally mirror a local directory and a bucket prefix.
+    
+    Remote objects are listed once. Local files are only hashed when their size
+    or mtime differs from the manifest, and only files whose CRC32C differs from
+    the remote object are transferred (concurrently, via upload_blob /
+    download_blob). The manifest is stored in the directory as
+    ``.gcs-sync-manifest.json`` unless manifest_path is given.
+    
+    Args:
+        local_dir: Local directory to mirror
+        bucket_name: Name of the GCS bucket
+        prefix: Object name prefix that mirrors local_dir
+        direction: "upload" (local -> GCS) or "download" (GCS -> local)
+        max_workers: Number of files hashed / transferred concurrently
+        manifest_path: Optional path of the checksum manifest
+        exclude: Optional glob patterns (e.g. ["*.tmp", "cache/*"]) matched
+                 against relative paths; matching local files are not uploaded
+    
+    Returns:
+        Dictionary with transferred paths, skipped count, failures and seconds
+    """
+    if direction not in ("upload", "download"):
+        raise ValueError("direction must be 'upload' or 'download'")
+
+    root = Path(local_dir)
+    root.mkdir(parents=True, exist_ok=True)
+    manifest_file = Path(manifest_path) if manifest_path else root / SYNC_MANIFEST_NAME
+    manifest = _load_manifest(manifest_file)
+    prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+
+    start = time.perf_counter()
+    client = get_client("storage")
+    remote = {
+        blob.name[len(prefix):]: blob.crc32c
+        for blob in client.list_blobs(bucket_name, prefix=prefix)
+        if not blob.name.endswith("/")
+    }
+
+    rejected = {}
+    if direction == "upload":
+        # The manifest and its scratch file are this function's own bookkeeping
+        internal = {manifest_file, _manifest_temp_path(manifest_file)}
+        candidates = [
+            path.relative_to(root).as_posix()
+            for path in root.rglob("*")
+            if path.is_file() and path not in internal
+        ]
+        candidates = [
+            relative for relative in candidates
+            if not any(fnmatch.fnmatch(relative, pattern) for pattern in exclude or ())
+        ]
+    else:
+        # Object names are untrusted: never write outside local_dir
+        candidates = [relative for relative in remote if _is_within(root, relative)]
+        for relative in remote.keys() - set(candidates):
+            rejected[relative] = "object name resolves outside the local directory"
+
+    def sync_one(relative: str):
+        path = root / relative
+        if direction == "upload":
+            record = _manifest_record(path, manifest, relative)
+            if remote.get(relative) == record["crc32c"]:
+                return relative, record, False
+            upload_blob(bucket_name, str(path), prefix + relative)
+            return relative, record, True
+
+        if path.exists():
+            record = _manifest_record(path, manifest, relative)
+            if record["crc32c"] == remote[relative]:
+                return relative, record, False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        download_blob(bucket_name, prefix + relative, str(path))
+        return relative, _manifest_record(path, manifest, relative, remote[relative]), True
+
+    transferred, failed, skipped = [], dict(rejected), 0
+    pending = []
+    for relative in candidates:
+        path = root / relative
+        entry = manifest.get(relative)
+        # Fast path: unchanged on disk and already matching remote, no hashing needed
+        if path.exists() and _is_unchanged(path, entry) and remote.get(relative) == entry["crc32c"]:
+            skipped += 1
+        else:
+            pending.append(relative)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(sync_one, relative): relative for relative in pending}
+        for future in as_completed(futures):
+            try:
+                relative, record, copied = future.result()
+            except Exception as e:
+                failed[futures[future]] = str(e)
+                continue
+            manifest[relative] = record
+            if copied:
+                transferred.append(relative)
+            else:
+                skipped += 1
+
+    # Forget files that no longer exist locally
+    for relative in list(manifest):
+        if not (root / relative).exists():
+            del manifest[relative]
+    _save_manifest(manifest_file, manifest)
+    elapsed = time.perf_counter() - start
+
+    print(f"Synced {local_dir} {'->' if direction == 'upload' else '<-'} "
+          f"gs://{bucket_name}/{prefix}: {len(transferred)} transferred, {skipped} unchanged, "
+          f"{len(failed)} failed ({elapsed:.2f}s)")
+    return {
+        "transferred": sorted(transferred),
+        "skipped": skipped,
+        "failed": failed,
+        "seconds": elapsed,
+    }
+
+
 if __name__ == "__main__":
     # Example usage
     try:
@@ -71,6 +573,7 @@ if __name__ == "__main__":
         # bucket_name = os.getenv("GCS_BUCKET_NAME")
         # upload_blob(bucket_name, "local_file.txt", "uploaded_file.txt")
         # download_blob(bucket_name, "uploaded_file.txt", "downloaded_file.txt")
+        # sync_directory("build", bucket_name, prefix="artifacts/build")
         
     except Exception as e:
         print(f"Error: {e}")
@@ -8,38 +8,47 @@ This script:
 3. Tests the credentials by listing projects
 """
 
-import json
-from google.cloud import secretmanager
-from google.oauth2 import service_account
+import os
+import sys
 from google.cloud import resourcemanager_v3
 
+# Add parent directory to path to import the shared client registry
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from clients import get_client
+from secret_credentials import CredentialProvider, secret_version_name
 
-def get_credentials_from_secret_manager():
-    """Retrieve service account credentials from Secret Manager."""
-    
-    # Create Secret Manager client (uses your default credentials)
-    client = secretmanager.SecretManagerServiceClient()
+
+SECRET_PROJECT = "devlead-companion"
+SECRET_ID = "devlead-companion-svc-acc"
+
+# Parsed credentials are cached in memory and refreshed in the background
+# before they expire, so repeated calls don't go back to Secret Manager
+credential_provider = CredentialProvider(ttl=3600, refresh_ahead=300)
+
+
+def get_credentials_from_secret_manager(version: str = "latest"):
+    """Retrieve service account credentials from Secret Manager (cached).
+
+    Args:
+        version: Secret version, "latest" or a pinned version number such as "3"
+    """
     
     # Build the secret name
-    secret_name = "projects/devlead-companion/secrets/devlead-companion-svc-acc/versions/latest"
-    
-    print(f"📥 Fetching secret from Secret Manager: {secret_name}")
-    
-    # Access the secret
-    response = client.access_secret_version(request={"name": secret_name})
-    
-    # Get the secret payload (the JSON key file content)
-    secret_payload = response.payload.data.decode("UTF-8")
+    secret_name = secret_version_name(SECRET_PROJECT, SECRET_ID, version)
     
-    print("✅ Successfully retrieved secret from Secret Manager")
+    # Access (or reuse) the secret and parse the JSON key
+    fetches = credential_provider.stats()["fetches"]
+    credentials = credential_provider.get(SECRET_PROJECT, SECRET_ID, version)
     
-    # Parse JSON and create credentials
-    credentials_dict = json.loads(secret_payload)
-    credentials = service_account.Credentials.from_service_account_info(credentials_dict)
+    if credential_provider.stats()["fetches"] > fetches:
+        print(f"📥 Fetched secret from Secret Manager: {secret_name}")
+        print("✅ Successfully retrieved secret from Secret Manager")
+    else:
+        print(f"♻️  Using cached secret: {secret_name}")
     
     # Display which service account we're using
-    print(f"🔑 Service Account: {credentials_dict.get('client_email')}")
-    print(f"🆔 Private Key ID: {credentials_dict.get('private_key_id')}")
+    print(f"🔑 Service Account: {credentials.service_account_email}")
+    print(f"🆔 Secret Version: {credential_provider.resolved_version(SECRET_PROJECT, SECRET_ID, version)}")
     
     return credentials
 
@@ -50,8 +59,10 @@ def test_credentials(credentials):
     print("\n🧪 Testing credentials by listing projects...")
     
     try:
-        # Create a client using the credentials
-        projects_client = resourcemanager_v3.ProjectsClient(credentials=credentials)
+        # Shared client for this service account; refreshed credentials
+        # replace it rather than adding a client per refresh
+        projects_client = get_client("projects", credentials=credentials,
+                                     credentials_key=credentials.service_account_email)
         
         # List projects (this is a simple read operation)
         request = resourcemanager_v3.ListProjectsRequest(
@@ -83,8 +94,9 @@ def main():
     print()
     
     try:
-        # Step 1: Get credentials from Secret Manager
-        credentials = get_credentials_from_secret_manager()
+        # Step 1: Get credentials from Secret Manager (optionally a pinned version)
+        version = sys.argv[1] if len(sys.argv) > 1 else "latest"
+        credentials = get_credentials_from_secret_manager(version)
         
         # Step 2: Test the credentials
         test_credentials(credentials)
@@ -0,0 +1,61 @@
+"""Lightweight in-process throughput and latency statistics."""
+
+import threading
+import time
+from collections import deque
+
+
+def percentile(samples, pct: float) -> float:
+    """Return the pct-th percentile (0-100) of samples using nearest-rank."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class LatencyRecorder:
+    """Thread-safe success/error counters plus a window of recent latencies.
+
+    Percentiles are computed over the last ``window`` samples so memory stays
+    bounded on long-running consumers; counters cover the whole lifetime.
+    """
+
+    def __init__(self, window: int = 10000):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self._started = time.monotonic()
+        self._last_snapshot = (self._started, 0)
+        self.succeeded = 0
+        self.failed = 0
+
+    def record(self, seconds: float, ok: bool = True):
+        """Record one operation that took ``seconds``."""
+        with self._lock:
+            self._latencies.append(seconds)
+            if ok:
+                self.succeeded += 1
+            else:
+                self.failed += 1
+
+    def snapshot(self) -> dict:
+        """Return counters, overall and interval rates, and latency percentiles in ms."""
+        with self._lock:
+            now = time.monotonic()
+            latencies = list(self._latencies)
+            total = self.succeeded + self.failed
+            last_time, last_total = self._last_snapshot
+            self._last_snapshot = (now, total)
+            succeeded, failed = self.succeeded, self.failed
+
+        elapsed = now - self._started
+        interval = now - last_time
+        return {
+            "succeeded": succeeded,
+            "failed": failed,
+            "per_sec": total / elapsed if elapsed else 0.0,
+            "interval_per_sec": (total - last_total) / interval if interval else 0.0,
+            "mean_ms": sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+        }
@@ -0,0 +1,170 @@
+"""In-memory search index over the project inventory snapshot.
+
+Supports prefix, substring and label lookups without calling the Resource
+Manager API:
+
+- prefix: a sorted array of (term, project_id) searched with bisect, where the
+  terms are the project ID, the display name and each word of it
+- substring: a trigram index narrows candidates, which are then verified
+- labels: a {key: {value: project_ids}} map
+
+update() applies an inventory incrementally, re-indexing only projects whose
+record changed.
+"""
+
+import bisect
+import re
+
+
+def _words(text):
+    """Split a display name into lowercase words."""
+    return [word for word in re.split(r"[^0-9a-z]+", text.lower()) if word]
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class ProjectIndex:
+    """Prefix / substring / label index over inventory project records."""
+
+    # Above this share of changed projects a full rebuild beats sorted inserts
+    REBUILD_RATIO = 0.1
+
+    def __init__(self, records=None):
+        self._records = {}      # project_id -> record
+        self._terms = []        # sorted [(term, project_id)]
+        self._texts = {}        # project_id -> "project_id\ndisplay name" (lowercase)
+        self._trigrams = {}     # trigram -> {project_id}
+        self._labels = {}       # key -> {value -> {project_id}}
+        if records:
+            self.update(records)
+
+    @classmethod
+    def from_inventory(cls, inventory):
+        """Build an index from a snapshot returned by projects.load_inventory()."""
+        return cls(inventory["projects"])
+
+    def __len__(self):
+        return len(self._records)
+
+    def _project_terms(self, record):
+        terms = {record["project_id"].lower(), record["display_name"].lower()}
+        terms.update(_words(record["display_name"]))
+        return {(term, record["project_id"]) for term in terms}
+
+    def _add(self, record, insert_terms=True):
+        project_id = record["project_id"]
+        self._records[project_id] = record
+        if insert_terms:
+            for entry in self._project_terms(record):
+                bisect.insort(self._terms, entry)
+
+        text = f"{project_id}\n{record['display_name']}".lower()
+        self._texts[project_id] = text
+        for trigram in _trigrams(text):
+            self._trigrams.setdefault(trigram, set()).add(project_id)
+        for key, value in (record.get("labels") or {}).items():
+            self._labels.setdefault(key, {}).setdefault(value, set()).add(project_id)
+
+    def _remove(self, project_id, remove_terms=True):
+        record = self._records.pop(project_id)
+        if remove_terms:
+            for entry in self._project_terms(record):
+                index = bisect.bisect_left(self._terms, entry)
+                if index < len(self._terms) and self._terms[index] == entry:
+                    del self._terms[index]
+
+        for trigram in _trigrams(self._texts.pop(project_id)):
+            ids = self._trigrams[trigram]
+            ids.discard(project_id)
+            if not ids:
+                del self._trigrams[trigram]
+        for key, value in (record.get("labels") or {}).items():
+            values = self._labels[key]
+            values[value].discard(project_id)
+            if not values[value]:
+                del values[value]
+            if not values:
+                del self._labels[key]
+
+    def update(self, records):
+        """Make the index match records ({project_id: record}), touching only changes.
+
+        Returns:
+            Number of projects added, changed or removed
+        """
+        removed = [pid for pid in self._records if pid not in records]
+        changed = [pid for pid, record in records.items() if self._records.get(pid) != record]
+        touched = len(removed) + len(changed)
+        if not touched:
+            return 0
+
+        rebuild = touched > max(1, len(self._records)) * self.REBUILD_RATIO
+        for project_id in removed:
+            self._remove(project_id, remove_terms=not rebuild)
+        for project_id in changed:
+            if project_id in self._records:
+                self._remove(project_id, remove_terms=not rebuild)
+            self._add(records[project_id], insert_terms=not rebuild)
+
+        if rebuild:
+            self._terms = sorted(
+                entry for record in self._records.values()
+                for entry in self._project_terms(record)
+            )
+        return touched
+
+    def prefix(self, query, limit=None):
+        """Return project IDs whose ID, display name or a name word starts with query."""
+        query = query.lower()
+        results = {}
+        index = bisect.bisect_left(self._terms, (query, ""))
+        while index < len(self._terms) and self._terms[index][0].startswith(query):
+            results[self._terms[index][1]] = None
+            if limit and len(results) >= limit:
+                break
+            index += 1
+        return list(results)
+
+    def substring(self, query, limit=None):
+        """Return project IDs whose ID or display name contains query."""
+        query = query.lower()
+        if len(query) < 3:
+            candidates = self._texts
+        else:
+            sets = []
+            for trigram in _trigrams(query):
+                ids = self._trigrams.get(trigram)
+                if not ids:
+                    return []
+                sets.append(ids)
+            sets.sort(key=len)
+            candidates = set.intersection(*sets)
+
+        results = sorted(pid for pid in candidates if query in self._texts[pid])
+        return results[:limit] if limit else results
+
+    def labels(self, key, value=None):
+        """Return project IDs having label key (optionally with the given value)."""
+        values = self._labels.get(key, {})
+        if value is not None:
+            return sorted(values.get(value, ()))
+        return sorted(set().union(*values.values())) if values else []
+
+    def search(self, query, limit=None):
+        """Search like the API query: "key=value" / "key=" label filters, else prefix
+        matches first followed by substring matches."""
+        if "=" in query:
+            key, value = query.split("=", 1)
+            return self.labels(key.strip(), value.strip() or None)[:limit]
+
+        results = dict.fromkeys(self.prefix(query, limit))
+        if not limit or len(results) < limit:
+            results.update(dict.fromkeys(self.substring(query)))
+        ids = list(results)
+        return ids[:limit] if limit else ids
+
+    def get(self, project_id):
+        """Return the indexed record for a project ID, or None."""
+        return self._records.get(project_id)
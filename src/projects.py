@@ -4,17 +4,28 @@ Lists and manages Google Cloud Platform projects
 """
 from google.cloud import resourcemanager_v3
 from google.api_core import exceptions
+import json
 import os
-from dotenv import load_dotenv
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from clients import get_client
+from config import get_settings
+from project_index import ProjectIndex
 
-# Load environment variables
-load_dotenv()
+# On-disk project inventory snapshot (see refresh_inventory); loading the
+# settings also exports the .env values, once per process
+INVENTORY_PATH = str(get_settings().projects_inventory_path)
+
+# Offline search index, kept in sync with the snapshot file's mtime
+_index = ProjectIndex()
+_index_mtime = None
 
 def list_all_projects():
     """List all GCP projects accessible to the authenticated user"""
     try:
-        # Create a client
-        client = resourcemanager_v3.ProjectsClient()
+        # Reuse the shared client
+        client = get_client("projects")
         
         print("\n" + "="*80)
         print("GCP PROJECTS LIST")
@@ -54,31 +65,58 @@ def list_all_projects():
         print("\nTip: The 'invalid parent name' error usually means you need to use")
         print("search_projects() instead of list_projects(), or specify a valid parent.")
 
-def get_project_details(project_id):
+def _project_record(project):
+    """Convert a Project message into a compact, JSON-serializable dict"""
+    return {
+        "project_id": project.project_id,
+        "display_name": project.display_name,
+        "number": project.name.split('/')[-1],
+        "state": project.state.name,
+        "parent": project.parent,
+        "create_time": str(project.create_time),
+        "update_time": str(project.update_time),
+        "labels": dict(project.labels),
+    }
+
+
+def _print_project_details(record):
+    """Print the details of a project record"""
+    print("\n" + "="*80)
+    print(f"PROJECT DETAILS: {record['project_id']}")
+    print("="*80)
+    print(f"Display Name: {record['display_name']}")
+    print(f"Project ID: {record['project_id']}")
+    print(f"Project Number: {record['number']}")
+    print(f"State: {record['state']}")
+    print(f"Created: {record['create_time']}")
+    print(f"Updated: {record['update_time']}")
+    if record['parent']:
+        print(f"Parent: {record['parent']}")
+    if record['labels']:
+        print("\nLabels:")
+        for key, value in record['labels'].items():
+            print(f"  {key}: {value}")
+    print("="*80)
+
+
+def get_project_details(project_id, from_inventory=False):
     """Get detailed information about a specific project"""
+    if from_inventory:
+        inventory = load_inventory()
+        record = inventory["projects"].get(project_id) if inventory else None
+        if record:
+            _print_project_details(record)
+            return
+        print(f"\nℹ️  '{project_id}' not in the inventory snapshot, asking the API...")
+
     try:
-        client = resourcemanager_v3.ProjectsClient()
+        client = get_client("projects")
         
         # Get project details
         name = f"projects/{project_id}"
         project = client.get_project(name=name)
         
-        print("\n" + "="*80)
-        print(f"PROJECT DETAILS: {project_id}")
-        print("="*80)
-        print(f"Display Name: {project.display_name}")
-        print(f"Project ID: {project.project_id}")
-        print(f"Project Number: {project.name.split('/')[-1]}")
-        print(f"State: {project.state.name}")
-        print(f"Created: {project.create_time}")
-        print(f"Updated: {project.update_time}")
-        if project.parent:
-            print(f"Parent: {project.parent}")
-        if project.labels:
-            print("\nLabels:")
-            for key, value in project.labels.items():
-                print(f"  {key}: {value}")
-        print("="*80)
+        _print_project_details(_project_record(project))
         
     except exceptions.NotFound:
         print(f"\n❌ Project '{project_id}' not found")
@@ -88,10 +126,161 @@ def get_project_details(project_id):
         print(f"\n❌ Error getting project details: {e}")
 
 
+def load_inventory(path=INVENTORY_PATH):
+    """Load the project inventory snapshot, or None if it doesn't exist yet"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def refresh_inventory(path=INVENTORY_PATH, max_workers=16, query="state:ACTIVE"):
+    """Build or incrementally refresh the on-disk project inventory snapshot.
+    
+    One search lists every project with its update_time. Details are then
+    fetched concurrently, but only for projects that are new or whose
+    update_time changed since the previous snapshot; projects that are no
+    longer returned are dropped. A project whose detail fetch fails keeps its
+    previous record (or the search result if it is new) and is retried on the
+    next refresh.
+    """
+    client = get_client("projects")
+    start = time.perf_counter()
+
+    previous = load_inventory(path) or {"projects": {}}
+    if previous.get("query") != query:
+        previous = {"projects": {}}
+    old_records = previous["projects"]
+
+    current = {
+        project.project_id: project
+        for project in client.search_projects(
+            request=resourcemanager_v3.SearchProjectsRequest(query=query)
+        )
+    }
+    changed = [
+        project_id for project_id, project in current.items()
+        if old_records.get(project_id, {}).get("update_time") != str(project.update_time)
+    ]
+
+    records = {project_id: old_records[project_id]
+               for project_id in current if project_id not in changed}
+    failed = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(client.get_project, name=f"projects/{project_id}"): project_id
+            for project_id in changed
+        }
+        for future in as_completed(futures):
+            try:
+                records[futures[future]] = _project_record(future.result())
+            except Exception as e:
+                project_id = futures[future]
+                failed += 1
+                print(f"\n❌ Error fetching '{project_id}': {e}")
+                # Don't let a transient error drop the project from the snapshot;
+                # a new project's record gets no update_time so it is refetched
+                fallback = old_records.get(project_id)
+                if fallback is None:
+                    fallback = dict(_project_record(current[project_id]), update_time=None)
+                records[project_id] = fallback
+
+    snapshot = {
+        "query": query,
+        "generated_at": time.time(),
+        "projects": dict(sorted(records.items())),
+    }
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(snapshot, f, separators=(",", ":"))
+    os.replace(temp_path, path)
+
+    unchanged = len(current) - len(changed)
+    removed = len(set(old_records) - set(current))
+    elapsed = time.perf_counter() - start
+    print(f"\n✅ Inventory refreshed: {len(records)} projects "
+          f"({len(changed) - failed} fetched, {unchanged} unchanged, "
+          f"{removed} removed, {failed} failed) in {elapsed:.2f}s")
+    print(f"   Snapshot: {path}")
+    return snapshot
+
+
+def list_inventory_projects(path=INVENTORY_PATH):
+    """List projects from the inventory snapshot without calling the API"""
+    inventory = load_inventory(path)
+    if inventory is None:
+        print("\n❌ No inventory snapshot yet. Refresh the inventory first.")
+        return
+
+    age_minutes = (time.time() - inventory["generated_at"]) / 60
+    print("\n" + "="*80)
+    print(f"GCP PROJECTS (snapshot, {age_minutes:.0f} min old)")
+    print("="*80)
+    for idx, record in enumerate(inventory["projects"].values(), 1):
+        print(f"\n{idx}. Project ID: {record['project_id']}")
+        print(f"   Name: {record['display_name']}")
+        print(f"   State: {record['state']}")
+        if record['parent']:
+            print(f"   Parent: {record['parent']}")
+        print(f"   Created: {record['create_time']}")
+        print("-" * 80)
+    print(f"\nTotal Projects: {len(inventory['projects'])}")
+    print("="*80)
+
+
+def inventory_index(path=INVENTORY_PATH):
+    """Return the search index for the inventory snapshot, or None if there is none.
+    
+    The index is only updated (incrementally) when the snapshot file changes.
+    """
+    global _index_mtime
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    if mtime != _index_mtime:
+        inventory = load_inventory(path)
+        if inventory is None:
+            return None
+        _index.update(inventory["projects"])
+        _index_mtime = mtime
+    return _index
+
+
+def search_projects_offline(query, path=INVENTORY_PATH):
+    """Search the local inventory index by ID/name prefix or substring, or key=value label"""
+    index = inventory_index(path)
+    if index is None:
+        print("\n❌ No inventory snapshot yet. Refresh the inventory first.")
+        return []
+
+    start = time.perf_counter()
+    results = index.search(query)
+    elapsed_us = (time.perf_counter() - start) * 1_000_000
+
+    print("\n" + "="*80)
+    print(f"SEARCHING SNAPSHOT: '{query}'")
+    print("="*80)
+    for idx, project_id in enumerate(results, 1):
+        record = index.get(project_id)
+        print(f"\n{idx}. Project ID: {record['project_id']}")
+        print(f"   Name: {record['display_name']}")
+        print(f"   State: {record['state']}")
+        print("-" * 80)
+    if results:
+        print(f"\nFound {len(results)} matching project(s) in {elapsed_us:.0f} µs")
+    else:
+        print(f"\nNo projects found matching '{query}'")
+    print("="*80)
+    return results
+
+
 def search_projects(query):
     """Search for projects by name or ID"""
     try:
-        client = resourcemanager_v3.ProjectsClient()
+        client = get_client("projects")
         
         print("\n" + "="*80)
         print(f"SEARCHING PROJECTS: '{query}'")
@@ -130,31 +319,42 @@ def main_menu():
         print("1. List all projects")
         print("2. Get project details")
         print("3. Search projects")
-        print("4. Exit")
+        print("4. Refresh inventory snapshot")
+        print("5. List projects from snapshot")
+        print("6. Get project details from snapshot")
+        print("7. Search projects in snapshot (offline)")
+        print("8. Exit")
         print("="*60)
         
-        choice = input("\nEnter your choice (1-4): ").strip()
+        choice = input("\nEnter your choice (1-8): ").strip()
         
         if choice == "1":
             print("\n📋 Listing all projects...")
             list_all_projects()
-        elif choice == "2":
+        elif choice in ("2", "6"):
             project_id = input("\nEnter Project ID: ").strip()
             if project_id:
-                get_project_details(project_id)
+                get_project_details(project_id, from_inventory=choice == "6")
             else:
                 print("❌ Project ID cannot be empty")
-        elif choice == "3":
+        elif choice in ("3", "7"):
             query = input("\nEnter search query (project ID or name): ").strip()
-            if query:
-                search_projects(query)
-            else:
+            if not query:
                 print("❌ Search query cannot be empty")
+            elif choice == "7":
+                search_projects_offline(query)
+            else:
+                search_projects(query)
         elif choice == "4":
+            print("\n🔄 Refreshing inventory snapshot...")
+            refresh_inventory()
+        elif choice == "5":
+            list_inventory_projects()
+        elif choice == "8":
             print("\n👋 Exiting...")
             break
         else:
-            print("\n❌ Invalid choice! Please enter a number between 1 and 4.")
+            print("\n❌ Invalid choice! Please enter a number between 1 and 8.")
 
 
 if __name__ == "__main__":
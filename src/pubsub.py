@@ -1,24 +1,38 @@
-from google.cloud import pubsub_v1
 from google.api_core import exceptions
+import json
 import os
-from dotenv import load_dotenv
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from clients import get_client
+from config import get_settings
+import pubsub_spec
 
-load_dotenv()   
+# Settings and clients are loaded on first use (shared with every module), so
+# importing this module has no side effects and pays no gRPC channel setup
 
-try:
-    publisher = pubsub_v1.PublisherClient() #this is publisher too
-    subscriber = pubsub_v1.SubscriberClient()
 
-    project_id = os.getenv("GOOGLE_CLOUD_PROJECT")
-    project_path = f"projects/{project_id}"
-except Exception as e:
-    print(f"\n❌ Error creating client: {e}")
-    exit()
+def _publisher():
+    get_settings()  # exports .env values (e.g. PUBSUB_EMULATOR_HOST) first
+    return get_client("publisher")
 
-def display_Project():
-    print(f"\n✅ Project: {project_id}")
 
-display_Project()
+def _subscriber():
+    get_settings()
+    return get_client("subscriber")
+
+
+def _project_id():
+    return get_settings().project_id
+
+
+def _project_path():
+    return f"projects/{_project_id()}"
+
+
+def display_Project():
+    print(f"\n✅ Project: {_project_id()}")
 
 def list_all_topics():
     display_Project()
@@ -30,7 +44,7 @@ def list_all_topics():
         print("PUBSUB TOPICS LIST")
         print("="*80)
         
-        topics = publisher.list_topics(request={"project": project_path})
+        topics = _publisher().list_topics(request={"project": _project_path()})
         
         topic_count = 0
         for topic in topics:
@@ -58,17 +72,17 @@ def list_subscriptions(topic_id):
 
     try:
         if topic_id:
-            topic_path = f"{project_path}/topics/{topic_id}"
+            topic_path = f"{_project_path()}/topics/{topic_id}"
             print("\n" + "="*80)
             print(f"SUBSCRIPTIONS FOR TOPIC: {topic_id}")
             print("="*80)
-            subscriptions = publisher.list_topic_subscriptions(request={"topic": topic_path})
+            subscriptions = _publisher().list_topic_subscriptions(request={"topic": topic_path})
         else:
-            topic_path = f"{project_path}"
+            topic_path = _project_path()
             print("\n" + "="*80)
-            print(f"SUBSCRIPTIONS FOR PROJECT: {project_id}")
+            print(f"SUBSCRIPTIONS FOR PROJECT: {_project_id()}")
             print("="*80)   
-            subscriptions = subscriber.list_subscriptions(request={"project": project_path})
+            subscriptions = _subscriber().list_subscriptions(request={"project": _project_path()})
 
         subscription_count = 0
         for subscription in subscriptions:
@@ -94,9 +108,9 @@ def create_topic(topic_name):
     display_Project()
     """Create a new PubSub topic"""
     try:
-        topic_path = f"projects/{project_id}/topics/{topic_name}"
+        topic_path = f"{_project_path()}/topics/{topic_name}"
         
-        topic = publisher.create_topic(request={"name": topic_path})
+        topic = _publisher().create_topic(request={"name": topic_path})
         
         print(f"\n✅ Topic '{topic_name}' created successfully")
         
@@ -112,10 +126,10 @@ def create_subscription(topic_name, subscription_name):
     display_Project()
     """Create a new PubSub subscription"""
     try:
-        topic_path = f"projects/{project_id}/topics/{topic_name}"
-        subscription_path = f"projects/{project_id}/subscriptions/{subscription_name}"
+        topic_path = f"{_project_path()}/topics/{topic_name}"
+        subscription_path = f"{_project_path()}/subscriptions/{subscription_name}"
         
-        subscription = subscriber.create_subscription(request={"name": subscription_path, "topic": topic_path})
+        subscription = _subscriber().create_subscription(request={"name": subscription_path, "topic": topic_path})
         
         print(f"\n✅ Subscription '{subscription_name}' created successfully")
         
@@ -133,9 +147,9 @@ def delete_topic(topic_name):
     display_Project()
     """Delete a PubSub topic"""
     try:
-        topic_path = f"projects/{project_id}/topics/{topic_name}"
+        topic_path = f"{_project_path()}/topics/{topic_name}"
         
-        publisher.delete_topic(request={"topic": topic_path})
+        _publisher().delete_topic(request={"topic": topic_path})
         
         print(f"\n✅ Topic '{topic_name}' deleted successfully")
         
@@ -151,9 +165,9 @@ def delete_subscription(subscription_name):
     display_Project()
     """Delete a PubSub subscription"""
     try:
-        subscription_path = f"projects/{project_id}/subscriptions/{subscription_name}"
+        subscription_path = f"{_project_path()}/subscriptions/{subscription_name}"
         
-        subscriber.delete_subscription(request={"subscription": subscription_path})
+        _subscriber().delete_subscription(request={"subscription": subscription_path})
         
         print(f"\n✅ Subscription '{subscription_name}' deleted successfully")
         
@@ -165,6 +179,231 @@ def delete_subscription(subscription_name):
     except Exception as e:
         print(f"\n❌ Error deleting subscription: {e}")
 
+# Topology cache (see build_topology); None means settings.pubsub_topology_cache_dir
+TOPOLOGY_CACHE_DIR = None
+TOPOLOGY_TTL = 300  # seconds
+
+# Transient errors worth retrying when applying a spec
+RETRYABLE_ERRORS = (
+    exceptions.ServiceUnavailable,
+    exceptions.DeadlineExceeded,
+    exceptions.ResourceExhausted,
+    exceptions.Aborted,
+    exceptions.InternalServerError,
+)
+
+
+def _short_name(path):
+    """projects/p/topics/t -> t"""
+    return path.rsplit("/", 1)[-1]
+
+
+def _current_state():
+    """List topic IDs and {subscription ID: topic ID} with one paged call each"""
+    topics = [_short_name(topic.name)
+              for topic in _publisher().list_topics(request={"project": _project_path()})]
+    subscriptions = {
+        _short_name(subscription.name): _short_name(subscription.topic)
+        for subscription in _subscriber().list_subscriptions(request={"project": _project_path()})
+    }
+    return topics, subscriptions
+
+
+def _with_retries(operation, max_retries):
+    """Run operation, retrying transient errors with exponential backoff"""
+    attempts = max(1, max_retries)  # always run the operation at least once
+    for attempt in range(1, attempts + 1):
+        try:
+            return operation()
+        except RETRYABLE_ERRORS:
+            if attempt == attempts:
+                raise
+            time.sleep(min(0.2 * 2 ** attempt, 10.0))
+
+
+def _apply_action(kind, item):
+    """Apply one plan action; already-done creates/deletes count as success"""
+    if kind == "delete_subscriptions":
+        path = f"{_project_path()}/subscriptions/{item}"
+        try:
+            _subscriber().delete_subscription(request={"subscription": path})
+        except exceptions.NotFound:
+            pass
+    elif kind == "delete_topics":
+        try:
+            _publisher().delete_topic(request={"topic": f"{_project_path()}/topics/{item}"})
+        except exceptions.NotFound:
+            pass
+    elif kind == "create_topics":
+        try:
+            _publisher().create_topic(request={"name": f"{_project_path()}/topics/{item}"})
+        except exceptions.AlreadyExists:
+            pass
+    else:
+        settings = {k: v for k, v in item.items() if k not in ("name", "topic")}
+        request = {
+            "name": f"{_project_path()}/subscriptions/{item['name']}",
+            "topic": f"{_project_path()}/topics/{item['topic']}",
+            **settings,
+        }
+        try:
+            _subscriber().create_subscription(request=request)
+        except exceptions.AlreadyExists:
+            pass
+
+
+def reconcile(spec_path, dry_run=True, max_workers=16, max_retries=5):
+    """Make topics/subscriptions match a YAML/JSON spec (see pubsub_spec).
+    
+    Lists the current state once, prints the plan and, unless dry_run, applies
+    it phase by phase (subscription deletes, topic deletes, topic creates,
+    subscription creates) with bounded parallelism within each phase.
+    """
+    display_Project()
+    try:
+        spec = pubsub_spec.load_spec(spec_path)
+        topics, subscriptions = _current_state()
+    except Exception as e:
+        print(f"\n❌ Error preparing plan: {e}")
+        return None
+
+    plan = pubsub_spec.compute_plan(spec, topics, subscriptions)
+    print("\n" + "="*80)
+    print(f"PUBSUB PLAN: {spec_path}{' (dry run)' if dry_run else ''}")
+    print("="*80)
+    print(pubsub_spec.format_plan(plan))
+    print("="*80)
+
+    result = {"plan": plan, "applied": 0, "failed": []}
+    if dry_run or not pubsub_spec.plan_size(plan):
+        return result
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for kind, items in plan.items():
+            # Each phase must finish before the next (e.g. topics before their subscriptions)
+            futures = {
+                executor.submit(_with_retries, lambda k=kind, i=item: _apply_action(k, i),
+                                max_retries): item
+                for item in items
+            }
+            for future, item in futures.items():
+                try:
+                    future.result()
+                    result["applied"] += 1
+                except Exception as e:
+                    name = item["name"] if isinstance(item, dict) else item
+                    result["failed"].append({"action": kind, "name": name, "error": str(e)})
+                    print(f"\n❌ {kind} {name}: {e}")
+
+    print(f"\n✅ Applied {result['applied']} change(s), {len(result['failed'])} failed "
+          f"in {time.perf_counter() - start:.2f}s")
+    return result
+
+
+def _topology_cache_path():
+    cache_dir = TOPOLOGY_CACHE_DIR or get_settings().pubsub_topology_cache_dir
+    return Path(cache_dir) / f"pubsub_topology_{_project_id()}.json"
+
+
+def build_topology(max_workers=16, ttl=TOPOLOGY_TTL, refresh=False):
+    """Build the topic -> subscriptions graph for the project, cached on disk.
+    
+    Topics are listed once and list_topic_subscriptions is fanned out
+    concurrently; one project-wide subscription listing finds orphaned
+    subscriptions (whose topic was deleted, not those attached to topics in
+    other projects). The graph is reused from the
+    cache while it is younger than ttl seconds unless refresh is True.
+    
+    Returns:
+        {"project", "generated_at", "topics": {topic: [subscriptions]},
+         "orphaned_subscriptions": [subscriptions]}
+    """
+    cache_path = _topology_cache_path()
+    if not refresh:
+        try:
+            with open(cache_path) as f:
+                cached = json.load(f)
+            if time.time() - cached["generated_at"] < ttl:
+                return cached
+        except (OSError, ValueError, KeyError):
+            pass
+
+    topics = [_short_name(topic.name)
+              for topic in _publisher().list_topics(request={"project": _project_path()})]
+
+    def topic_subscriptions(topic):
+        request = {"topic": f"{_project_path()}/topics/{topic}"}
+        return sorted(_short_name(path)
+                      for path in _publisher().list_topic_subscriptions(request=request))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        project_subscriptions = executor.submit(
+            lambda: list(_subscriber().list_subscriptions(request={"project": _project_path()}))
+        )
+        graph = dict(zip(topics, executor.map(topic_subscriptions, topics)))
+        # Subscriptions may attach to topics in other projects, so only the
+        # deleted-topic marker identifies an orphan
+        orphaned = sorted(
+            _short_name(subscription.name) for subscription in project_subscriptions.result()
+            if subscription.topic == pubsub_spec.DELETED_TOPIC
+        )
+
+    topology = {
+        "project": _project_id(),
+        "generated_at": time.time(),
+        "topics": dict(sorted(graph.items())),
+        "orphaned_subscriptions": orphaned,
+    }
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = cache_path.with_name(cache_path.name + ".tmp")
+    with open(temp_path, "w") as f:
+        json.dump(topology, f, separators=(",", ":"))
+    os.replace(temp_path, cache_path)
+    return topology
+
+
+def export_topology(output_path, refresh=False):
+    """Write the topology graph to a JSON file"""
+    topology = build_topology(refresh=refresh)
+    with open(output_path, "w") as f:
+        json.dump(topology, f, indent=2)
+    print(f"\n✅ Topology exported to {output_path}")
+    return topology
+
+
+def show_topology(refresh=False):
+    """Print the topic -> subscriptions graph"""
+    display_Project()
+    try:
+        topology = build_topology(refresh=refresh)
+    except exceptions.PermissionDenied as e:
+        print(f"\n❌ Permission Denied: {e}")
+        return
+    except Exception as e:
+        print(f"\n❌ Error building topology: {e}")
+        return
+
+    age = time.time() - topology["generated_at"]
+    print("\n" + "="*80)
+    print(f"PUBSUB TOPOLOGY (as of {age:.0f}s ago)")
+    print("="*80)
+    for topic, subscriptions in topology["topics"].items():
+        print(f"\n📢 {topic}")
+        for subscription in subscriptions:
+            print(f"   └─ {subscription}")
+        if not subscriptions:
+            print("   (no subscriptions)")
+    if topology["orphaned_subscriptions"]:
+        print("\n⚠️  Orphaned subscriptions (topic deleted):")
+        for subscription in topology["orphaned_subscriptions"]:
+            print(f"   - {subscription}")
+    subscription_count = sum(len(subs) for subs in topology["topics"].values())
+    print(f"\nTotal: {len(topology['topics'])} topic(s), {subscription_count} subscription(s), "
+          f"{len(topology['orphaned_subscriptions'])} orphaned")
+    print("="*80)
+
+
 def main_menu():
     """Interactive menu for PubSub operations"""
     while True:
@@ -177,10 +416,12 @@ def main_menu():
         print("4. Create a subscription")
         print("5. Delete a topic")
         print("6. Delete a subscription")
-        print("7. Exit")
+        print("7. Apply a topic/subscription spec file")
+        print("8. Show topic/subscription topology")
+        print("9. Exit")
         print("="*60)
         
-        choice = input("\nEnter your choice (1-7): ").strip()
+        choice = input("\nEnter your choice (1-9): ").strip()
         
         if choice == "1":
             print("\n📋 Listing all topics...")
@@ -216,10 +457,37 @@ def main_menu():
             else:
                 print("❌ Subscription name cannot be empty")
         elif choice == "7":
+            spec_path = input("\nEnter spec file path (YAML or JSON): ").strip()
+            if not spec_path:
+                print("❌ Spec file path cannot be empty")
+                continue
+            plan = reconcile(spec_path, dry_run=True)
+            if plan and pubsub_spec.plan_size(plan["plan"]):
+                if input("\nApply this plan? (y/N): ").strip().lower() == "y":
+                    reconcile(spec_path, dry_run=False)
+        elif choice == "8":
+            refresh = input("\nRefresh from the API? (y/N): ").strip().lower() == "y"
+            show_topology(refresh=refresh)
+        elif choice == "9":
             print("\n👋 Exiting...")
             break
         else:
-            print("\n❌ Invalid choice! Please enter a number between 1 and 7.")
+            print("\n❌ Invalid choice! Please enter a number between 1 and 9.")
 
 if __name__ == "__main__":
+    # Non-interactive use:
+    # python src/pubsub.py reconcile spec.yaml [--apply]
+    if len(sys.argv) >= 3 and sys.argv[1] == "reconcile":
+        outcome = reconcile(sys.argv[2], dry_run="--apply" not in sys.argv[3:])
+        sys.exit(0 if outcome and not outcome["failed"] else 1)
+    # python src/pubsub.py topology [out.json] [--refresh]
+    if len(sys.argv) >= 2 and sys.argv[1] == "topology":
+        targets = [arg for arg in sys.argv[2:] if not arg.startswith("--")]
+        if targets:
+            export_topology(targets[0], refresh="--refresh" in sys.argv)
+        else:
+            show_topology(refresh="--refresh" in sys.argv)
+        sys.exit(0)
+
+    display_Project()
     main_menu()
\ No newline at end of file
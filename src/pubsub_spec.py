@@ -0,0 +1,139 @@
+"""Declarative Pub/Sub topic/subscription specs and the plan to reach them.
+
+A spec lists the topics that should exist and their subscriptions:
+
+    prune: false              # also delete topics/subscriptions not in the spec
+    topics:
+      - name: orders
+        subscriptions:
+          - orders-worker     # plain name, default settings
+          - name: orders-audit
+            ack_deadline_seconds: 60
+            enable_message_ordering: true
+
+Subscription settings are passed to create_subscription as-is. Only
+existence and the topic a subscription is attached to are reconciled;
+a subscription attached to a different topic is recreated (its topic
+cannot be changed in place).
+
+This module is pure: pubsub.reconcile() lists the current state, calls
+compute_plan() and applies the result.
+"""
+
+import json
+from pathlib import Path
+
+DELETED_TOPIC = "_deleted-topic_"
+
+
+def load_spec(path):
+    """Load a YAML (.yaml/.yml) or JSON spec file and normalize it.
+
+    Returns:
+        {"prune": bool, "topics": {topic: {subscription: settings}}}
+    """
+    text = Path(path).read_text()
+    if Path(path).suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError as e:
+            raise ImportError("PyYAML is required for YAML specs: pip install PyYAML") from e
+        raw = yaml.safe_load(text) or {}
+    else:
+        raw = json.loads(text)
+    return normalize_spec(raw)
+
+
+def normalize_spec(raw):
+    """Validate a parsed spec and normalize subscriptions to {name: settings}."""
+    topics = {}
+    subscription_topics = {}
+    for topic in raw.get("topics") or []:
+        topic_name = topic["name"] if isinstance(topic, dict) else topic
+        if topic_name in topics:
+            raise ValueError(f"Topic '{topic_name}' is declared twice")
+        subscriptions = {}
+        for subscription in (topic.get("subscriptions") or []) if isinstance(topic, dict) else []:
+            if isinstance(subscription, str):
+                subscription = {"name": subscription}
+            settings = dict(subscription)
+            name = settings.pop("name")
+            if name in subscription_topics:
+                raise ValueError(f"Subscription '{name}' is declared twice")
+            subscription_topics[name] = topic_name
+            subscriptions[name] = settings
+        topics[topic_name] = subscriptions
+    return {"prune": bool(raw.get("prune", False)), "topics": topics}
+
+
+def compute_plan(spec, current_topics, current_subscriptions):
+    """Diff a normalized spec against the current state.
+
+    Args:
+        spec: Output of load_spec / normalize_spec
+        current_topics: Iterable of existing topic IDs
+        current_subscriptions: {subscription ID: topic ID} of existing subscriptions
+            (topic ID is DELETED_TOPIC for orphaned subscriptions)
+
+    Returns:
+        Dict of action lists, applied in this order:
+        delete_subscriptions, delete_topics, create_topics, create_subscriptions
+    """
+    current_topics = set(current_topics)
+    wanted_subscriptions = {
+        name: (topic, settings)
+        for topic, subscriptions in spec["topics"].items()
+        for name, settings in subscriptions.items()
+    }
+
+    delete_subscriptions = []
+    create_subscriptions = []
+    for name, (topic, settings) in sorted(wanted_subscriptions.items()):
+        existing_topic = current_subscriptions.get(name)
+        if existing_topic == topic:
+            continue
+        if existing_topic is not None:
+            # Attached to another (or a deleted) topic: recreate it
+            delete_subscriptions.append(name)
+        create_subscriptions.append({"name": name, "topic": topic, **settings})
+
+    delete_topics = []
+    if spec["prune"]:
+        delete_subscriptions.extend(sorted(
+            name for name in current_subscriptions if name not in wanted_subscriptions
+        ))
+        delete_topics = sorted(current_topics - set(spec["topics"]))
+
+    return {
+        "delete_subscriptions": delete_subscriptions,
+        "delete_topics": delete_topics,
+        "create_topics": sorted(set(spec["topics"]) - current_topics),
+        "create_subscriptions": create_subscriptions,
+    }
+
+
+def plan_size(plan):
+    """Total number of actions in a plan."""
+    return sum(len(actions) for actions in plan.values())
+
+
+def format_plan(plan):
+    """Render a plan as terraform-style lines (+ create, - delete)."""
+    lines = []
+    for name in plan["delete_subscriptions"]:
+        lines.append(f"  - subscription {name}")
+    for name in plan["delete_topics"]:
+        lines.append(f"  - topic {name}")
+    for name in plan["create_topics"]:
+        lines.append(f"  + topic {name}")
+    for subscription in plan["create_subscriptions"]:
+        settings = {k: v for k, v in subscription.items() if k not in ("name", "topic")}
+        extra = f" {settings}" if settings else ""
+        lines.append(f"  + subscription {subscription['name']} -> {subscription['topic']}{extra}")
+    counts = {action: len(items) for action, items in plan.items()}
+    lines.append(
+        f"Plan: {counts['create_topics']} topic(s) and {counts['create_subscriptions']} "
+        f"subscription(s) to create, {counts['delete_topics']} topic(s) and "
+        f"{counts['delete_subscriptions']} subscription(s) to delete."
+    )
+    return "\n".join(lines)
@@ -0,0 +1,193 @@
+"""Service account credentials loaded from Secret Manager and cached in memory.
+
+Fetching and parsing a key on every call puts Secret Manager on the request
+path and burns access quota at high QPS. CredentialProvider keeps parsed
+credentials per secret version instead:
+
+    provider = CredentialProvider(ttl=3600, refresh_ahead=300)
+    credentials = provider.get("my-project", "my-svc-acc-key")          # latest
+    credentials = provider.get("my-project", "my-svc-acc-key", "7")     # pinned
+
+- A floating version ("latest" or an alias) is cached for ttl seconds. In
+  the last refresh_ahead seconds callers still get the cached credentials
+  while one background thread fetches the current version, so a rotation
+  is picked up without anyone waiting on it.
+- A pinned (numeric) version never changes, so it is cached until
+  invalidated.
+- Concurrent loads of the same version share one access_secret_version call
+  (single flight). A failed background refresh is retried at most every
+  retry_interval seconds, so an outage doesn't turn every hit into a call.
+
+The Secret Manager client and the payload parser are injectable, so tests
+can use a stub client and plain dicts.
+"""
+
+import json
+import threading
+import time
+
+from clients import get_client
+
+
+def parse_service_account(payload: bytes):
+    """Build service account Credentials from a JSON key payload."""
+    from google.oauth2 import service_account
+
+    return service_account.Credentials.from_service_account_info(json.loads(payload))
+
+
+def secret_version_name(project_id: str, secret_id: str, version: str = "latest") -> str:
+    """Full resource name of a secret version."""
+    return f"projects/{project_id}/secrets/{secret_id}/versions/{version}"
+
+
+def is_pinned(name: str) -> bool:
+    """True for numbered versions, whose content can never change."""
+    return name.rsplit("/", 1)[-1].isdigit()
+
+
+class _Entry:
+    __slots__ = ("value", "resolved_name", "expires_at", "next_refresh_at")
+
+    def __init__(self, value, resolved_name, expires_at):
+        self.value = value
+        self.resolved_name = resolved_name
+        self.expires_at = expires_at  # None: never expires (pinned version)
+        self.next_refresh_at = None  # set after a failed background refresh
+
+
+class _Flight:
+    """An in-progress load that concurrent callers wait on."""
+
+    def __init__(self, generation):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        self.generation = generation  # cache generation the load started in
+
+
+class CredentialProvider:
+    """TTL cache of parsed secrets with refresh-ahead and single-flight loading.
+
+    Args:
+        client: Secret Manager client (defaults to the shared registry client)
+        ttl: Seconds floating versions ("latest", aliases) are cached
+        refresh_ahead: Seconds before expiry when a background refresh starts
+        retry_interval: Seconds to wait before retrying a failed background refresh
+        parse: Turns the secret payload bytes into the cached value
+    """
+
+    def __init__(self, client=None, ttl: float = 3600.0, refresh_ahead: float = 300.0,
+                 retry_interval: float = 30.0, parse=parse_service_account,
+                 clock=time.monotonic):
+        if refresh_ahead >= ttl:
+            raise ValueError("refresh_ahead must be shorter than ttl")
+        self._client = client
+        self.ttl = ttl
+        self.refresh_ahead = refresh_ahead
+        self.retry_interval = retry_interval
+        self._parse = parse
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._flights = {}
+        self._generation = 0  # bumped by invalidate() so in-flight loads don't store
+        self._stats = {"hits": 0, "misses": 0, "refreshes": 0, "fetches": 0, "errors": 0}
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = get_client("secretmanager")
+        return self._client
+
+    def get(self, project_id: str, secret_id: str, version: str = "latest"):
+        """Return parsed credentials for a secret version, from cache when possible."""
+        return self.get_by_name(secret_version_name(project_id, secret_id, version))
+
+    def get_by_name(self, name: str):
+        """Like get(), with a full projects/*/secrets/*/versions/* name."""
+        with self._lock:
+            entry = self._entries.get(name)
+            now = self._clock()
+            if entry is not None and (entry.expires_at is None or now < entry.expires_at):
+                self._stats["hits"] += 1
+                refresh = (entry.expires_at is not None
+                           and now >= entry.expires_at - self.refresh_ahead
+                           and (entry.next_refresh_at is None or now >= entry.next_refresh_at)
+                           and name not in self._flights)
+                if refresh:
+                    self._stats["refreshes"] += 1
+                    flight = self._flights[name] = _Flight(self._generation)
+            else:
+                self._stats["misses"] += 1
+                refresh = None
+
+        if refresh:
+            threading.Thread(target=self._run_flight, args=(name, flight), daemon=True,
+                             name="secret-refresh").start()
+        if refresh is not None:
+            return entry.value
+        return self._load(name)
+
+    def resolved_version(self, project_id: str, secret_id: str, version: str = "latest"):
+        """Version name the cached value came from (e.g. .../versions/7), or None."""
+        with self._lock:
+            entry = self._entries.get(secret_version_name(project_id, secret_id, version))
+            return entry.resolved_name if entry else None
+
+    def invalidate(self, name: str = None):
+        """Drop one cached version name, or everything when name is None."""
+        with self._lock:
+            self._generation += 1
+            if name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(name, None)
+
+    def stats(self) -> dict:
+        """Hit / miss / background refresh / fetch / error counters and cache size."""
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries)}
+
+    def _load(self, name):
+        """Fetch name, or wait for a fetch already in progress."""
+        with self._lock:
+            flight = self._flights.get(name)
+            # A load started before invalidate() may return the old value
+            leader = flight is None or flight.generation != self._generation
+            if leader:
+                flight = self._flights[name] = _Flight(self._generation)
+        if leader:
+            self._run_flight(name, flight)
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    def _run_flight(self, name, flight):
+        try:
+            flight.value = self._fetch(name, flight.generation)
+        except Exception as e:
+            flight.error = e
+            with self._lock:
+                self._stats["errors"] += 1
+                entry = self._entries.get(name)
+                if entry is not None:
+                    # Back off instead of refetching on every hit in the refresh window
+                    entry.next_refresh_at = self._clock() + self.retry_interval
+        finally:
+            with self._lock:
+                if self._flights.get(name) is flight:
+                    del self._flights[name]
+            flight.done.set()
+
+    def _fetch(self, name, generation):
+        response = self.client.access_secret_version(request={"name": name})
+        value = self._parse(response.payload.data)
+        expires_at = None if is_pinned(name) else self._clock() + self.ttl
+        with self._lock:
+            self._stats["fetches"] += 1
+            # Invalidated while fetching: the value may predate the invalidation
+            if generation == self._generation:
+                self._entries[name] = _Entry(value, response.name, expires_at)
+        return value
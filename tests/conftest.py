@@ -0,0 +1,49 @@
+"""Shared pytest configuration and fixtures."""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Experiments import each other as top-level modules (see storage_example.py)
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+
+class FakeClock:
+    """Monotonic clock stand-in; tests move time by setting now."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def project(monkeypatch):
+    """Point the shared settings at a fixed test project (needs python-dotenv)."""
+    import config
+
+    monkeypatch.setenv("GOOGLE_CLOUD_PROJECT", "test-project")
+    # Settings are memoized; pick up the patched environment
+    config.reset_settings()
+    yield "test-project"
+    config.reset_settings()
+
+
+@pytest.fixture
+def wait_for():
+    """Poll a predicate for up to ~2 seconds (for background threads)."""
+    def wait(predicate):
+        for _ in range(200):
+            if predicate():
+                return
+            time.sleep(0.01)
+        raise AssertionError("condition not reached")
+    return wait
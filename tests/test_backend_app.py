@@ -0,0 +1,82 @@
+"""Tests for the hello-app-engine backend: ETags, 304s, gzip and /data/batch."""
+
+import gzip
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("flask")
+
+_path = Path(__file__).parent.parent / "hello-app-engine" / "backend" / "main.py"
+_spec = importlib.util.spec_from_file_location("hello_app_engine_backend", _path)
+backend = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(backend)
+
+
+@pytest.fixture
+def client():
+    return backend.app.test_client()
+
+
+def test_data_has_etag_and_cache_control(client):
+    response = client.get("/data")
+
+    assert response.status_code == 200
+    assert response.get_json()["message"] == "Hello from the Secure Backend API!"
+    assert response.headers["ETag"] == f'"{backend.DATA_RESPONSE.etag}"'
+    assert response.headers["Cache-Control"].startswith("public, max-age=")
+
+
+def test_matching_etag_returns_304(client):
+    etag = client.get("/data").headers["ETag"]
+    response = client.get("/data", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.data == b""
+
+
+def test_large_bodies_are_gzipped_when_accepted(client):
+    ids = ",".join(str(n) for n in range(1, 51))
+    plain = client.get(f"/data/batch?ids={ids}")
+    compressed = client.get(f"/data/batch?ids={ids}", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in plain.headers
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert len(compressed.data) < len(plain.data)
+    assert json.loads(gzip.decompress(compressed.data)) == plain.get_json()
+    assert compressed.headers["ETag"] != plain.headers["ETag"]
+
+    # Either representation's ETag revalidates
+    response = client.get(f"/data/batch?ids={ids}",
+                          headers={"If-None-Match": plain.headers["ETag"]})
+    assert response.status_code == 304
+
+
+def test_batch_returns_items_in_order_and_missing_ids(client):
+    response = client.get("/data/batch?ids=3,1,9999")
+
+    assert [item["id"] for item in response.get_json()["items"]] == ["3", "1"]
+    assert response.get_json()["missing"] == ["9999"]
+    assert response.get_json()["items"][0] == client.get("/data/items/3").get_json()
+
+
+def test_batch_validates_ids(client):
+    assert client.get("/data/batch").status_code == 400
+    too_many = ",".join(str(n) for n in range(backend.MAX_BATCH_ITEMS + 1))
+    assert client.get(f"/data/batch?ids={too_many}").status_code == 400
+    assert client.get("/data/items/9999").status_code == 404
+
+
+def test_delay_injection_is_off_unless_enabled(client, monkeypatch):
+    slept = []
+    monkeypatch.setattr(backend.time, "sleep", slept.append)
+
+    client.get("/data?delay_ms=200")
+    assert slept == []
+
+    monkeypatch.setattr(backend, "ALLOW_DELAY_INJECTION", True)
+    client.get("/data?delay_ms=200")
+    assert slept == [0.2]
+    assert client.get("/data?delay_ms=soon").status_code == 400
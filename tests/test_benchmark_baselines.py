@@ -0,0 +1,61 @@
+"""Tests for the benchmark suite's baseline regression check."""
+
+from benchmarks.run import compare, flatten
+
+BASELINE = {
+    "storage": {
+        "upload_small": {"count": 50, "p50_ms": 10.0, "p99_ms": 20.0, "max_ms": 40.0,
+                         "mb_per_s": 100.0},
+    },
+    "pubsub_publish": {"publish_bulk": {"messages_per_sec": 5000.0, "failed": 0}},
+}
+
+
+def test_flatten_keeps_only_comparable_metrics():
+    assert flatten(BASELINE) == {
+        "storage.upload_small.p50_ms": 10.0,
+        "storage.upload_small.p99_ms": 20.0,
+        "storage.upload_small.mb_per_s": 100.0,
+        "pubsub_publish.publish_bulk.messages_per_sec": 5000.0,
+    }
+
+
+def test_changes_within_threshold_pass():
+    current = {
+        "storage": {"upload_small": {"p50_ms": 11.5, "p99_ms": 15.0, "mb_per_s": 85.0}},
+        "pubsub_publish": {"publish_bulk": {"messages_per_sec": 9000.0}},
+    }
+
+    assert compare(BASELINE, current, threshold=0.2) == []
+
+
+def test_slower_latency_and_lower_rate_regress_worst_first():
+    current = {
+        "storage": {"upload_small": {"p50_ms": 13.0, "p99_ms": 20.0, "mb_per_s": 50.0,
+                                     "max_ms": 400.0}},
+        "pubsub_publish": {"publish_bulk": {"messages_per_sec": 5000.0}},
+    }
+
+    regressions = compare(BASELINE, current, threshold=0.2)
+
+    assert [item["metric"] for item in regressions] == [
+        "storage.upload_small.mb_per_s", "storage.upload_small.p50_ms",
+    ]
+    assert regressions[0]["change"] == 0.5
+
+
+def test_cases_missing_on_either_side_are_ignored():
+    assert compare(BASELINE, {"firestore_crud": {"add_document": {"p50_ms": 1.0}}}) == []
+    assert compare({}, BASELINE) == []
+
+
+def test_metrics_missing_from_a_case_that_ran_regress_first():
+    current = {
+        "storage": {"upload_small": {"p50_ms": 10.0, "mb_per_s": 10.0}},
+    }
+
+    regressions = compare(BASELINE, current, threshold=0.2)
+
+    assert regressions[0] == {"metric": "storage.upload_small.p99_ms", "baseline": 20.0,
+                              "current": None, "change": None}
+    assert [item["metric"] for item in regressions[1:]] == ["storage.upload_small.mb_per_s"]
@@ -0,0 +1,51 @@
+"""Tests for the LRU/TTL cache."""
+
+import pytest
+
+from cache import TTLCache
+
+
+def test_hit_and_miss_counters():
+    cache = TTLCache(max_entries=2)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = TTLCache(default_ttl=10, clock=clock)
+    cache.set("short", 1, ttl=1)
+    cache.set("default", 2)
+
+    clock.now = 5
+    assert cache.get("short") is None
+    assert cache.get("default") == 2
+
+    clock.now = 10
+    assert cache.get("default") is None
+    assert cache.stats()["expirations"] == 2
+
+
+def test_invalidate_and_validation():
+    cache = TTLCache()
+    cache.set("a", 1)
+    cache.invalidate("a")
+
+    assert len(cache) == 0
+    with pytest.raises(ValueError):
+        TTLCache(max_entries=0)
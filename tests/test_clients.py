@@ -0,0 +1,76 @@
+"""Tests for the shared client registry."""
+
+import threading
+
+import pytest
+
+import clients
+
+
+class FakeClient:
+    def __init__(self, project, credentials, **options):
+        self.project = project
+        self.credentials = credentials
+        self.options = options
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def fake_service():
+    clients.register_factory("fake", FakeClient)
+    yield
+    clients.reset_clients()
+
+
+def test_client_is_created_once_per_key():
+    first = clients.get_client("fake", project="p1")
+
+    assert clients.get_client("fake", project="p1") is first
+    assert clients.get_client("fake", project="p2") is not first
+    assert clients.get_client("fake", project="p1", timeout=5) is not first
+
+
+def test_concurrent_first_use_builds_a_single_client():
+    created = []
+
+    def factory(project, credentials, **options):
+        created.append(project)
+        return FakeClient(project, credentials)
+
+    clients.register_factory("slow", factory)
+    threads = [threading.Thread(target=clients.get_client, args=("slow",)) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert created == [None]
+
+
+def test_close_clients_closes_and_forgets():
+    client = clients.get_client("fake")
+
+    clients.close_clients()
+
+    assert client.closed
+    assert clients.get_client("fake") is not client
+
+
+def test_refreshed_credentials_replace_the_client_for_their_key():
+    old, new = object(), object()
+    first = clients.get_client("fake", credentials=old, credentials_key="sa@example.com")
+
+    assert clients.get_client("fake", credentials=old, credentials_key="sa@example.com") is first
+    second = clients.get_client("fake", credentials=new, credentials_key="sa@example.com")
+    assert second is not first
+    assert second.credentials is new
+    assert clients.get_client("fake", credentials=new, credentials_key="sa@example.com") is second
+    assert len([key for key in clients._clients if key[0] == "fake"]) == 1
+
+
+def test_unknown_service_raises():
+    with pytest.raises(ValueError):
+        clients.get_client("does-not-exist")
@@ -0,0 +1,167 @@
+"""Tests for the copy_file event deduplication stores."""
+
+import importlib.util
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+_path = Path(__file__).parent.parent / "experiments" / "cloud_functions_copy" / "dedup.py"
+_spec = importlib.util.spec_from_file_location("cloud_functions_dedup", _path)
+dedup = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(dedup)
+
+
+def test_lru_store_claims_each_key_once_and_forgets_oldest():
+    store = dedup.LRUDedupStore(max_entries=2)
+
+    assert store.claim("a")
+    assert not store.claim("a")
+    assert store.claim("b")
+    assert store.claim("c")
+    assert store.claim("a")  # evicted, so it can be claimed again
+
+
+def test_release_allows_a_retry():
+    store = dedup.LRUDedupStore()
+    store.claim("a")
+    store.release("a")
+
+    assert store.claim("a")
+
+
+def test_layered_store_consults_shared_store_after_local():
+    shared = dedup.LRUDedupStore()
+    shared.claim("seen-elsewhere")
+    store = dedup.LayeredDedupStore(dedup.LRUDedupStore(), shared)
+
+    assert not store.claim("seen-elsewhere")
+    assert store.claim("new")
+    assert not shared.claim("new")
+
+
+class FakeEvent(dict):
+    def __init__(self, data, **attributes):
+        super().__init__(attributes)
+        self.data = data
+
+
+def test_event_key_and_stats():
+    event = FakeEvent({"generation": "42"}, id="id-1")
+    stats = dedup.DedupStats()
+    stats.record(duplicate=False)
+    stats.record(duplicate=True)
+
+    assert dedup.event_key(event) == "id-1:42"
+    assert stats.as_fields() == {"dedup_duplicates": 1, "dedup_processed": 1,
+                                 "dedup_hit_rate": pytest.approx(0.5)}
+
+
+class FailingStore(dedup.DedupStore):
+    def claim(self, key):
+        raise ConnectionError("shared store unavailable")
+
+    def complete(self, key):
+        pass
+
+    def release(self, key):
+        pass
+
+
+def test_layered_store_releases_local_claim_when_shared_claim_fails():
+    local = dedup.LRUDedupStore()
+    store = dedup.LayeredDedupStore(local, FailingStore())
+
+    with pytest.raises(ConnectionError):
+        store.claim("a")
+
+    assert local.claim("a")
+
+
+def test_dedup_store_is_abstract():
+    with pytest.raises(TypeError):
+        dedup.DedupStore()
+
+
+def test_claim_of_a_crashed_invocation_expires(clock):
+    store = dedup.LRUDedupStore(lease_seconds=60, clock=clock)
+    assert store.claim("a")
+    # The invocation dies mid-copy: neither complete() nor release() runs
+
+    clock.now = 59
+    assert not store.claim("a")  # still leased; may be a live invocation
+    clock.now = 61
+    assert store.claim("a")  # the platform's retry takes over
+
+
+def test_completed_claim_never_expires(clock):
+    store = dedup.LRUDedupStore(lease_seconds=60, clock=clock)
+    store.claim("a")
+    store.complete("a")
+
+    clock.now = 10_000
+    assert not store.claim("a")
+
+
+class FakeMarker:
+    def __init__(self, bucket, name):
+        self.bucket = bucket
+        self.name = name
+        self.metadata = None
+        self.generation = None
+        self.updated = None
+
+    def upload_from_string(self, data, if_generation_match=None):
+        from google.api_core import exceptions
+
+        current = self.bucket.markers.get(self.name)
+        if if_generation_match is not None and (current.generation if current else 0) != if_generation_match:
+            raise exceptions.PreconditionFailed("generation mismatch")
+        self.bucket.generation += 1
+        self.generation = self.bucket.generation
+        self.updated = datetime.fromtimestamp(self.bucket.clock(), timezone.utc)
+        self.bucket.markers[self.name] = self
+
+    def delete(self):
+        self.bucket.markers.pop(self.name)
+
+
+class FakeBucket:
+    def __init__(self, clock):
+        self.clock = clock
+        self.markers = {}
+        self.generation = 0
+
+    def blob(self, name):
+        return FakeMarker(self, name)
+
+    def get_blob(self, name):
+        return self.markers.get(name)
+
+
+def test_gcs_store_lets_a_retry_take_over_an_expired_marker(clock):
+    pytest.importorskip("google.api_core")
+    bucket = FakeBucket(clock)
+    instance_a = dedup.GCSDedupStore(bucket, lease_seconds=60, clock=clock)
+    instance_b = dedup.GCSDedupStore(bucket, lease_seconds=60, clock=clock)
+
+    assert instance_a.claim("a")  # instance A crashes mid-copy
+    assert not instance_b.claim("a")
+    clock.now = 61
+    assert instance_b.claim("a")
+    assert not instance_a.claim("a")  # B holds a fresh lease
+
+    instance_b.complete("a")
+    clock.now = 10_000
+    assert not instance_a.claim("a")
+
+
+def test_gcs_store_expires_markers_written_without_a_lease(clock):
+    pytest.importorskip("google.api_core")
+    bucket = FakeBucket(clock)
+    bucket.blob("dedup/a").upload_from_string(b"")
+    store = dedup.GCSDedupStore(bucket, lease_seconds=60, clock=clock)
+
+    assert not store.claim("a")
+    clock.now = 61
+    assert store.claim("a")
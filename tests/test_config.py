@@ -0,0 +1,138 @@
+"""Tests for the memoized Settings object in config.py."""
+
+import dataclasses
+import os
+
+import pytest
+
+pytest.importorskip("dotenv")
+
+import config  # noqa: E402
+
+
+@pytest.fixture
+def env_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "CHECK_INTERVAL", 0)
+    monkeypatch.delenv("ENV", raising=False)
+    for name in ("GOOGLE_CLOUD_PROJECT", "PUBSUB_TOPIC", "GCS_BUCKET_NAME"):
+        monkeypatch.delenv(name, raising=False)
+    config.reset_settings()
+    yield tmp_path
+    for name in list(config._applied):
+        os.environ.pop(name, None)
+    config._applied.clear()
+    config._original.clear()
+    config.reset_settings()
+
+
+def bump_mtime(path):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_settings_are_parsed_once_and_immutable(env_dir):
+    (env_dir / ".env").write_text("GOOGLE_CLOUD_PROJECT=base-project\nPUBSUB_TOPIC=orders\n")
+
+    settings = config.get_settings(root=env_dir)
+
+    assert settings.project_id == "base-project"
+    assert settings.pubsub_topic == "orders"
+    assert settings.env == "development"
+    assert config.get_settings(root=env_dir) is settings
+    assert os.environ["GOOGLE_CLOUD_PROJECT"] == "base-project"
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        settings.project_id = "other"
+
+
+def test_environment_files_override_in_order(env_dir, monkeypatch):
+    monkeypatch.setenv("GCS_BUCKET_NAME", "from-process")
+    (env_dir / ".env").write_text("GOOGLE_CLOUD_PROJECT=base\nGCS_BUCKET_NAME=from-dotenv\n")
+    (env_dir / ".env.staging").write_text("GOOGLE_CLOUD_PROJECT=staging\n")
+    (env_dir / ".env.local").write_text("PUBSUB_TOPIC=local-topic\n")
+
+    settings = config.get_settings("staging", root=env_dir)
+
+    assert settings.project_id == "staging"
+    assert settings.pubsub_topic == "local-topic"
+    # .env never overrides the process environment
+    assert settings.gcs_bucket == "from-process"
+    assert len(settings.sources) == 3
+
+
+def test_reloads_only_when_a_source_file_changes(env_dir, monkeypatch):
+    env_file = env_dir / ".env"
+    env_file.write_text("GOOGLE_CLOUD_PROJECT=one\n")
+    settings = config.get_settings(root=env_dir)
+
+    loads = []
+    original = config._load
+    monkeypatch.setattr(config, "_load", lambda *args: loads.append(args) or original(*args))
+    assert config.get_settings(root=env_dir) is settings
+    assert loads == []
+
+    env_file.write_text("GOOGLE_CLOUD_PROJECT=two\n")
+    bump_mtime(env_file)
+    assert config.get_settings(root=env_dir).project_id == "two"
+
+    # A newly created override file counts as a change too
+    (env_dir / ".env.local").write_text("GOOGLE_CLOUD_PROJECT=three\n")
+    assert config.get_settings(root=env_dir).project_id == "three"
+    assert len(loads) == 2
+
+
+def test_reload_drops_keys_removed_from_the_files(env_dir, monkeypatch):
+    monkeypatch.setenv("FIRESTORE_COLLECTION", "from-process")
+    env_file = env_dir / ".env"
+    env_file.write_text("GOOGLE_CLOUD_PROJECT=one\nPUBSUB_TOPIC=orders\n")
+    (env_dir / ".env.local").write_text(
+        "GCS_BUCKET_NAME=local-bucket\nFIRESTORE_COLLECTION=local-collection\n")
+    settings = config.get_settings(root=env_dir)
+    assert settings.pubsub_topic == "orders"
+    assert settings.gcs_bucket == "local-bucket"
+    assert settings.firestore_collection == "local-collection"
+
+    env_file.write_text("GOOGLE_CLOUD_PROJECT=one\n")
+    bump_mtime(env_file)
+    (env_dir / ".env.local").unlink()
+    settings = config.get_settings(root=env_dir)
+
+    assert settings.pubsub_topic is None
+    assert settings.gcs_bucket is None
+    assert "PUBSUB_TOPIC" not in os.environ
+    assert "GCS_BUCKET_NAME" not in os.environ
+    # The value .env.local had overridden comes back
+    assert settings.firestore_collection == "from-process"
+    assert os.environ["FIRESTORE_COLLECTION"] == "from-process"
+    assert settings.project_id == "one"
+
+
+def test_process_value_wins_again_when_only_dotenv_still_sets_it(env_dir, monkeypatch):
+    monkeypatch.setenv("PUBSUB_TOPIC", "from-process")
+    (env_dir / ".env").write_text("PUBSUB_TOPIC=from-dotenv\n")
+    local_file = env_dir / ".env.local"
+    local_file.write_text("PUBSUB_TOPIC=from-local\n")
+    assert config.get_settings(root=env_dir).pubsub_topic == "from-local"
+
+    local_file.unlink()
+
+    assert config.get_settings(root=env_dir).pubsub_topic == "from-process"
+
+
+def test_mtime_is_not_checked_within_interval(env_dir, monkeypatch):
+    (env_dir / ".env").write_text("GOOGLE_CLOUD_PROJECT=one\n")
+    settings = config.get_settings(root=env_dir)
+    monkeypatch.setattr(config, "CHECK_INTERVAL", 3600)
+    monkeypatch.setattr(config, "_file_signature", lambda paths: pytest.fail("stat called"))
+
+    assert config.get_settings(root=env_dir) is settings
+
+
+def test_get_config_keeps_its_keys(env_dir, monkeypatch):
+    monkeypatch.setattr(config, "PROJECT_ROOT", env_dir)
+    (env_dir / ".env").write_text("GOOGLE_CLOUD_PROJECT=p\n")
+
+    assert config.get_config()["project_id"] == "p"
+    assert set(config.get_config()) == {
+        "project_id", "gcs_bucket", "firestore_collection", "pubsub_topic",
+        "pubsub_subscription", "bigquery_dataset", "bigquery_table",
+    }
@@ -0,0 +1,68 @@
+"""Tests for firestore_example's WriteBatch ingestion path, using a fake client."""
+
+import pytest
+
+pytest.importorskip("google.cloud.firestore")
+pytest.importorskip("dotenv")
+
+
+class FakeReference:
+    def __init__(self, document_id):
+        self.id = document_id
+        self.path = f"items/{document_id}"
+
+
+class FakeCollection:
+    def document(self, document_id=None):
+        return FakeReference(document_id or "auto")
+
+
+class FakeBatch:
+    def __init__(self, db):
+        self.db = db
+
+    def set(self, reference, data):
+        pass
+
+    def commit(self):
+        self.db.commits += 1
+        if self.db.commits <= self.db.failures:
+            raise RuntimeError("unavailable")
+
+
+class FakeDB:
+    def __init__(self, failures):
+        self.failures = failures
+        self.commits = 0
+
+    def batch(self):
+        return FakeBatch(self)
+
+
+def test_failed_batches_back_off_between_attempts(monkeypatch):
+    from experiments import firestore_example
+
+    sleeps = []
+    monkeypatch.setattr(firestore_example.time, "sleep", sleeps.append)
+    db = FakeDB(failures=2)
+
+    written, failures = firestore_example._batch_write(
+        db, FakeCollection(), [{"id": "a", "n": 1}], "id", max_retries=3)
+
+    assert (written, failures) == (1, [])
+    assert db.commits == 3
+    assert sleeps == [0.2, 0.4]
+
+
+def test_batch_failure_is_reported_after_the_last_attempt(monkeypatch):
+    from experiments import firestore_example
+
+    sleeps = []
+    monkeypatch.setattr(firestore_example.time, "sleep", sleeps.append)
+
+    written, failures = firestore_example._batch_write(
+        FakeDB(failures=5), FakeCollection(), [{"id": "a"}], "id", max_retries=2)
+
+    assert written == 0
+    assert failures == [{"document_id": "a", "error": "unavailable"}]
+    assert len(sleeps) == 1
@@ -0,0 +1,147 @@
+"""Tests for firestore_example against the Firestore emulator.
+
+    gcloud emulators firestore start --host-port=localhost:8080
+    export FIRESTORE_EMULATOR_HOST=localhost:8080
+"""
+
+import json
+import os
+import uuid
+
+import pytest
+
+pytest.importorskip("google.cloud.firestore")
+pytest.importorskip("dotenv")
+
+pytestmark = [
+    pytest.mark.skipif(
+        not os.getenv("FIRESTORE_EMULATOR_HOST"), reason="FIRESTORE_EMULATOR_HOST not set"
+    ),
+    pytest.mark.usefixtures("project"),
+]
+
+
+@pytest.fixture
+def collection():
+    return f"test-{uuid.uuid4().hex[:8]}"
+
+
+@pytest.mark.parametrize("mode", ["bulk_writer", "batch"])
+def test_bulk_add_documents(collection, mode):
+    from experiments import firestore_example
+
+    documents = ({"id": f"doc-{n:04d}", "n": n} for n in range(1203))
+
+    result = firestore_example.bulk_add_documents(collection, documents, id_field="id",
+                                                  mode=mode, max_pending=400)
+
+    assert result["written"] == 1203
+    assert result["failed"] == 0
+    assert firestore_example.get_document(collection, "doc-1202") == {"n": 1202}
+
+
+def test_bulk_add_from_jsonl(collection, tmp_path):
+    from experiments import firestore_example
+
+    path = tmp_path / "docs.jsonl"
+    path.write_text("\n".join(json.dumps({"n": n}) for n in range(10)) + "\n")
+
+    result = firestore_example.bulk_add_documents(
+        collection, firestore_example.iter_jsonl_documents(str(path))
+    )
+
+    assert result["written"] == 10
+
+
+def test_iter_documents_pages_filters_and_resumes(collection):
+    from experiments import firestore_example
+
+    documents = ({"id": f"doc-{n:03d}", "n": n, "even": n % 2 == 0, "blob": "x" * 10}
+                 for n in range(25))
+    firestore_example.bulk_add_documents(collection, documents, id_field="id")
+
+    scanned = list(firestore_example.iter_documents(collection, page_size=4))
+    assert [doc_id for doc_id, _ in scanned] == [f"doc-{n:03d}" for n in range(25)]
+
+    projected = list(firestore_example.iter_documents(
+        collection, page_size=4, fields=["n"], filters=[("even", "==", True)]
+    ))
+    assert [data for _, data in projected] == [{"n": n} for n in range(0, 25, 2)]
+
+    resumed = list(firestore_example.iter_documents(collection, page_size=4,
+                                                    start_after="doc-019"))
+    assert [doc_id for doc_id, _ in resumed] == [f"doc-{n:03d}" for n in range(20, 25)]
+
+
+def test_export_documents_resumes_from_checkpoint(collection, tmp_path):
+    from experiments import firestore_example
+
+    documents = ({"id": f"doc-{n:03d}", "n": n} for n in range(10))
+    firestore_example.bulk_add_documents(collection, documents, id_field="id")
+    output = tmp_path / "export.jsonl"
+
+    # Simulate an export checkpointed after six documents that crashed mid-page
+    exported_lines = "".join(
+        json.dumps({"id": f"doc-{n:03d}", "data": {"n": n}}) + "\n" for n in range(6)
+    )
+    output.write_text(exported_lines + '{"id": "doc-006", "da')
+    (tmp_path / "export.jsonl.cursor").write_text(
+        json.dumps({"cursor": "doc-005", "offset": len(exported_lines)})
+    )
+
+    exported = firestore_example.export_documents(collection, str(output), page_size=3)
+
+    assert exported == 4
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [line["data"]["n"] for line in lines] == list(range(10))
+    assert not (tmp_path / "export.jsonl.cursor").exists()
+
+
+def test_document_cache_serves_hits_and_invalidates_on_write(collection):
+    from experiments import firestore_example
+
+    doc_id = firestore_example.add_document(collection, {"status": "active"})
+    firestore_example.enable_document_cache(max_entries=10, collection_ttls={collection: 60})
+    try:
+        firestore_example.get_document(collection, doc_id)
+        firestore_example.get_document(collection, doc_id)
+        assert firestore_example.get_cache_stats()["hits"] == 1
+
+        firestore_example.update_document(collection, doc_id, {"status": "done"})
+        assert firestore_example.get_document(collection, doc_id) == {"status": "done"}
+
+        firestore_example.delete_document(collection, doc_id)
+        assert firestore_example.get_document(collection, doc_id) is None
+    finally:
+        firestore_example.disable_document_cache()
+
+
+def test_batch_mode_commits_even_without_retries(collection):
+    from experiments import firestore_example
+
+    result = firestore_example.bulk_add_documents(
+        collection, [{"id": "only", "n": 1}], id_field="id", mode="batch", max_retries=0
+    )
+
+    assert result["written"] == 1
+    assert firestore_example.get_document(collection, "only", use_cache=False) == {"n": 1}
+
+
+@pytest.mark.parametrize("mode", ["bulk_writer", "batch"])
+def test_bulk_write_invalidates_reads_made_before_commit(collection, mode):
+    from experiments import firestore_example
+
+    firestore_example.bulk_add_documents(collection, [{"id": "doc", "n": 1}], id_field="id")
+    firestore_example.enable_document_cache(max_entries=10)
+    try:
+        def documents():
+            yield {"id": "doc", "n": 2}
+            # Queued but not yet committed: this read re-caches the old value
+            assert firestore_example.get_document(collection, "doc") == {"n": 1}
+            yield {"id": "other", "n": 3}
+
+        firestore_example.bulk_add_documents(collection, documents(), id_field="id", mode=mode)
+
+        assert firestore_example.get_document(collection, "doc") == {"n": 2}
+    finally:
+        firestore_example.disable_document_cache()
@@ -0,0 +1,93 @@
+"""Tests for the App Engine frontend's concurrent fan-out aggregator."""
+
+import importlib.util
+import threading
+import time
+from pathlib import Path
+
+_path = Path(__file__).parent.parent / "hello-app-engine" / "frontend" / "aggregator.py"
+_spec = importlib.util.spec_from_file_location("frontend_aggregator", _path)
+aggregator = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(aggregator)
+
+
+def sleeper(seconds, value):
+    def fetch():
+        time.sleep(seconds)
+        return value
+    return fetch
+
+
+def test_dependencies_run_concurrently():
+    agg = aggregator.Aggregator(max_workers=4)
+    deps = [aggregator.Dependency(f"d{n}", sleeper(0.1, n), deadline=2) for n in range(4)]
+
+    start = time.perf_counter()
+    results = agg.gather(deps)
+    elapsed = time.perf_counter() - start
+    agg.shutdown()
+
+    assert [results[f"d{n}"].value for n in range(4)] == [0, 1, 2, 3]
+    assert all(result.ok for result in results.values())
+    assert elapsed < 0.35  # not 4 x 0.1 s stacked
+
+
+def test_slow_dependency_falls_back_at_its_deadline():
+    release = threading.Event()
+    agg = aggregator.Aggregator()
+    deps = [
+        aggregator.Dependency("fast", lambda: "ok", deadline=1),
+        aggregator.Dependency("slow", lambda: release.wait(5), deadline=0.05, fallback="fallback"),
+    ]
+
+    start = time.perf_counter()
+    results = agg.gather(deps)
+    elapsed = time.perf_counter() - start
+    release.set()
+    agg.shutdown()
+
+    assert results["fast"].value == "ok"
+    assert results["slow"].status == "timeout"
+    assert results["slow"].value == "fallback"
+    assert elapsed < 1
+
+
+def test_failing_dependency_uses_fallback_and_records_error():
+    def broken():
+        raise RuntimeError("boom")
+
+    agg = aggregator.Aggregator()
+    results = agg.gather([aggregator.Dependency("broken", broken, deadline=1, fallback={})])
+    agg.shutdown()
+
+    assert results["broken"].status == "error"
+    assert results["broken"].error == "boom"
+    assert results["broken"].value == {}
+
+
+def test_value_rejected_by_validate_uses_fallback():
+    agg = aggregator.Aggregator()
+    results = agg.gather([
+        aggregator.Dependency("listing", lambda: ["a", "b"], deadline=1, fallback={"items": []},
+                              validate=lambda value: isinstance(value, dict)),
+        aggregator.Dependency("data", lambda: {"message": "hi"}, deadline=1,
+                              validate=lambda value: isinstance(value, dict)),
+    ])
+    agg.shutdown()
+
+    assert results["listing"].status == "error"
+    assert results["listing"].error == "unexpected response: list"
+    assert results["listing"].value == {"items": []}
+    assert results["data"].value == {"message": "hi"}
+
+
+def test_stats_and_server_timing():
+    agg = aggregator.Aggregator()
+    for _ in range(3):
+        results = agg.gather([aggregator.Dependency("data", lambda: 1, deadline=1)])
+    agg.shutdown()
+
+    assert agg.stats()["data"]["ok"] == 3
+    assert agg.stats()["data"]["timeout"] == 0
+    header = aggregator.server_timing(results)
+    assert header.startswith("data;dur=") and header.endswith(';desc="ok"')
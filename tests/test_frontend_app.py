@@ -0,0 +1,54 @@
+"""Tests for the hello-app-engine frontend page rendering."""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("requests")
+
+FRONTEND_DIR = Path(__file__).parent.parent / "hello-app-engine" / "frontend"
+# main.py imports its sibling modules the way App Engine runs it
+sys.path.insert(0, str(FRONTEND_DIR))
+
+_spec = importlib.util.spec_from_file_location("hello_app_engine_frontend", FRONTEND_DIR / "main.py")
+frontend = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(frontend)
+
+
+def test_featured_response_without_items_still_renders(monkeypatch):
+    # e.g. FEATURED_PATH pointed at an endpoint with another shape
+    monkeypatch.setattr(frontend.backend, "get_json", lambda path: {"message": "hello"})
+
+    response = frontend.app.test_client().get("/")
+
+    assert response.status_code == 200
+    assert b"Featured items unavailable" in response.data
+    assert b"hello" in response.data
+
+
+@pytest.mark.parametrize("featured", [["a", "b"], "not json", {"items": "abc"}])
+def test_featured_response_of_another_type_still_renders(monkeypatch, featured):
+    monkeypatch.setattr(frontend.backend, "get_json", lambda path: (
+        featured if path == frontend.FEATURED_PATH else {"message": "hello"}))
+
+    response = frontend.app.test_client().get("/")
+
+    assert response.status_code == 200
+    assert b"Featured items unavailable" in response.data
+    assert b"featured (error)" in response.data
+
+
+def test_backend_values_are_escaped(monkeypatch):
+    monkeypatch.setattr(frontend.backend, "get_json", lambda path: (
+        {"items": [{"name": "<script>x</script>"}, "<b>raw</b>"]}
+        if path == frontend.FEATURED_PATH else {"message": "<img src=x onerror=alert(1)>"}))
+
+    response = frontend.app.test_client().get("/")
+
+    assert b"<script>" not in response.data
+    assert b"&lt;script&gt;x&lt;/script&gt;" in response.data
+    assert b"&lt;b&gt;raw&lt;/b&gt;" in response.data
+    assert b"&lt;img src=x onerror=alert(1)&gt;" in response.data
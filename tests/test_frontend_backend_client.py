@@ -0,0 +1,147 @@
+"""Tests for the App Engine frontend's cached backend client, using a stub session."""
+
+import importlib.util
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+_path = Path(__file__).parent.parent / "hello-app-engine" / "frontend" / "backend_client.py"
+_spec = importlib.util.spec_from_file_location("frontend_backend_client", _path)
+backend_client = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(backend_client)
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, body=None, etag=None):
+        self.status_code = status_code
+        self._body = body
+        self.headers = {"ETag": etag} if etag else {}
+
+    def json(self):
+        return self._body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FakeSession:
+    """Serves a body with an ETag and answers 304 when If-None-Match matches."""
+
+    def __init__(self, body=None, etag='"v1"'):
+        self.body = body if body is not None else {"message": "hello"}
+        self.etag = etag
+        self.calls = []
+        self.fail = False
+
+    def get(self, url, headers=None, timeout=None):
+        self.calls.append((url, dict(headers or {}), timeout))
+        if self.fail:
+            raise ConnectionError("backend down")
+        if (headers or {}).get("If-None-Match") == self.etag:
+            return FakeResponse(304)
+        return FakeResponse(200, self.body, self.etag)
+
+
+@pytest.fixture
+def make_client(clock):
+    def make(session, **kwargs):
+        return backend_client.BackendClient("http://backend/", session=session, clock=clock,
+                                            timeout=(1, 2), **kwargs)
+    return make
+
+
+def test_fresh_responses_are_served_from_cache(make_client, clock):
+    session = FakeSession()
+    client = make_client(session, ttl=30)
+
+    assert client.get_json("/data") == {"message": "hello"}
+    clock.now = 29
+    assert client.get_json("/data") == {"message": "hello"}
+
+    assert session.calls == [("http://backend/data", {}, (1, 2))]
+    assert client.cache_stats()["hits"] == 1
+    assert client.cache_stats()["misses"] == 1
+
+
+def test_stale_response_is_served_while_revalidating_with_etag(make_client, clock, wait_for):
+    session = FakeSession()
+    client = make_client(session, ttl=30, stale_ttl=60)
+    client.get_json("/data")
+
+    clock.now = 45
+    assert client.get_json("/data") == {"message": "hello"}
+    wait_for(lambda: client.cache_stats()["not_modified"] == 1)
+
+    assert session.calls[1][1] == {"If-None-Match": '"v1"'}
+    # The 304 renewed the entry
+    clock.now = 70
+    client.get_json("/data")
+    assert len(session.calls) == 2
+
+
+def test_expired_response_is_fetched_synchronously(make_client, clock):
+    session = FakeSession()
+    client = make_client(session, ttl=30, stale_ttl=60)
+    client.get_json("/data")
+
+    session.body, session.etag = {"message": "new"}, '"v2"'
+    clock.now = 100
+    assert client.get_json("/data") == {"message": "new"}
+    assert client.cache_stats()["misses"] == 2
+
+
+def test_last_good_value_is_served_when_backend_fails(make_client, clock):
+    session = FakeSession()
+    client = make_client(session, ttl=30, stale_ttl=0)
+    client.get_json("/data")
+
+    session.fail = True
+    clock.now = 100
+    assert client.get_json("/data") == {"message": "hello"}
+    assert client.cache_stats()["errors"] == 1
+
+
+def test_errors_without_cached_value_are_raised(make_client):
+    session = FakeSession()
+    session.fail = True
+    client = make_client(session)
+
+    with pytest.raises(ConnectionError):
+        client.get_json("/data")
+
+
+def test_ttl_zero_disables_caching(make_client):
+    session = FakeSession()
+    client = make_client(session, ttl=0)
+    client.get_json("/data")
+    client.get_json("/data")
+
+    assert len(session.calls) == 2
+    assert client.cache_stats()["entries"] == 0
+
+
+def test_concurrent_misses_make_one_backend_call(make_client):
+    release = threading.Event()
+
+    class SlowSession(FakeSession):
+        def get(self, url, headers=None, timeout=None):
+            release.wait(5)
+            return super().get(url, headers, timeout)
+
+    session = SlowSession()
+    client = make_client(session)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(client.get_json("/data")))
+               for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == [{"message": "hello"}] * 5
+    assert len(session.calls) == 1
@@ -0,0 +1,196 @@
+"""Tests for the logging sandbox's batched log shipper, using a stub sink."""
+
+import importlib.util
+import logging
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+_path = Path(__file__).parent.parent / "experiments" / "logging_sandbox" / "log_shipper.py"
+_spec = importlib.util.spec_from_file_location("log_shipper", _path)
+log_shipper = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(log_shipper)
+
+
+class StubSink:
+    def __init__(self, gate=None):
+        self.batches = []
+        self.gate = gate
+
+    def __call__(self, entries):
+        if self.gate is not None:
+            self.gate.wait()
+        self.batches.append(list(entries))
+
+
+def test_batches_by_count_and_flushes_on_close():
+    sink = StubSink()
+    shipper = log_shipper.BatchingLogShipper(sink, max_batch_entries=3, max_latency=60)
+    for i in range(7):
+        assert shipper.submit({"i": i}, severity="WARNING")
+    shipper.close()
+
+    assert [len(batch) for batch in sink.batches] == [3, 3, 1]
+    assert sink.batches[0][0] == ({"i": 0}, "WARNING")
+    assert shipper.metrics() == {
+        "queue_depth": 0, "shipped": 7, "dropped": 0, "failed": 0, "batches": 3,
+    }
+
+
+def test_batches_by_bytes():
+    sink = StubSink()
+    shipper = log_shipper.BatchingLogShipper(sink, max_batch_bytes=50, max_latency=60)
+    for _ in range(4):
+        shipper.submit({"msg": "x" * 30})
+    shipper.close()
+
+    assert [len(batch) for batch in sink.batches] == [2, 2]
+
+
+def test_ships_partial_batch_after_max_latency(wait_for):
+    sink = StubSink()
+    shipper = log_shipper.BatchingLogShipper(sink, max_latency=0.05)
+    shipper.submit({"msg": "hello"})
+
+    wait_for(lambda: sink.batches)
+    assert sink.batches == [[({"msg": "hello"}, "INFO")]]
+    shipper.close()
+
+
+def test_drop_policy_counts_dropped_entries():
+    gate = threading.Event()
+    sink = StubSink(gate)
+    shipper = log_shipper.BatchingLogShipper(sink, max_batch_entries=1, max_queue=2)
+
+    results = [shipper.submit({"i": i}) for i in range(10)]
+    metrics = shipper.metrics()
+    gate.set()
+    shipper.close()
+
+    # One entry is held by the blocked sink, two fit in the queue
+    assert results.count(True) <= 3
+    assert metrics["dropped"] == results.count(False) >= 7
+    assert shipper.metrics()["shipped"] == results.count(True)
+
+
+def test_block_policy_waits_for_room():
+    gate = threading.Event()
+    sink = StubSink(gate)
+    shipper = log_shipper.BatchingLogShipper(
+        sink, max_batch_entries=1, max_queue=1, overflow="block", block_timeout=0.05,
+    )
+    results = [shipper.submit({"i": i}) for i in range(4)]
+    assert False in results  # timed out while the sink was stuck
+
+    gate.set()
+    assert shipper.submit({"i": "late"})
+    shipper.close()
+    assert shipper.metrics()["dropped"] == results.count(False)
+
+
+def test_sink_errors_are_counted_and_do_not_stop_the_worker():
+    calls = []
+
+    def flaky_sink(entries):
+        calls.append(entries)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+
+    shipper = log_shipper.BatchingLogShipper(flaky_sink, max_batch_entries=2, max_latency=60)
+    for i in range(4):
+        shipper.submit({"i": i})
+    assert shipper.flush(timeout=5)
+    shipper.close()
+
+    assert shipper.metrics()["failed"] == 2
+    assert shipper.metrics()["shipped"] == 2
+
+
+def test_submit_after_close_is_dropped():
+    shipper = log_shipper.BatchingLogShipper(StubSink())
+    shipper.close()
+
+    assert not shipper.submit({"late": True})
+    assert shipper.metrics()["dropped"] == 1
+
+
+def test_rejects_unknown_overflow_policy():
+    with pytest.raises(ValueError):
+        log_shipper.BatchingLogShipper(StubSink(), overflow="spill")
+
+
+def test_handler_ships_records_with_json_fields():
+    sink = StubSink()
+    shipper = log_shipper.BatchingLogShipper(sink, max_latency=60)
+    logger = logging.getLogger("test_log_shipper")
+    logger.propagate = False
+    handler = log_shipper.ShipperHandler(shipper)
+    logger.addHandler(handler)
+    try:
+        logger.warning("Task %s done", 7, extra={"json_fields": {"task_id": "7"}})
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+    shipper.close()
+
+    assert sink.batches == [[(
+        {"message": "Task 7 done", "logger": "test_log_shipper", "task_id": "7"}, "WARNING",
+    )]]
+
+
+def test_flush_respects_its_timeout_when_the_queue_is_full(wait_for):
+    gate = threading.Event()
+    shipper = log_shipper.BatchingLogShipper(StubSink(gate), max_batch_entries=1, max_queue=1)
+    shipper.submit({"i": 0})  # held by the blocked sink
+    wait_for(lambda: shipper.metrics()["queue_depth"] == 0)
+    shipper.submit({"i": 1})  # fills the queue
+
+    assert not shipper.flush(timeout=0.05)
+    gate.set()
+    shipper.close()
+
+
+def test_close_respects_its_timeout_when_the_queue_is_full(wait_for):
+    gate = threading.Event()
+    shipper = log_shipper.BatchingLogShipper(StubSink(gate), max_batch_entries=1, max_queue=1)
+    shipper.submit({"i": 0})  # held by the blocked sink
+    wait_for(lambda: shipper.metrics()["queue_depth"] == 0)
+    shipper.submit({"i": 1})  # fills the queue
+
+    started = time.monotonic()
+    shipper.close(timeout=0.05)
+    assert time.monotonic() - started < 1
+    gate.set()
+
+
+def test_unserializable_entry_is_dropped_without_stopping_the_worker():
+    sink = StubSink()
+    shipper = log_shipper.BatchingLogShipper(sink, max_latency=60)
+    circular = {}
+    circular["self"] = circular
+
+    shipper.submit(circular)
+    shipper.submit({"i": 1})
+    shipper.close()
+
+    assert sink.batches == [[({"i": 1}, "INFO")]]
+    assert shipper.metrics()["dropped"] == 1
+    assert shipper.metrics()["shipped"] == 1
+
+
+def test_entry_racing_close_is_counted_as_dropped():
+    shipper = log_shipper.BatchingLogShipper(StubSink())
+    put_nowait = shipper._queue.put_nowait
+
+    def put_after_close(item):
+        # The entry passed the closed check, then close() won the race
+        shipper.close()
+        put_nowait(item)
+
+    shipper._queue.put_nowait = put_after_close
+
+    assert not shipper.submit({"late": True})
+    assert shipper.metrics()["dropped"] == 1
+    assert shipper.metrics()["queue_depth"] == 0
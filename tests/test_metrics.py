@@ -0,0 +1,26 @@
+"""Tests for the in-process latency statistics."""
+
+from metrics import LatencyRecorder, percentile
+
+
+def test_percentile_nearest_rank():
+    samples = list(range(1, 101))
+
+    assert percentile(samples, 50) == 50
+    assert percentile(samples, 99) == 99
+    assert percentile([], 50) == 0.0
+
+
+def test_latency_recorder_snapshot():
+    recorder = LatencyRecorder(window=3)
+    for seconds in (0.001, 0.002, 0.003, 0.004):
+        recorder.record(seconds)
+    recorder.record(0.005, ok=False)
+
+    snapshot = recorder.snapshot()
+
+    assert snapshot["succeeded"] == 4
+    assert snapshot["failed"] == 1
+    # Only the last three samples are kept for percentiles
+    assert snapshot["p50_ms"] == 4.0
+    assert snapshot["p99_ms"] == 5.0
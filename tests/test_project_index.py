@@ -0,0 +1,69 @@
+"""Tests for the offline project search index."""
+
+from project_index import ProjectIndex
+
+
+def record(project_id, name, update_time="t1", **labels):
+    return {"project_id": project_id, "display_name": name, "state": "ACTIVE",
+            "update_time": update_time, "labels": labels}
+
+
+def inventory():
+    return {
+        "billing-prod": record("billing-prod", "Billing Production", env="prod", team="pay"),
+        "billing-dev": record("billing-dev", "Billing Dev", env="dev", team="pay"),
+        "search-prod": record("search-prod", "Search Service", env="prod"),
+    }
+
+
+def test_prefix_matches_ids_names_and_words():
+    index = ProjectIndex(inventory())
+
+    assert index.prefix("billing") == ["billing-dev", "billing-prod"]
+    assert index.prefix("produc") == ["billing-prod"]
+    assert index.prefix("Search S") == ["search-prod"]
+    assert index.prefix("zzz") == []
+
+
+def test_substring_and_label_queries():
+    index = ProjectIndex(inventory())
+
+    assert index.substring("ng-pr") == ["billing-prod"]
+    assert index.substring("prod") == ["billing-prod", "search-prod"]
+    assert index.labels("env", "prod") == ["billing-prod", "search-prod"]
+    assert index.labels("team") == ["billing-dev", "billing-prod"]
+    assert index.search("env=dev") == ["billing-dev"]
+
+
+def test_search_lists_prefix_matches_before_substring_matches():
+    index = ProjectIndex(inventory())
+
+    assert index.search("prod") == ["billing-prod", "search-prod"]
+    assert index.search("dev") == ["billing-dev"]
+
+
+def test_update_reindexes_only_changes():
+    index = ProjectIndex(inventory())
+    records = inventory()
+    records["search-prod"] = record("search-prod", "Query Service", "t2", env="prod")
+    del records["billing-dev"]
+    records["new-app"] = record("new-app", "New App", env="dev")
+
+    assert index.update(records) == 3
+    assert index.update(records) == 0
+    assert index.prefix("search s") == []
+    assert index.prefix("query") == ["search-prod"]
+    assert index.labels("env", "dev") == ["new-app"]
+    assert index.substring("billing") == ["billing-prod"]
+
+
+def test_incremental_update_matches_full_rebuild():
+    records = {f"p-{n:04d}": record(f"p-{n:04d}", f"Project {n}") for n in range(100)}
+    index = ProjectIndex(records)
+
+    records["p-0001"] = record("p-0001", "Renamed One", "t2")
+    index.update(records)
+
+    rebuilt = ProjectIndex(records)
+    assert index._terms == rebuilt._terms
+    assert index.search("renamed") == ["p-0001"]
@@ -0,0 +1,94 @@
+"""Tests for projects.refresh_inventory's incremental refresh, using a fake client."""
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("google.cloud.resourcemanager_v3")
+pytest.importorskip("dotenv")
+
+import clients  # noqa: E402
+
+
+def fake_project(project_id, update_time, display_name=None):
+    return SimpleNamespace(
+        project_id=project_id,
+        display_name=display_name or project_id.title(),
+        name=f"projects/{project_id}",
+        state=SimpleNamespace(name="ACTIVE"),
+        parent="organizations/1",
+        create_time="2024-01-01",
+        update_time=update_time,
+        labels={},
+    )
+
+
+class FakeProjectsClient:
+    """Serves projects by ID; get_project raises for IDs listed in failing."""
+
+    def __init__(self, projects):
+        self.projects = {project.project_id: project for project in projects}
+        self.failing = set()
+        self.fetched = []
+        self._lock = threading.Lock()
+
+    def search_projects(self, request):
+        return list(self.projects.values())
+
+    def get_project(self, name):
+        project_id = name.split("/")[-1]
+        with self._lock:
+            self.fetched.append(project_id)
+        if project_id in self.failing:
+            raise ConnectionError("unavailable")
+        return self.projects[project_id]
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    client = FakeProjectsClient([fake_project("alpha", "t1"), fake_project("beta", "t1")])
+    monkeypatch.setitem(clients._factories, "projects", lambda project, credentials: client)
+    clients.reset_clients()
+    yield client
+    clients.reset_clients()
+
+
+def test_unchanged_projects_are_reused_and_changed_ones_refetched(fake_client, tmp_path):
+    import projects
+
+    path = tmp_path / "inventory.json"
+    projects.refresh_inventory(str(path))
+    assert sorted(fake_client.fetched) == ["alpha", "beta"]
+
+    fake_client.fetched.clear()
+    fake_client.projects["beta"] = fake_project("beta", "t2", display_name="Beta Renamed")
+    snapshot = projects.refresh_inventory(str(path))
+
+    assert fake_client.fetched == ["beta"]
+    assert snapshot["projects"]["alpha"]["update_time"] == "t1"
+    assert snapshot["projects"]["beta"]["display_name"] == "Beta Renamed"
+    assert projects.load_inventory(str(path)) == snapshot
+
+
+def test_failed_fetch_keeps_the_previous_record_without_aborting(fake_client, tmp_path):
+    import projects
+
+    path = tmp_path / "inventory.json"
+    before = projects.refresh_inventory(str(path))
+    fake_client.projects["alpha"] = fake_project("alpha", "t2", display_name="Alpha Renamed")
+    fake_client.projects["beta"] = fake_project("beta", "t2", display_name="Beta Renamed")
+    fake_client.projects["gamma"] = fake_project("gamma", "t1")
+    fake_client.failing = {"alpha", "gamma"}
+
+    snapshot = projects.refresh_inventory(str(path))
+
+    assert snapshot["projects"]["alpha"] == before["projects"]["alpha"]
+    assert snapshot["projects"]["beta"]["display_name"] == "Beta Renamed"
+    # A new project that failed is kept from the search result and refetched next time
+    assert snapshot["projects"]["gamma"]["update_time"] is None
+
+    fake_client.failing = set()
+    fake_client.fetched.clear()
+    projects.refresh_inventory(str(path))
+    assert sorted(fake_client.fetched) == ["alpha", "gamma"]
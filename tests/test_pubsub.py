@@ -0,0 +1,91 @@
+"""Tests for the interactive Pub/Sub admin module."""
+
+import importlib
+import sys
+
+import pytest
+
+pytest.importorskip("google.api_core")
+pytest.importorskip("dotenv")
+
+import clients  # noqa: E402
+import config  # noqa: E402
+
+
+def test_import_creates_no_clients(monkeypatch, capsys):
+    created = []
+    for service in ("publisher", "subscriber"):
+        monkeypatch.setitem(clients._factories, service,
+                            lambda project, credentials, service=service: created.append(service))
+    sys.modules.pop("pubsub", None)
+
+    importlib.import_module("pubsub")
+
+    assert created == []
+    assert capsys.readouterr().out == ""
+
+
+class _Resource:
+    def __init__(self, name, topic=None):
+        self.name = name
+        self.topic = topic
+
+
+class FakePublisher:
+    def __init__(self):
+        self.calls = 0
+
+    def list_topics(self, request):
+        self.calls += 1
+        return [_Resource("projects/p/topics/orders"), _Resource("projects/p/topics/events")]
+
+    def list_topic_subscriptions(self, request):
+        if request["topic"].endswith("/orders"):
+            return ["projects/p/subscriptions/orders-worker"]
+        return []
+
+
+class FakeSubscriber:
+    def list_subscriptions(self, request):
+        return [
+            _Resource("projects/p/subscriptions/orders-worker", "projects/p/topics/orders"),
+            _Resource("projects/p/subscriptions/stale", "_deleted-topic_"),
+            _Resource("projects/p/subscriptions/audit", "projects/other/topics/audit"),
+        ]
+
+
+@pytest.fixture
+def fake_pubsub(monkeypatch, tmp_path):
+    publisher, subscriber = FakePublisher(), FakeSubscriber()
+    monkeypatch.setitem(clients._factories, "publisher", lambda project, credentials: publisher)
+    monkeypatch.setitem(clients._factories, "subscriber", lambda project, credentials: subscriber)
+    monkeypatch.setenv("GOOGLE_CLOUD_PROJECT", "p")
+    config.reset_settings()
+    clients.reset_clients()
+    pubsub = importlib.import_module("pubsub")
+    monkeypatch.setattr(pubsub, "TOPOLOGY_CACHE_DIR", tmp_path)
+    yield pubsub, publisher
+    clients.reset_clients()
+    config.reset_settings()
+
+
+def test_build_topology_graph_and_cache(fake_pubsub):
+    pubsub, publisher = fake_pubsub
+
+    topology = pubsub.build_topology()
+
+    assert topology["topics"] == {"events": [], "orders": ["orders-worker"]}
+    assert topology["orphaned_subscriptions"] == ["stale"]
+
+    assert pubsub.build_topology()["topics"] == topology["topics"]
+    assert publisher.calls == 1
+    pubsub.build_topology(refresh=True)
+    assert publisher.calls == 2
+
+
+def test_with_retries_runs_at_least_once():
+    pubsub = importlib.import_module("pubsub")
+    calls = []
+
+    assert pubsub._with_retries(lambda: calls.append(1) or "done", max_retries=0) == "done"
+    assert calls == [1]
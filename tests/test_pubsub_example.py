@@ -0,0 +1,132 @@
+"""Tests for pubsub_example's bulk publisher and consumer pipeline, using fake clients."""
+
+from concurrent.futures import Future, TimeoutError
+
+import pytest
+
+pytest.importorskip("google.cloud.pubsub_v1")
+pytest.importorskip("dotenv")
+
+import clients  # noqa: E402
+
+
+def done_future(result=None, error=None):
+    future = Future()
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+    return future
+
+
+class FakePublisher:
+    """Fails every publish whose data starts with b"bad"."""
+
+    def __init__(self, **options):
+        self.options = options
+        self.published = []
+
+    def topic_path(self, project, topic):
+        return f"projects/{project}/topics/{topic}"
+
+    def publish(self, topic, data, **attributes):
+        self.published.append((topic, data, attributes))
+        if data.startswith(b"bad"):
+            return done_future(error=RuntimeError("publish failed"))
+        return done_future(str(len(self.published)))
+
+
+class FakeMessage:
+    def __init__(self, message_id, data):
+        self.message_id = message_id
+        self.data = data
+        self.attributes = {}
+        self.acked = self.nacked = False
+
+    def ack(self):
+        self.acked = True
+
+    def nack(self):
+        self.nacked = True
+
+
+class FakeStreamingPull:
+    def __init__(self):
+        self.cancelled = False
+
+    def result(self, timeout=None):
+        if not self.cancelled:
+            raise TimeoutError()
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class FakeSubscriber:
+    def __init__(self, messages):
+        self.messages = messages
+        self.subscribe_kwargs = None
+
+    def subscription_path(self, project, subscription):
+        return f"projects/{project}/subscriptions/{subscription}"
+
+    def subscribe(self, path, callback, **kwargs):
+        self.subscribe_kwargs = kwargs
+        for message in self.messages:
+            callback(message)
+        return FakeStreamingPull()
+
+
+@pytest.fixture
+def fake_clients(monkeypatch):
+    created = {}
+
+    def publisher(project, credentials, **options):
+        created["publisher"] = FakePublisher(**options)
+        return created["publisher"]
+
+    monkeypatch.setitem(clients._factories, "publisher", publisher)
+    monkeypatch.setitem(clients._factories, "subscriber",
+                        lambda project, credentials: created["subscriber"])
+    clients.reset_clients()
+    yield created
+    clients.reset_clients()
+
+
+def test_publish_bulk_counts_failures_and_uses_batch_settings(fake_clients):
+    from experiments import pubsub_example
+
+    messages = ["ok-1", {"data": "ok-2", "attributes": {"n": 2}}, "bad-3", b"ok-4"]
+
+    result = pubsub_example.publish_bulk("p", "orders", messages, max_messages=50,
+                                         max_outstanding_messages=100)
+
+    publisher = fake_clients["publisher"]
+    assert publisher.options["batch_settings"].max_messages == 50
+    assert publisher.options["publisher_options"].flow_control.message_limit == 100
+    assert publisher.published[1] == ("projects/p/topics/orders", b"ok-2", {"n": "2"})
+    assert result["published"] == 3
+    assert result["failed"] == 1
+    assert result["errors"] == [{"index": 2, "error": "publish failed"}]
+    assert result["messages_per_sec"] > 0
+
+
+def test_consume_messages_nacks_when_the_handler_raises(fake_clients):
+    from experiments import pubsub_example
+
+    messages = [FakeMessage(str(n), b"bad" if n == 1 else b"ok") for n in range(3)]
+    fake_clients["subscriber"] = subscriber = FakeSubscriber(messages)
+
+    def handler(message):
+        if message.data == b"bad":
+            raise ValueError("cannot process")
+
+    stats = pubsub_example.consume_messages("p", "orders-worker", handler, max_messages=5,
+                                            timeout=0.01, report_interval=60)
+
+    assert [m.acked for m in messages] == [True, False, True]
+    assert [m.nacked for m in messages] == [False, True, False]
+    assert stats["succeeded"] == 2
+    assert stats["failed"] == 1
+    assert subscriber.subscribe_kwargs["flow_control"].max_messages == 5
+    assert subscriber.subscribe_kwargs["await_callbacks_on_shutdown"] is True
@@ -0,0 +1,70 @@
+"""Tests for declarative Pub/Sub specs and plans."""
+
+import json
+
+import pytest
+
+import pubsub_spec
+
+SPEC = {
+    "topics": [
+        {"name": "orders", "subscriptions": ["orders-worker",
+                                             {"name": "orders-audit", "ack_deadline_seconds": 60}]},
+        {"name": "events"},
+    ]
+}
+
+
+def test_plan_creates_missing_resources_only():
+    spec = pubsub_spec.normalize_spec(SPEC)
+
+    plan = pubsub_spec.compute_plan(spec, ["orders"], {"orders-worker": "orders"})
+
+    assert plan == {
+        "delete_subscriptions": [],
+        "delete_topics": [],
+        "create_topics": ["events"],
+        "create_subscriptions": [
+            {"name": "orders-audit", "topic": "orders", "ack_deadline_seconds": 60}
+        ],
+    }
+
+
+def test_plan_recreates_subscriptions_on_the_wrong_topic():
+    spec = pubsub_spec.normalize_spec(SPEC)
+    current = {"orders-worker": pubsub_spec.DELETED_TOPIC, "orders-audit": "orders"}
+
+    plan = pubsub_spec.compute_plan(spec, ["orders", "events"], current)
+
+    assert plan["delete_subscriptions"] == ["orders-worker"]
+    assert plan["create_subscriptions"] == [{"name": "orders-worker", "topic": "orders"}]
+
+
+def test_prune_deletes_undeclared_resources():
+    spec = pubsub_spec.normalize_spec(dict(SPEC, prune=True))
+    current = {"orders-worker": "orders", "orders-audit": "orders", "legacy-sub": "legacy"}
+
+    plan = pubsub_spec.compute_plan(spec, ["orders", "events", "legacy"], current)
+
+    assert plan["delete_subscriptions"] == ["legacy-sub"]
+    assert plan["delete_topics"] == ["legacy"]
+    assert pubsub_spec.plan_size(plan) == 2
+    assert "- topic legacy" in pubsub_spec.format_plan(plan)
+
+
+def test_load_spec_reads_yaml_and_json(tmp_path):
+    pytest.importorskip("yaml")
+    yaml_path = tmp_path / "spec.yaml"
+    yaml_path.write_text("topics:\n  - name: orders\n    subscriptions: [orders-worker]\n")
+    json_path = tmp_path / "spec.json"
+    json_path.write_text(json.dumps(SPEC))
+
+    assert pubsub_spec.load_spec(yaml_path)["topics"] == {"orders": {"orders-worker": {}}}
+    assert pubsub_spec.load_spec(json_path)["topics"]["events"] == {}
+
+
+def test_duplicate_subscriptions_are_rejected():
+    with pytest.raises(ValueError):
+        pubsub_spec.normalize_spec({"topics": [
+            {"name": "a", "subscriptions": ["s"]}, {"name": "b", "subscriptions": ["s"]}
+        ]})
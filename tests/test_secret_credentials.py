@@ -0,0 +1,193 @@
+"""Tests for the cached Secret Manager credential provider, using a stub client."""
+
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from secret_credentials import CredentialProvider, is_pinned, secret_version_name
+
+
+class StubSecretManager:
+    """Serves {"version": n} payloads; "latest" resolves to the newest version."""
+
+    def __init__(self, latest=1, delay=0.0):
+        self.latest = latest
+        self.delay = delay
+        self.calls = []
+        self.fail = False
+        self.gate = None
+
+    def access_secret_version(self, request):
+        name = request["name"]
+        self.calls.append(name)
+        if self.delay:
+            time.sleep(self.delay)
+        if self.gate is not None:
+            self.gate.wait()
+        if self.fail:
+            raise RuntimeError("quota exceeded")
+        base, version = name.rsplit("/", 1)
+        number = self.latest if version == "latest" else int(version)
+        return SimpleNamespace(
+            name=f"{base}/{number}",
+            payload=SimpleNamespace(data=json.dumps({"version": number}).encode()),
+        )
+
+
+@pytest.fixture
+def make_provider(clock):
+    def make(client, **kwargs):
+        return CredentialProvider(client=client, parse=json.loads, clock=clock, **kwargs)
+    return make
+
+
+def test_secret_version_names():
+    assert secret_version_name("p", "s") == "projects/p/secrets/s/versions/latest"
+    assert is_pinned(secret_version_name("p", "s", "3"))
+    assert not is_pinned(secret_version_name("p", "s", "latest"))
+
+
+def test_parsed_value_is_cached_within_ttl(clock, make_provider):
+    client = StubSecretManager()
+    provider = make_provider(client, ttl=100, refresh_ahead=10)
+
+    assert provider.get("p", "key") == {"version": 1}
+    clock.now = 50
+    assert provider.get("p", "key") == {"version": 1}
+
+    assert len(client.calls) == 1
+    assert provider.resolved_version("p", "key") == "projects/p/secrets/key/versions/1"
+    assert provider.stats()["hits"] == 1
+
+
+def test_refresh_ahead_serves_cached_value_and_picks_up_rotation(clock, wait_for, make_provider):
+    client = StubSecretManager()
+    provider = make_provider(client, ttl=100, refresh_ahead=10)
+    provider.get("p", "key")
+
+    client.latest = 2
+    clock.now = 95
+    # Still served from cache while the background refresh runs
+    assert provider.get("p", "key") == {"version": 1}
+    wait_for(lambda: provider.stats()["fetches"] == 2)
+
+    assert provider.get("p", "key") == {"version": 2}
+    assert provider.stats()["refreshes"] == 1
+
+
+def test_expired_value_is_loaded_synchronously(clock, make_provider):
+    client = StubSecretManager()
+    provider = make_provider(client, ttl=100, refresh_ahead=10)
+    provider.get("p", "key")
+
+    client.latest = 2
+    clock.now = 150
+    assert provider.get("p", "key") == {"version": 2}
+    assert provider.stats()["misses"] == 2
+
+
+def test_pinned_versions_never_expire(clock, make_provider):
+    client = StubSecretManager(latest=5)
+    provider = make_provider(client, ttl=100, refresh_ahead=10)
+
+    assert provider.get("p", "key", "3") == {"version": 3}
+    clock.now = 10_000
+    assert provider.get("p", "key", "3") == {"version": 3}
+    assert client.calls == ["projects/p/secrets/key/versions/3"]
+
+
+def test_concurrent_loads_share_one_fetch(make_provider):
+    client = StubSecretManager(delay=0.1)
+    provider = make_provider(client)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(provider.get("p", "key")))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [{"version": 1}] * 8
+    assert len(client.calls) == 1
+
+
+def test_errors_are_raised_and_not_cached(make_provider):
+    client = StubSecretManager()
+    client.fail = True
+    provider = make_provider(client)
+
+    with pytest.raises(RuntimeError):
+        provider.get("p", "key")
+    client.fail = False
+    assert provider.get("p", "key") == {"version": 1}
+    assert provider.stats()["errors"] == 1
+
+
+def test_failed_background_refresh_keeps_serving_until_expiry(clock, wait_for, make_provider):
+    client = StubSecretManager()
+    provider = make_provider(client, ttl=100, refresh_ahead=10)
+    provider.get("p", "key")
+
+    client.fail = True
+    clock.now = 95
+    assert provider.get("p", "key") == {"version": 1}
+    wait_for(lambda: provider.stats()["errors"] == 1)
+    assert provider.get("p", "key") == {"version": 1}
+
+
+def test_failed_background_refresh_backs_off(clock, wait_for, make_provider):
+    client = StubSecretManager()
+    provider = make_provider(client, ttl=100, refresh_ahead=10, retry_interval=2)
+    provider.get("p", "key")
+
+    client.fail = True
+    clock.now = 95
+    provider.get("p", "key")
+    wait_for(lambda: provider.stats()["errors"] == 1)
+    for _ in range(5):
+        provider.get("p", "key")
+    assert len(client.calls) == 2
+
+    clock.now = 97
+    provider.get("p", "key")
+    wait_for(lambda: provider.stats()["errors"] == 2)
+    assert len(client.calls) == 3
+
+
+def test_invalidate_during_a_fetch_is_not_undone(wait_for, make_provider):
+    client = StubSecretManager()
+    client.gate = threading.Event()
+    provider = make_provider(client)
+    results = []
+    thread = threading.Thread(target=lambda: results.append(provider.get("p", "key")))
+    thread.start()
+    wait_for(lambda: client.calls)
+
+    provider.invalidate()
+    client.gate.set()
+    thread.join()
+
+    # The caller gets its value, but it isn't cached past the invalidation
+    assert results == [{"version": 1}]
+    assert provider.stats()["entries"] == 0
+    client.gate = None
+    provider.get("p", "key")
+    assert len(client.calls) == 2
+
+
+def test_invalidate_forces_a_reload(make_provider):
+    client = StubSecretManager()
+    provider = make_provider(client)
+    provider.get("p", "key")
+    provider.invalidate()
+    provider.get("p", "key")
+
+    assert len(client.calls) == 2
+
+
+def test_refresh_ahead_must_be_shorter_than_ttl():
+    with pytest.raises(ValueError):
+        CredentialProvider(client=StubSecretManager(), ttl=10, refresh_ahead=10)
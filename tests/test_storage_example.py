@@ -0,0 +1,148 @@
+"""Tests for storage_example against a local fake GCS server.
+
+Run with fake-gcs-server listening and STORAGE_EMULATOR_HOST exported, e.g.:
+    docker run -d -p 4443:4443 fsouza/fake-gcs-server -scheme http
+    export STORAGE_EMULATOR_HOST=http://localhost:4443
+"""
+
+import os
+import uuid
+
+import pytest
+
+pytest.importorskip("google.cloud.storage")
+pytest.importorskip("dotenv")
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv("STORAGE_EMULATOR_HOST"), reason="STORAGE_EMULATOR_HOST not set"
+)
+
+
+@pytest.fixture
+def bucket_name():
+    from google.cloud import storage
+
+    name = f"test-{uuid.uuid4().hex[:12]}"
+    storage.Client().create_bucket(name)
+    return name
+
+
+@pytest.fixture
+def large_file(tmp_path):
+    path = tmp_path / "payload.bin"
+    path.write_bytes(os.urandom(5 * 1024 * 1024 + 123))
+    return path
+
+
+def test_parallel_upload_round_trip(bucket_name, large_file, tmp_path):
+    from experiments import storage_example
+
+    result = storage_example.upload_blob_parallel(
+        bucket_name, str(large_file), "big.bin", chunk_size=1024 * 1024, max_workers=4
+    )
+
+    assert result["parts"] == 6
+    assert result["crc32c"] == storage_example.crc32c_file(str(large_file))
+
+    destination = tmp_path / "out.bin"
+    storage_example.download_blob(bucket_name, "big.bin", str(destination))
+    assert destination.read_bytes() == large_file.read_bytes()
+
+
+def test_parallel_upload_cleans_up_parts(bucket_name, large_file):
+    from google.cloud import storage
+
+    from experiments import storage_example
+
+    storage_example.upload_blob(
+        bucket_name, str(large_file), "big.bin", parallel=True, chunk_size=1024 * 1024
+    )
+
+    names = [blob.name for blob in storage.Client().list_blobs(bucket_name)]
+    assert names == ["big.bin"]
+
+
+def test_sliced_download_round_trip(bucket_name, large_file, tmp_path):
+    from experiments import storage_example
+
+    storage_example.upload_blob(bucket_name, str(large_file), "big.bin")
+    destination = tmp_path / "out.bin"
+
+    result = storage_example.download_blob(
+        bucket_name, "big.bin", str(destination), sliced=True,
+        slice_size=1024 * 1024, max_workers=4,
+    )
+
+    assert result["slices"] == 6
+    assert destination.read_bytes() == large_file.read_bytes()
+    assert not (tmp_path / "out.bin.slices.json").exists()
+
+
+def test_sliced_download_resumes_after_failure(bucket_name, large_file, tmp_path, monkeypatch):
+    from experiments import storage_example
+
+    storage_example.upload_blob(bucket_name, str(large_file), "big.bin")
+    destination = tmp_path / "out.bin"
+    real_download_slice = storage_example._download_slice
+
+    def flaky(blob, mapped, start, end):
+        if start == 2 * 1024 * 1024:
+            raise ConnectionError("simulated network failure")
+        real_download_slice(blob, mapped, start, end)
+
+    monkeypatch.setattr(storage_example, "_download_slice", flaky)
+    with pytest.raises(ConnectionError):
+        storage_example.download_blob_sliced(
+            bucket_name, "big.bin", str(destination), slice_size=1024 * 1024
+        )
+    assert (tmp_path / "out.bin.slices.json").exists()
+
+    monkeypatch.setattr(storage_example, "_download_slice", real_download_slice)
+    result = storage_example.download_blob_sliced(
+        bucket_name, "big.bin", str(destination), slice_size=1024 * 1024
+    )
+
+    assert result["resumed"] == 5
+    assert destination.read_bytes() == large_file.read_bytes()
+
+
+def test_sync_directory_only_transfers_changes(bucket_name, tmp_path):
+    from experiments import storage_example
+
+    local = tmp_path / "build"
+    (local / "nested").mkdir(parents=True)
+    (local / "a.txt").write_text("alpha")
+    (local / "nested" / "b.txt").write_text("beta")
+
+    first = storage_example.sync_directory(str(local), bucket_name, prefix="mirror")
+    assert first["transferred"] == ["a.txt", "nested/b.txt"]
+
+    second = storage_example.sync_directory(str(local), bucket_name, prefix="mirror")
+    assert second["transferred"] == []
+    assert second["skipped"] == 2
+
+    (local / "a.txt").write_text("alpha v2")
+    third = storage_example.sync_directory(str(local), bucket_name, prefix="mirror")
+    assert third["transferred"] == ["a.txt"]
+
+    copy = tmp_path / "copy"
+    pulled = storage_example.sync_directory(
+        str(copy), bucket_name, prefix="mirror", direction="download"
+    )
+    assert pulled["transferred"] == ["a.txt", "nested/b.txt"]
+    assert (copy / "nested" / "b.txt").read_text() == "beta"
+
+
+def test_sync_directory_uploads_user_tmp_files_unless_excluded(bucket_name, tmp_path):
+    from experiments import storage_example
+
+    local = tmp_path / "build"
+    local.mkdir()
+    (local / "a.txt").write_text("alpha")
+    (local / "scratch.tmp").write_text("mine")
+    (local / "cache.log").write_text("noise")
+
+    result = storage_example.sync_directory(str(local), bucket_name, prefix="mirror",
+                                            exclude=["*.log"])
+
+    assert result["transferred"] == ["a.txt", "scratch.tmp"]
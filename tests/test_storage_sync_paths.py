@@ -0,0 +1,32 @@
+"""Tests for sync_directory's local path checks (no GCS server needed)."""
+
+import pytest
+
+pytest.importorskip("google.cloud.storage")
+pytest.importorskip("google_crc32c")
+pytest.importorskip("dotenv")
+
+
+@pytest.mark.parametrize("name", ["a.txt", "nested/b.txt", "x/../y.txt"])
+def test_names_inside_the_directory_are_allowed(tmp_path, name):
+    from experiments import storage_example
+
+    assert storage_example._is_within(tmp_path, name)
+
+
+@pytest.mark.parametrize("name", ["../escape.txt", "a/../../escape.txt", "/etc/passwd", ".", ""])
+def test_names_escaping_the_directory_are_rejected(tmp_path, name):
+    from experiments import storage_example
+
+    assert not storage_example._is_within(tmp_path, name)
+
+
+def test_symlinked_directories_cannot_escape(tmp_path):
+    from experiments import storage_example
+
+    root, outside = tmp_path / "root", tmp_path / "outside"
+    root.mkdir()
+    outside.mkdir()
+    (root / "link").symlink_to(outside)
+
+    assert not storage_example._is_within(root, "link/file.txt")